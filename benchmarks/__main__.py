@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.compare import (
+    DEFAULT_LATENCY_TOLERANCE,
+    DEFAULT_THROUGHPUT_TOLERANCE,
+    compare_runs,
+    format_report,
+)
+from benchmarks.suite import DEFAULT_BATCH_SIZE, DEFAULT_SIZES, STAGES, StageResult, run_suite
+from infrastructure.files import atomic_write_json
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Stage-level benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write JSON results")
+    run.add_argument("--output", type=Path, default=Path("benchmarks/results/latest.json"))
+    run.add_argument(
+        "--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Comma-separated"
+    )
+    run.add_argument("--stages", default=",".join(STAGES), help="Comma-separated")
+    run.add_argument("--seed", type=int, default=7)
+    run.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    run.add_argument("--repeats", type=int, default=3, help="Passes per stage; the fastest counts")
+
+    compare = commands.add_parser("compare", help="Flag regressions against a stored baseline")
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--baseline", type=Path, default=Path("benchmarks/baseline.json"))
+    compare.add_argument("--throughput-tolerance", type=float, default=DEFAULT_THROUGHPUT_TOLERANCE)
+    compare.add_argument("--latency-tolerance", type=float, default=DEFAULT_LATENCY_TOLERANCE)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_suite(
+            sizes=[int(size) for size in args.sizes.split(",")],
+            seed=args.seed,
+            batch_size=args.batch_size,
+            repeats=args.repeats,
+            stages=args.stages.split(","),
+            progress=_print_result,
+        )
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(args.output, report)
+        print(f"Wrote {args.output}", file=sys.stderr)
+        return
+
+    if not args.baseline.exists():
+        print(
+            f"error: baseline {args.baseline} not found; record one on this machine with "
+            f"`python -m benchmarks run --output {args.baseline}`",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    comparisons, missing = compare_runs(
+        baseline, current, args.throughput_tolerance, args.latency_tolerance
+    )
+    print(format_report(comparisons, missing))
+    if baseline.get("environment") != current.get("environment"):
+        print("warning: runs come from different environments", file=sys.stderr)
+    if any(item.regressions for item in comparisons):
+        sys.exit(1)
+
+
+def _print_result(result: StageResult) -> None:
+    print(
+        f"{result.key:<28} {result.items_per_second:>12.1f} items/s | p50 {result.p50_ms:.2f} ms "
+        f"| p99 {result.p99_ms:.2f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
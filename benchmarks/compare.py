@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+DEFAULT_THROUGHPUT_TOLERANCE = 0.2
+DEFAULT_LATENCY_TOLERANCE = 0.3
+
+
+@dataclass
+class Comparison:
+    key: str
+    baseline_rate: float
+    current_rate: float
+    baseline_p99_ms: float
+    current_p99_ms: float
+    regressions: list[str]
+
+    @property
+    def rate_change(self) -> float:
+        if not self.baseline_rate:
+            return 0.0
+        return self.current_rate / self.baseline_rate - 1
+
+
+def compare_runs(
+    baseline: dict,
+    current: dict,
+    throughput_tolerance: float = DEFAULT_THROUGHPUT_TOLERANCE,
+    latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+) -> tuple[list[Comparison], list[str]]:
+    baseline_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    comparisons = []
+    for key, result in current_results.items():
+        reference = baseline_results.get(key)
+        if reference is None:
+            continue
+        regressions = []
+        rate, reference_rate = result["items_per_second"], reference["items_per_second"]
+        if reference_rate and rate < reference_rate * (1 - throughput_tolerance):
+            regressions.append(f"throughput {rate / reference_rate - 1:+.1%}")
+        p99, reference_p99 = result["p99_ms"], reference["p99_ms"]
+        if reference_p99 and p99 > reference_p99 * (1 + latency_tolerance):
+            regressions.append(f"p99 {p99 / reference_p99 - 1:+.1%}")
+        comparisons.append(Comparison(key, reference_rate, rate, reference_p99, p99, regressions))
+    sizes = {result["size"] for result in current_results.values()}
+    missing = sorted(
+        key
+        for key, result in baseline_results.items()
+        if key not in current_results and result["size"] in sizes
+    )
+    return comparisons, missing
+
+
+def format_report(comparisons: list[Comparison], missing: list[str]) -> str:
+    lines = [
+        f"{'benchmark':<28} {'baseline/s':>12} {'current/s':>12} {'change':>8} "
+        f"{'p99 ms':>9} {'was':>9}  status"
+    ]
+    for item in comparisons:
+        status = "REGRESSION: " + ", ".join(item.regressions) if item.regressions else "ok"
+        lines.append(
+            f"{item.key:<28} {item.baseline_rate:>12.1f} {item.current_rate:>12.1f} "
+            f"{item.rate_change:>+8.1%} {item.current_p99_ms:>9.2f} {item.baseline_p99_ms:>9.2f}"
+            f"  {status}"
+        )
+    lines.extend(f"{key:<28} missing from the current run" for key in missing)
+    return "\n".join(lines)
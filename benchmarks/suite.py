@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import gc
+import os
+import platform
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import TypeVar
+
+import numpy as np
+import sklearn
+
+from application.features import FeatureExtractor
+from application.parsers import LogParser
+from application.synthetic import Burst, NewTemplate, SyntheticTraffic, TrafficProfile
+from domain.models import AnomalyResult, LogEvent
+from infrastructure.models.baseline import FrequencyBaselineDetector
+from infrastructure.models.isolation_forest import IsolationForestDetector
+from infrastructure.settings import Settings
+from infrastructure.storage import Storage
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = (10_000, 100_000)
+DEFAULT_BATCH_SIZE = 1000
+DATASET_START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+STAGES = (
+    "parse_jsonl",
+    "parse_plain",
+    "featurize",
+    "train_baseline",
+    "score_baseline",
+    "train_forest",
+    "score_forest",
+    "sqlite_write",
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageResult:
+    stage: str
+    size: int
+    batch_size: int
+    items: int
+    seconds: float
+    items_per_second: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}@{self.size}"
+
+
+@dataclass
+class Dataset:
+    size: int
+    json_lines: list[str]
+    plain_lines: list[str]
+
+
+def build_dataset(size: int, seed: int) -> Dataset:
+    profile = TrafficProfile(
+        events_per_second=20.0,
+        hosts=20,
+        anomaly_ratio=0.01,
+        bursts=[Burst(offset_seconds=1800, duration_seconds=120, events_per_second=40)],
+        new_templates=[NewTemplate(offset_seconds=3600, message="Config reload applied")],
+    )
+    traffic = SyntheticTraffic(profile, DATASET_START, seed=seed)
+    json_lines: list[str] = []
+    plain_lines: list[str] = []
+    for chunk in traffic.chunks(size):
+        json_lines.extend(traffic.json_lines(chunk))
+        plain_lines.extend(traffic.plain_lines(chunk))
+    return Dataset(size, json_lines, plain_lines)
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    seed: int = 7,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    repeats: int = 3,
+    stages: Sequence[str] = STAGES,
+    progress: Callable[[StageResult], None] | None = None,
+) -> dict[str, object]:
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+    results: list[StageResult] = []
+    for size in sizes:
+        for result in _run_size(build_dataset(size, seed), batch_size, repeats, stages):
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": {
+            "sizes": list(sizes),
+            "seed": seed,
+            "batch_size": batch_size,
+            "repeats": repeats,
+        },
+        "results": {result.key: asdict(result) for result in results},
+    }
+
+
+def environment() -> dict[str, object]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "scikit_learn": sklearn.__version__,
+    }
+
+
+def _run_size(
+    dataset: Dataset, batch_size: int, repeats: int, stages: Sequence[str]
+) -> list[StageResult]:
+    parser = LogParser()
+    extractor = FeatureExtractor()
+    size = dataset.size
+    results = []
+
+    def batched(stage: str, items: Sequence[T], run: Callable[[Sequence[T]], object]) -> None:
+        if stage in stages:
+            passes = []
+            for _ in range(repeats):
+                gc.collect()
+                passes.append(_batched_samples(items, batch_size, run))
+            results.append(_summarize(stage, size, batch_size, passes))
+
+    def whole(stage: str, run: Callable[[], object]) -> None:
+        if stage in stages:
+            passes = []
+            for _ in range(repeats):
+                gc.collect()
+                passes.append([(size, _timed(run))])
+            results.append(_summarize(stage, size, size, passes))
+
+    batched("parse_jsonl", dataset.json_lines, lambda batch: parser.parse_lines(batch, "jsonl"))
+    batched("parse_plain", dataset.plain_lines, lambda batch: parser.parse_lines(batch, "plain"))
+    events = parser.parse_lines(dataset.json_lines, "jsonl")
+    batched("featurize", events, extractor.transform)
+
+    baseline = FrequencyBaselineDetector()
+    whole("train_baseline", lambda: baseline.train(events))
+    baseline.train(events)
+    batched("score_baseline", events, baseline.score)
+
+    forest = IsolationForestDetector(feature_extractor=extractor)
+    whole("train_forest", lambda: forest.train(events))
+    if "score_forest" in stages or "sqlite_write" in stages:
+        if "train_forest" not in stages:
+            forest.train(events)
+        batched("score_forest", events, forest.score)
+
+    if "sqlite_write" in stages:
+        scored = _scored_results(events, forest)
+        passes = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for index in range(repeats):
+                storage = Storage(f"sqlite:///{tmp}/bench-{index}.db", Settings())
+                storage.init_db()
+                gc.collect()
+                passes.append(_batched_samples(scored, batch_size, storage.save_results))
+                storage.engine.dispose()
+        results.append(_summarize("sqlite_write", size, batch_size, passes))
+    return results
+
+
+def _scored_results(events: list[LogEvent], forest: IsolationForestDetector) -> list[AnomalyResult]:
+    scores = forest.score(events)
+    threshold = float(np.quantile(scores, 0.99))
+    return [
+        AnomalyResult(
+            event=event, score=score, is_anomaly=score >= threshold, model_version="bench"
+        )
+        for event, score in zip(events, scores, strict=True)
+    ]
+
+
+def _batched_samples(
+    items: Sequence[T], batch_size: int, run: Callable[[Sequence[T]], object]
+) -> list[tuple[int, float]]:
+    samples = []
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        samples.append((len(batch), _timed(lambda batch=batch: run(batch))))
+    return samples
+
+
+def _timed(run: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def _summarize(
+    stage: str, size: int, batch_size: int, passes: list[list[tuple[int, float]]]
+) -> StageResult:
+    fastest = min(passes, key=lambda samples: sum(elapsed for _, elapsed in samples))
+    items = sum(count for count, _ in fastest)
+    latencies = np.array([elapsed for _, elapsed in fastest]) * 1000
+    seconds = sum(elapsed for _, elapsed in fastest)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return StageResult(
+        stage=stage,
+        size=size,
+        batch_size=batch_size,
+        items=items,
+        seconds=round(seconds, 6),
+        items_per_second=round(items / seconds, 1) if seconds else 0.0,
+        p50_ms=round(float(p50), 3),
+        p90_ms=round(float(p90), 3),
+        p99_ms=round(float(p99), 3),
+        max_ms=round(float(latencies.max()), 3),
+    )
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import bz2
+import gzip
+import lzma
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from application.ingestion import iter_lines
+from application.parsers import LogParser
+from application.synthetic import generate_events, to_json_lines
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+    "bz2": bz2.compress,
+    "xz": lambda data: lzma.compress(data, preset=1),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare compressed and plain log input")
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--parse", action="store_true", help="Also parse lines into events")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    sample = to_json_lines(generate_events(total=min(args.lines, 10_000)))
+    body = ("\n".join(sample[index % len(sample)] for index in range(args.lines)) + "\n").encode()
+    try:
+        import zstandard
+
+        COMPRESSORS["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    except ImportError:
+        print("zstandard not installed; skipping zstd")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = Path(tmp) / "plain.jsonl"
+        plain.write_bytes(body)
+        baseline = _measure(plain, False, args.parse)
+        _report("plain", len(body), baseline, baseline)
+        for name, compress in COMPRESSORS.items():
+            path = Path(tmp) / f"{name}.jsonl"
+            path.write_bytes(compress(body))
+            for prefetch in (False, True):
+                label = f"{name}{' +prefetch' if prefetch else ''}"
+                _report(label, path.stat().st_size, _measure(path, prefetch, args.parse), baseline)
+
+
+def _measure(path: Path, prefetch: bool, parse: bool) -> float:
+    parser = LogParser()
+    started = time.perf_counter()
+    lines = iter_lines(path, prefetch=prefetch)
+    if parse:
+        parser.parse_lines(lines, "jsonl")
+    else:
+        for _ in lines:
+            pass
+    return time.perf_counter() - started
+
+
+def _report(label: str, size: int, seconds: float, baseline: float) -> None:
+    print(
+        f"{label:>15}: {size / 1e6:>8.1f} MB on disk | {seconds:>6.2f} s | "
+        f"{seconds / baseline:>5.2f}x plain"
+    )
+
+
+if __name__ == "__main__":
+    main()
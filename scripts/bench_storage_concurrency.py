@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from domain.models import AnomalyQuery, AnomalyResult, LogEvent
+from infrastructure.settings import Settings
+from infrastructure.storage import Storage
+
+PROFILES = {
+    "rollback": {
+        "sqlite_journal_mode": "DELETE",
+        "sqlite_synchronous": "FULL",
+        "sqlite_mmap_size": 0,
+    },
+    "wal": {"sqlite_journal_mode": "WAL", "sqlite_synchronous": "NORMAL"},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent read/write benchmark for Storage")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES), dest="profiles")
+    args = parser.parse_args()
+
+    for profile in args.profiles or ["rollback", "wal"]:
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = Settings(**PROFILES[profile])
+            database_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            storage = Storage(database_url, settings)
+            storage.init_db()
+            report = _run(storage, database_url, profile, args)
+        print(
+            f"{profile:>8}: writes {report['events_per_sec']:>9.0f} events/s | "
+            f"reads {report['reads']:>6} "
+            f"p50 {report['read_p50_ms']:.1f} ms p99 {report['read_p99_ms']:.1f} ms "
+            f"max {report['read_max_ms']:.1f} ms"
+        )
+
+
+def _run(
+    storage: Storage, database_url: str, profile: str, args: argparse.Namespace
+) -> dict[str, float]:
+    stop = multiprocessing.Event()
+    written = multiprocessing.Value("q", 0)
+    read_latencies: list[float] = []
+    lock = threading.Lock()
+
+    def reader() -> None:
+        query = AnomalyQuery(limit=10)
+        while not stop.is_set():
+            started = time.perf_counter()
+            storage.get_anomalies(query)
+            storage.metrics()
+            elapsed = time.perf_counter() - started
+            with lock:
+                read_latencies.append(elapsed)
+
+    writers = [
+        multiprocessing.Process(
+            target=_writer, args=(database_url, profile, args.batch_size, stop, written)
+        )
+        for _ in range(args.writers)
+    ]
+    readers = [threading.Thread(target=reader) for _ in range(args.readers)]
+    for worker in [*writers, *readers]:
+        worker.start()
+    time.sleep(args.duration)
+    stop.set()
+    for worker in [*writers, *readers]:
+        worker.join()
+
+    latencies = sorted(read_latencies) or [0.0]
+    return {
+        "events_per_sec": written.value / args.duration,
+        "reads": len(read_latencies),
+        "read_p50_ms": statistics.median(latencies) * 1000,
+        "read_p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        "read_max_ms": latencies[-1] * 1000,
+    }
+
+
+def _writer(database_url: str, profile: str, batch_size: int, stop, written) -> None:
+    storage = Storage(database_url, Settings(**PROFILES[profile]))
+    batch = _batch(batch_size)
+    while not stop.is_set():
+        storage.save_results(batch)
+        with written.get_lock():
+            written.value += len(batch)
+
+
+def _batch(size: int) -> list[AnomalyResult]:
+    start = datetime.now(timezone.utc)
+    results = []
+    for i in range(size):
+        event = LogEvent(
+            timestamp=start + timedelta(milliseconds=i),
+            host=f"web-{i % 8:02d}",
+            level="INFO",
+            message=f"Request completed in {i % 250} ms",
+        )
+        is_anomaly = i % 20 == 0
+        results.append(
+            AnomalyResult(
+                event=event,
+                score=0.9 if is_anomaly else 0.1,
+                is_anomaly=is_anomaly,
+                model_version="bench",
+            )
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from application.synthetic import (
+    Burst,
+    NewTemplate,
+    SyntheticTraffic,
+    TrafficProfile,
+    write_traffic,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream large synthetic log files")
+    parser.add_argument("--total", type=int, required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--format", choices=["jsonl", "plain"], default="jsonl")
+    parser.add_argument("--labels", type=Path, help="CSV of non-normal line numbers and labels")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=datetime.fromisoformat, help="ISO start time")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--rate", type=float, default=50.0, help="Mean events per second")
+    parser.add_argument("--diurnal", type=float, default=0.6, help="Day/night amplitude, 0..1")
+    parser.add_argument("--peak-hour", type=float, default=14.0)
+    parser.add_argument("--hosts", type=int, default=5)
+    parser.add_argument("--host-skew", type=float, default=1.1, help="Zipf exponent of host rates")
+    parser.add_argument("--anomaly-ratio", type=float, default=0.0)
+    parser.add_argument(
+        "--burst",
+        action="append",
+        default=[],
+        metavar="OFFSET:DURATION:RATE[:HOST]",
+        help="Attack burst OFFSET seconds into the stream",
+    )
+    parser.add_argument(
+        "--new-template",
+        action="append",
+        default=[],
+        metavar="OFFSET:SHARE:MESSAGE",
+        help="Start emitting MESSAGE for SHARE of normal traffic at OFFSET seconds",
+    )
+    args = parser.parse_args()
+
+    profile = TrafficProfile(
+        events_per_second=args.rate,
+        diurnal_amplitude=args.diurnal,
+        peak_hour=args.peak_hour,
+        hosts=args.hosts,
+        host_skew=args.host_skew,
+        anomaly_ratio=args.anomaly_ratio,
+        bursts=[_burst(value) for value in args.burst],
+        new_templates=[_new_template(value) for value in args.new_template],
+    )
+    traffic = SyntheticTraffic(profile, start_time=args.start, seed=args.seed)
+    started = time.monotonic()
+    counts = write_traffic(
+        traffic, args.total, args.output, args.format, args.labels, args.chunk_size
+    )
+    elapsed = time.monotonic() - started
+    summary = {
+        "output": str(args.output),
+        "lines": sum(counts.values()),
+        "labels": counts,
+        "seconds": round(elapsed, 3),
+        "lines_per_second": round(sum(counts.values()) / elapsed, 1) if elapsed else 0.0,
+    }
+    print(json.dumps(summary))
+
+
+def _burst(value: str) -> Burst:
+    offset, duration, rate, *host = value.split(":", 3)
+    return Burst(float(offset), float(duration), float(rate), host=host[0] if host else None)
+
+
+def _new_template(value: str) -> NewTemplate:
+    offset, share, message = value.split(":", 2)
+    return NewTemplate(float(offset), message, float(share))
+
+
+if __name__ == "__main__":
+    main()
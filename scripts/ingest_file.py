@@ -2,25 +2,274 @@
 from __future__ import annotations
 
 import argparse
+import gzip
+import hashlib
+import http.client
 import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from urllib.request import Request, urlopen
+from urllib.parse import urlsplit
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CONTENT_TYPES = {"jsonl": "application/x-ndjson", "plain": "text/plain"}
+
+
+class IngestError(Exception):
+    pass
+
+
+class Batch:
+    def __init__(self, lines: list[bytes], start: int, end: int, key: str = "") -> None:
+        self.lines = lines
+        self.start = start
+        self.end = end
+        self.key = key
+
+
+class Uploader:
+    def __init__(self, url: str, fmt: str, retries: int, timeout: float, level: int) -> None:
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.netloc = parts.netloc
+        base = parts.path.rstrip("/").removesuffix("/ingest").removesuffix("/ingest/stream")
+        self.path = f"{base}/ingest/stream?format={fmt}"
+        self.content_type = CONTENT_TYPES[fmt]
+        self.retries = retries
+        self.timeout = timeout
+        self.level = level
+        self.retried = 0
+        self._local = threading.local()
+
+    def send(self, batch: Batch) -> dict:
+        if not batch.lines:
+            return {"received": 0}
+        body = gzip.compress(b"\n".join(batch.lines) + b"\n", compresslevel=self.level)
+        for attempt in range(self.retries + 1):
+            try:
+                status, headers, payload = self._post(body, batch.key)
+            except (OSError, http.client.HTTPException) as exc:
+                self._reset()
+                status, headers, payload = None, {}, str(exc)
+            if status == 200:
+                return json.loads(payload)
+            if status is not None and status not in RETRY_STATUSES:
+                detail = _detail(payload)
+                raise IngestError(f"HTTP {status} for bytes {batch.start}-{batch.end}: {detail}")
+            if attempt == self.retries:
+                break
+            self.retried += 1
+            time.sleep(_backoff(attempt, headers.get("retry-after")))
+        raise IngestError(
+            f"Giving up on bytes {batch.start}-{batch.end} after {self.retries} retries"
+        )
+
+    def _post(self, body: bytes, key: str) -> tuple[int, dict[str, str], str]:
+        connection = self._connection()
+        headers = {
+            "Content-Type": self.content_type,
+            "Content-Encoding": "gzip",
+            "Connection": "keep-alive",
+        }
+        if key:
+            headers["Idempotency-Key"] = key
+        connection.request("POST", self.path, body=body, headers=headers)
+        response = connection.getresponse()
+        payload = response.read().decode("utf-8", errors="replace")
+        headers = {key.lower(): value for key, value in response.getheaders()}
+        if response.will_close:
+            self._reset()
+        return response.status, headers, payload
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            factory = (
+                http.client.HTTPSConnection
+                if self.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            connection = factory(self.netloc, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _reset(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def read_batches(path: Path, offset: int, batch_lines: int, batch_bytes: int):
+    with open(path, "rb") as handle:
+        stat = os.fstat(handle.fileno())
+        identity = f"{path.resolve()}:{stat.st_dev}:{stat.st_ino}"
+        handle.seek(offset)
+        lines: list[bytes] = []
+        size = 0
+        start = position = offset
+        for raw in handle:
+            position += len(raw)
+            line = raw.rstrip(b"\r\n")
+            if line.strip():
+                lines.append(line)
+                size += len(line) + 1
+            if len(lines) >= batch_lines or size >= batch_bytes:
+                yield Batch(lines, start, position, batch_key(identity, start))
+                lines, size, start = [], 0, position
+        if lines or start != position:
+            yield Batch(lines, start, position, batch_key(identity, start))
+
+
+def align_offset(path: Path, offset: int) -> int:
+    if not offset:
+        return 0
+    with open(path, "rb") as handle:
+        handle.seek(offset - 1)
+        if handle.read(1) != b"\n":
+            offset += len(handle.readline())
+    return offset
+
+
+def batch_key(identity: str, start: int) -> str:
+    return hashlib.blake2b(f"{identity}:{start}".encode(), digest_size=16).hexdigest()
+
+
+class Progress:
+    def __init__(self, offset: int, total_bytes: int, checkpoint: Path | None, path: Path) -> None:
+        self.committed = offset
+        self.total_bytes = total_bytes
+        self.checkpoint = checkpoint
+        self.path = path
+        self.lines = 0
+        self.anomalies = 0
+        self.started = self.last_report = time.monotonic()
+        self._done: dict[int, int] = {}
+
+    def complete(self, batch: Batch, response: dict) -> None:
+        self.lines += int(response.get("received", len(batch.lines)))
+        self.anomalies += int(response.get("anomalies", 0))
+        self._done[batch.start] = batch.end
+        while self.committed in self._done:
+            self.committed = self._done.pop(self.committed)
+        if self.checkpoint is not None:
+            atomic_write_json(self.checkpoint, {"path": str(self.path), "offset": self.committed})
+
+    def report(self, interval: float, retried: int) -> None:
+        now = time.monotonic()
+        if now - self.last_report < interval:
+            return
+        self.last_report = now
+        elapsed = max(now - self.started, 1e-9)
+        percent = 100.0 * self.committed / self.total_bytes if self.total_bytes else 100.0
+        print(
+            f"{self.lines} lines, {self.committed}/{self.total_bytes} bytes ({percent:.1f}%), "
+            f"{self.lines / elapsed:.0f} lines/s, {retried} retries",
+            file=sys.stderr,
+        )
+
+    def summary(self) -> dict[str, object]:
+        elapsed = time.monotonic() - self.started
+        return {
+            "received": self.lines,
+            "anomalies": self.anomalies,
+            "committed_offset": self.committed,
+            "seconds": round(elapsed, 3),
+            "lines_per_second": round(self.lines / elapsed, 1) if elapsed else 0.0,
+        }
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Ingest logs via API")
+    parser = argparse.ArgumentParser(description="Ingest a log file via the streaming API")
     parser.add_argument("--input", type=Path, required=True)
     parser.add_argument("--format", choices=["jsonl", "plain"], default="jsonl")
-    parser.add_argument("--url", default="http://localhost:8000/ingest")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--batch-lines", type=int, default=5000)
+    parser.add_argument("--batch-bytes", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--compress-level", type=int, default=6)
+    parser.add_argument("--offset", type=int, default=0, help="Resume from this byte offset")
+    parser.add_argument("--checkpoint", type=Path, help="Record the committed byte offset here")
+    parser.add_argument("--progress-interval", type=float, default=5.0)
     args = parser.parse_args()
 
-    lines = args.input.read_text(encoding="utf-8").splitlines()
-    payload = {"format": args.format, "lines": lines}
-    data = json.dumps(payload).encode("utf-8")
-    request = Request(args.url, data=data, headers={"Content-Type": "application/json"})
-    with urlopen(request, timeout=30) as response:
-        body = response.read().decode("utf-8")
-        print(body)
+    offset = args.offset
+    if args.checkpoint is not None and args.checkpoint.exists() and not args.offset:
+        offset = json.loads(args.checkpoint.read_text(encoding="utf-8")).get("offset", 0)
+    offset = align_offset(args.input, offset)
+    uploader = Uploader(args.url, args.format, args.retries, args.timeout, args.compress_level)
+    total_bytes = args.input.stat().st_size
+    progress = Progress(offset, total_bytes, args.checkpoint, args.input)
+    in_flight: dict[Future, Batch] = {}
+    failed: IngestError | None = None
+
+    with ThreadPoolExecutor(max_workers=args.connections) as executor:
+        batches = read_batches(args.input, offset, args.batch_lines, args.batch_bytes)
+        for batch in batches:
+            while len(in_flight) >= args.connections * 2:
+                failed = _collect(in_flight, progress, FIRST_COMPLETED) or failed
+            if failed:
+                break
+            in_flight[executor.submit(uploader.send, batch)] = batch
+            progress.report(args.progress_interval, uploader.retried)
+        while in_flight:
+            failed = _collect(in_flight, progress, FIRST_COMPLETED) or failed
+            progress.report(args.progress_interval, uploader.retried)
+
+    progress.report(0.0, uploader.retried)
+    summary = progress.summary()
+    if failed:
+        print(f"{failed}; resume with --offset {progress.committed}", file=sys.stderr)
+        print(json.dumps(summary))
+        sys.exit(1)
+    print(json.dumps(summary))
+
+
+def _collect(in_flight: dict[Future, Batch], progress: Progress, mode: str) -> IngestError | None:
+    done, _ = wait(in_flight, return_when=mode)
+    failed = None
+    for future in done:
+        batch = in_flight.pop(future)
+        try:
+            progress.complete(batch, future.result())
+        except IngestError as exc:
+            failed = exc
+    return failed
+
+
+def atomic_write_json(path: Path, payload: object) -> None:
+    descriptor, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _detail(payload: str) -> str:
+    try:
+        return str(json.loads(payload).get("detail", payload))
+    except (ValueError, AttributeError):
+        return payload
+
+
+def _backoff(attempt: int, retry_after: str | None) -> float:
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return min(30.0, 0.5 * 2**attempt) * random.uniform(0.5, 1.0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure /health latency under /ingest load")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--input", type=Path, default=Path("data/logs/with_anomalies.jsonl"))
+    parser.add_argument("--format", choices=["jsonl", "plain"], default="jsonl")
+    parser.add_argument("--batch-lines", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--health-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    lines = args.input.read_text(encoding="utf-8").splitlines()
+    batch = (lines * (args.batch_lines // max(len(lines), 1) + 1))[: args.batch_lines]
+    payload = json.dumps({"format": args.format, "lines": batch}).encode("utf-8")
+    stop = threading.Event()
+    ingested = [0]
+    errors = [0]
+    health_latencies: list[float] = []
+    lock = threading.Lock()
+
+    def ingest_loop() -> None:
+        while not stop.is_set():
+            request = Request(
+                f"{args.url}/ingest", data=payload, headers={"Content-Type": "application/json"}
+            )
+            try:
+                with urlopen(request, timeout=300) as response:
+                    received = json.loads(response.read())["received"]
+            except HTTPError:
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                ingested[0] += received
+
+    def health_loop() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            with urlopen(f"{args.url}/health", timeout=60) as response:
+                response.read()
+            health_latencies.append(time.perf_counter() - started)
+            time.sleep(args.health_interval)
+
+    threads = [threading.Thread(target=ingest_loop) for _ in range(args.concurrency)]
+    threads.append(threading.Thread(target=health_loop))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(health_latencies) or [0.0]
+    print(
+        f"ingest: {ingested[0] / elapsed:.0f} lines/s over {elapsed:.1f} s, "
+        f"{errors[0]} failed requests"
+    )
+    print(
+        f"/health: n={len(health_latencies)} "
+        f"p50={statistics.median(latencies) * 1000:.1f} ms "
+        f"p99={latencies[int(0.99 * (len(latencies) - 1))] * 1000:.1f} ms "
+        f"max={latencies[-1] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import text
+
+from infrastructure.settings import settings
+from infrastructure.storage import MIGRATION_BATCH_SIZE, Storage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move stored log messages into the templates table"
+    )
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    parser.add_argument("--vacuum", action="store_true", help="Reclaim freed space afterwards")
+    args = parser.parse_args()
+
+    storage = Storage(args.database_url, settings)
+    storage.init_db()
+    migrated = storage.migrate_templates(batch_size=args.batch_size)
+    print(f"Migrated {migrated} records to template references")
+
+    if args.vacuum:
+        with storage.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        print("Vacuum completed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from application.jobs import RetrainJob
+from application.training import retrain_from_storage
+from infrastructure.logging import configure_logging
+from infrastructure.registry import ModelRegistry
+from infrastructure.settings import settings
+from infrastructure.storage import Storage
+
+logger = logging.getLogger("retrain")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Retrain the model from normal records already stored in the database"
+    )
+    parser.add_argument("--model", default=settings.model_type)
+    parser.add_argument("--days", type=float, default=settings.retrain_window_days)
+    parser.add_argument("--max-events", type=int, default=settings.retrain_max_events)
+    parser.add_argument("--min-events", type=int, default=settings.retrain_min_events)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--every",
+        type=float,
+        default=0.0,
+        help="Keep running and retrain every N seconds instead of once",
+    )
+    args = parser.parse_args()
+
+    configure_logging(settings.log_level)
+    if args.every > 0:
+        job_settings = settings.model_copy(
+            update={
+                "model_type": args.model,
+                "retrain_window_days": args.days,
+                "retrain_max_events": args.max_events,
+                "retrain_min_events": args.min_events,
+            }
+        )
+        job = RetrainJob(job_settings, args.every, isolated=False, seed=args.seed)
+        job.run_once()
+        job.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            job.stop()
+        return
+
+    started = time.monotonic()
+    storage = Storage(settings.database_url, settings)
+    metadata = retrain_from_storage(
+        storage,
+        ModelRegistry(settings.artifact_dir),
+        args.model,
+        window_days=args.days,
+        max_events=args.max_events,
+        min_events=args.min_events,
+        seed=args.seed,
+    )
+    if metadata is None:
+        raise SystemExit("Not enough normal records in the window; model unchanged")
+    print(
+        f"Saved model {metadata['model_type']} version {metadata['version']} "
+        f"to {metadata['path']} in {time.monotonic() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+from pathlib import Path
+
+import uvicorn
+
+from api.main import app
+from application.training import bootstrap_model
+from infrastructure.logging import configure_logging
+from infrastructure.registry import ModelRegistry
+from infrastructure.relay import RelayClient, RelayHub
+from infrastructure.settings import settings
+from infrastructure.storage import Storage
+from infrastructure.write_behind import WriteBehindWriter
+
+logger = logging.getLogger("serve")
+
+POLL_SECONDS = 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API from preforked workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.web_workers)
+    parser.add_argument("--backlog", type=int, default=2048)
+    args = parser.parse_args()
+
+    configure_logging(settings.log_level)
+    prepare()
+    listener = socket.create_server((args.host, args.port), backlog=args.backlog)
+    listener.set_inheritable(True)
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, int] = {}
+    stopping = False
+
+    def stop(signum: int, _frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    app.state.worker_count = args.workers
+    hub = RelayHub()
+    for slot in range(args.workers):
+        children[spawn(listener, hub, slot)] = slot
+    logger.info("workers_started", extra={"workers": args.workers, "port": args.port})
+
+    while children:
+        hub.poll(POLL_SECONDS)
+        for pid, status in exited_children():
+            slot = children.pop(pid, None)
+            if slot is None:
+                continue
+            hub.detach(slot)
+            if not stopping:
+                logger.warning("worker_exited", extra={"pid": pid, "status": status})
+                children[spawn(listener, hub, slot)] = slot
+    hub.close()
+    listener.close()
+
+
+def exited_children() -> list[tuple[int, int]]:
+    exited = []
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return exited
+        if pid == 0:
+            return exited
+        exited.append((pid, status))
+
+
+def prepare() -> None:
+    storage = Storage(settings.database_url, settings)
+    storage.init_db()
+    if settings.write_behind_enabled and settings.write_behind_spill_path:
+        writer = WriteBehindWriter(
+            storage,
+            batch_size=settings.write_behind_batch_size,
+            spill_path=settings.write_behind_spill_path,
+        )
+        writer.replay_spill()
+    storage.engine.dispose()
+    registry = ModelRegistry(settings.artifact_dir)
+    try:
+        registry.preload()
+    except FileNotFoundError:
+        if not settings.auto_train_on_startup:
+            logger.warning("model_not_loaded", extra={"path": settings.artifact_dir})
+            return
+        if bootstrap_model(
+            registry,
+            Path(settings.bootstrap_log_path),
+            settings.bootstrap_log_format,
+            settings.model_type,
+        ):
+            registry.preload()
+
+
+def spawn(listener: socket.socket, hub: RelayHub, slot: int) -> int:
+    worker_end = hub.attach(slot)
+    pid = os.fork()
+    if pid:
+        worker_end.close()
+        return pid
+    hub.close_inherited()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    app.state.worker_slot = slot
+    app.state.relay = RelayClient(worker_end)
+    config = uvicorn.Config(app, log_config=None, access_log=False)
+    server = uvicorn.Server(config)
+    try:
+        server.run(sockets=[listener])
+    finally:
+        os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from application.features import FeatureExtractor
+from application.parsers import LogParser
+from application.persistence import PersistencePolicy
+from application.services import AnomalyService
+from application.syslog import SyslogSource
+from domain.models import LogEvent
+from infrastructure.logging import configure_logging
+from infrastructure.registry import ModelRegistry
+from infrastructure.settings import settings
+from infrastructure.storage import Storage
+
+logger = logging.getLogger("syslog_receiver")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Receive syslog over UDP/TCP and score it in-process"
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--udp-port", type=int, default=5514)
+    parser.add_argument("--tcp-port", type=int, default=5514)
+    parser.add_argument("--no-udp", action="store_true")
+    parser.add_argument("--no-tcp", action="store_true")
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    parser.add_argument("--batch-interval", type=float, default=0.5)
+    parser.add_argument("--stats-interval", type=float, default=30.0)
+    parser.add_argument(
+        "--dedup-window",
+        type=float,
+        default=settings.dedup_window_seconds,
+        help="Collapse repeated lines within this many seconds (0 disables)",
+    )
+    args = parser.parse_args()
+
+    configure_logging(settings.log_level)
+    storage = Storage(settings.database_url, settings)
+    storage.init_db()
+    service = AnomalyService(
+        settings=settings,
+        parser=LogParser(),
+        feature_extractor=FeatureExtractor(),
+        registry=ModelRegistry(settings.artifact_dir),
+        storage=storage,
+        policy=PersistencePolicy(settings.normal_sample_rate),
+    )
+    source = SyslogSource(
+        host=args.host,
+        udp_port=None if args.no_udp else args.udp_port,
+        tcp_port=None if args.no_tcp else args.tcp_port,
+        queue_size=args.queue_size,
+        batch_size=args.batch_size,
+        batch_interval=args.batch_interval,
+        dedup_window_seconds=args.dedup_window,
+        dedup_max_keys=settings.dedup_max_keys,
+    )
+    asyncio.run(serve(source, service, args.stats_interval))
+
+
+async def serve(source: SyslogSource, service: AnomalyService, stats_interval: float) -> None:
+    def handle(events: list[LogEvent]) -> None:
+        results = service.ingest_events(events)
+        anomalies = sum(1 for result in results if result.is_anomaly)
+        if anomalies:
+            logger.info("syslog_anomalies", extra={"events": len(events), "anomalies": anomalies})
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(stats_interval)
+            logger.info("syslog_stats", extra=source.stats())
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, task.cancel)
+    reporter = asyncio.create_task(report())
+    try:
+        await source.run(handle)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        reporter.cancel()
+        logger.info("syslog_stopped", extra=source.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+from pathlib import Path
+
+from application.features import FeatureExtractor
+from application.parsers import LogParser
+from application.persistence import PersistencePolicy
+from application.services import AnomalyService
+from application.tail import FileTailSource
+from infrastructure.logging import configure_logging
+from infrastructure.registry import ModelRegistry
+from infrastructure.settings import settings
+from infrastructure.storage import Storage
+
+logger = logging.getLogger("tail_logs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Follow log files and score new lines in-process")
+    parser.add_argument("paths", type=Path, nargs="+")
+    parser.add_argument("--format", choices=["jsonl", "plain"], default="jsonl")
+    parser.add_argument("--checkpoint", type=Path, default=Path("./data/tail-checkpoint.json"))
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    parser.add_argument("--batch-interval", type=float, default=1.0)
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument(
+        "--from-end", action="store_true", help="Skip existing content on first run"
+    )
+    parser.add_argument(
+        "--dedup-window",
+        type=float,
+        default=settings.dedup_window_seconds,
+        help="Collapse repeated lines within this many seconds (0 disables)",
+    )
+    args = parser.parse_args()
+
+    configure_logging(settings.log_level)
+    storage = Storage(settings.database_url, settings)
+    storage.init_db()
+    service = AnomalyService(
+        settings=settings,
+        parser=LogParser(),
+        feature_extractor=FeatureExtractor(),
+        registry=ModelRegistry(settings.artifact_dir),
+        storage=storage,
+        policy=PersistencePolicy(settings.normal_sample_rate),
+    )
+    args.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    source = FileTailSource(
+        args.paths,
+        args.checkpoint,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        batch_interval=args.batch_interval,
+        poll_interval=args.poll_interval,
+        from_end=args.from_end,
+        dedup_window_seconds=args.dedup_window,
+        dedup_max_keys=settings.dedup_max_keys,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: source.stop())
+    signal.signal(signal.SIGINT, lambda *_: source.stop())
+
+    try:
+        for batch in source.batches():
+            if batch.events:
+                results = service.ingest_events(batch.events)
+                anomalies = sum(1 for result in results if result.is_anomaly)
+            else:
+                anomalies = 0
+            source.commit(batch)
+            logger.info(
+                "tail_batch_committed",
+                extra={"lines": batch.lines, "events": len(batch.events), "anomalies": anomalies},
+            )
+    finally:
+        source.close()
+        logger.info("tail_stopped", extra=source.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import time
 from pathlib import Path
 
+from application.dataset import DatasetCache
 from application.features import FeatureExtractor
+from application.ingestion import iter_lines
 from application.parsers import LogParser
-from application.training import train_model
+from application.training import train_model, train_model_from_columns
 from infrastructure.registry import ModelRegistry
 from infrastructure.settings import settings
 
@@ -16,15 +19,25 @@ def main() -> None:
     parser.add_argument("--input", type=Path, required=True)
     parser.add_argument("--format", choices=["jsonl", "plain"], default="jsonl")
     parser.add_argument("--model", default=settings.model_type)
+    parser.add_argument("--cache-dir", type=Path, default=Path(settings.dataset_cache_dir))
+    parser.add_argument("--no-cache", action="store_true", help="Parse the input from scratch")
     args = parser.parse_args()
 
-    lines = args.input.read_text(encoding="utf-8").splitlines()
     parser_obj = LogParser()
-    events = parser_obj.parse_lines(lines, args.format)
-
     registry = ModelRegistry(settings.artifact_dir)
     extractor = FeatureExtractor()
-    metadata = train_model(events, args.model, registry, extractor)
+    started = time.monotonic()
+    if args.no_cache:
+        events = parser_obj.parse_lines(iter_lines(args.input), args.format)
+        print(f"Parsed {len(events)} events in {time.monotonic() - started:.1f}s")
+        metadata = train_model(events, args.model, registry, extractor)
+    else:
+        columns, cached = DatasetCache(args.cache_dir).load_or_build(
+            args.input, args.format, parser_obj
+        )
+        action = "Loaded cached" if cached else "Parsed and cached"
+        print(f"{action} {len(columns)} events in {time.monotonic() - started:.1f}s")
+        metadata = train_model_from_columns(columns, args.model, registry, extractor)
 
     print(
         f"Saved model {metadata['model_type']} version {metadata['version']} to {metadata['path']}"
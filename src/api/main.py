@@ -1,27 +1,53 @@
 from __future__ import annotations
 
+import json
 import logging
-from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Literal
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
+from api.middleware import BodySizeLimitMiddleware
+from application.admission import AdmissionController, AdmissionRejected
+from application.broadcast import EventBroadcaster, Subscription
+from application.cache import CachedResponse
 from application.features import FeatureExtractor
+from application.ingestion import LineDecoder
+from application.jobs import MetricsShareJob, ModelWatchJob, RetentionJob, RetrainJob
 from application.parsers import LogParser
+from application.persistence import PersistencePolicy
+from application.scoring import ScoringPool, scoring_worker_count
 from application.services import AnomalyService
-from application.training import train_model
+from application.training import bootstrap_model
+from domain.models import AnomalyQuery, AnomalyResult
+from infrastructure.instrumentation import REGISTRY, WRITE_BEHIND_QUEUE_DEPTH
 from infrastructure.logging import configure_logging
 from infrastructure.registry import ModelRegistry
+from infrastructure.relay import RelayClient
 from infrastructure.settings import settings
-from infrastructure.storage import Storage
+from infrastructure.storage import Storage, encode_cursor
+from infrastructure.write_behind import WriteBehindWriter
 
 logger = logging.getLogger(__name__)
 
+MODEL_WATCH_SECONDS = 30.0
+METRICS_SHARE_SECONDS = 5.0
+PROMETHEUS_SAMPLES = "prometheus_samples"
 
-def _build_service(storage: Storage, registry: ModelRegistry) -> AnomalyService:
+
+def _build_service(
+    storage: Storage,
+    registry: ModelRegistry,
+    writer: WriteBehindWriter | None,
+    broadcaster: EventBroadcaster,
+) -> AnomalyService:
     parser = LogParser()
     feature_extractor = FeatureExtractor()
     return AnomalyService(
@@ -30,47 +56,142 @@ def _build_service(storage: Storage, registry: ModelRegistry) -> AnomalyService:
         feature_extractor=feature_extractor,
         registry=registry,
         storage=storage,
+        writer=writer,
+        policy=PersistencePolicy(settings.normal_sample_rate),
+        broadcaster=broadcaster,
     )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging(settings.log_level)
-    storage = Storage(settings.database_url)
-    storage.init_db()
+    storage = Storage(settings.database_url, settings)
     registry = ModelRegistry(settings.artifact_dir)
+    worker_slot: int | None = app.state.worker_slot
+    primary = worker_slot is None or worker_slot == 0
+    relay: RelayClient | None = app.state.relay
+    writer = None
+    if settings.write_behind_enabled:
+        writer = WriteBehindWriter(
+            storage,
+            max_pending=settings.write_behind_max_pending,
+            batch_size=settings.write_behind_batch_size,
+            flush_interval=settings.write_behind_flush_interval_seconds,
+            spill_path=settings.write_behind_spill_path,
+        )
     app.state.service = None
     app.state.model_loaded = False
+    app.state.broadcaster = EventBroadcaster(
+        settings.stream_client_buffer, forward=relay.send if relay is not None else None
+    )
+    app.state.peer_metrics = {}
+    app.state.admission = AdmissionController(
+        max_inflight_events=settings.ingest_max_inflight_events,
+        source_rate=settings.ingest_source_rate,
+        source_burst=settings.ingest_source_burst,
+    )
     try:
-        app.state.service = _build_service(storage, registry)
+        app.state.service = _build_service(storage, registry, writer, app.state.broadcaster)
         app.state.model_loaded = True
     except FileNotFoundError as exc:
-        if settings.auto_train_on_startup:
-            bootstrap_path = Path(settings.bootstrap_log_path)
-            if bootstrap_path.exists():
-                parser = LogParser()
-                feature_extractor = FeatureExtractor()
-                lines = bootstrap_path.read_text(encoding="utf-8").splitlines()
-                events = parser.parse_lines(lines, settings.bootstrap_log_format)
-                train_model(events, settings.model_type, registry, feature_extractor)
-                app.state.service = _build_service(storage, registry)
-                app.state.model_loaded = True
-                logger.info("model_bootstrapped", extra={"path": str(bootstrap_path)})
-            else:
-                logger.warning("bootstrap_path_missing", extra={"path": str(bootstrap_path)})
+        if settings.auto_train_on_startup and bootstrap_model(
+            registry,
+            Path(settings.bootstrap_log_path),
+            settings.bootstrap_log_format,
+            settings.model_type,
+        ):
+            app.state.service = _build_service(storage, registry, writer, app.state.broadcaster)
+            app.state.model_loaded = True
         if not app.state.model_loaded:
             logger.warning("model_not_loaded", extra={"error": str(exc)})
+    app.state.scoring_pool = None
+    scoring_total = scoring_worker_count(settings.scoring_workers)
+    if primary and scoring_total < settings.scoring_workers:
+        logger.warning(
+            "scoring_workers_capped",
+            extra={"requested": settings.scoring_workers, "workers": scoring_total},
+        )
+    scoring_workers = scoring_worker_count(
+        settings.scoring_workers, worker_slot or 0, app.state.worker_count
+    )
+    if scoring_workers > 0 and app.state.model_loaded:
+        metadata = app.state.service.metadata
+        if worker_slot is None:
+            app.state.scoring_pool = await run_in_threadpool(
+                ScoringPool, settings.artifact_dir, scoring_workers, metadata
+            )
+        else:
+            app.state.scoring_pool = ScoringPool(
+                settings.artifact_dir, scoring_workers, metadata, start_method="fork"
+            )
+        app.state.service.scoring_pool = app.state.scoring_pool
+    if worker_slot is None:
+        storage.init_db()
+    else:
+        storage.inspect_schema()
+    if writer is not None:
+        writer.start(replay=worker_slot is None)
+    retention_job = None
+    if primary and settings.raw_retention_days > 0:
+        retention_job = RetentionJob(
+            storage, settings.raw_retention_days, settings.retention_interval_seconds
+        )
+        retention_job.start()
+    retrain_job = None
+    if settings.retrain_interval_seconds > 0:
+        if primary:
+            retrain_job = RetrainJob(
+                settings, settings.retrain_interval_seconds, on_model_changed=_reload_model
+            )
+        else:
+            retrain_job = ModelWatchJob(_reload_model, MODEL_WATCH_SECONDS)
+        retrain_job.start()
+    metrics_job = None
+    if relay is not None:
+        relay.start(_on_relay_message)
+        metrics_job = MetricsShareJob(_share_metrics, METRICS_SHARE_SECONDS)
+        metrics_job.start()
     yield
+    if metrics_job is not None:
+        metrics_job.stop()
+    if app.state.service is not None:
+        await app.state.service.drain()
+    if retention_job is not None:
+        retention_job.stop()
+    if retrain_job is not None:
+        retrain_job.stop()
+    if app.state.scoring_pool is not None:
+        app.state.scoring_pool.close()
+    if writer is not None:
+        writer.close()
+    if relay is not None:
+        relay.close()
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
 app.state.service = None
 app.state.model_loaded = False
+app.state.worker_slot = None
+app.state.worker_count = 1
+app.state.relay = None
+app.state.peer_metrics = {}
+app.state.scoring_pool = None
+app.state.broadcaster = EventBroadcaster()
+app.state.admission = AdmissionController()
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/ingest": settings.ingest_max_body_bytes,
+        "/ingest/stream": settings.ingest_stream_max_body_bytes,
+    },
+    on_reject=lambda: app.state.admission.record_too_large(),
+)
 
 
 class IngestRequest(BaseModel):
     format: Literal["jsonl", "plain"] = "jsonl"
     lines: list[str] = Field(default_factory=list)
+    results: Literal["summary", "columnar"] = "summary"
 
 
 class IngestResponse(BaseModel):
@@ -79,8 +200,17 @@ class IngestResponse(BaseModel):
     model_version: str
 
 
+class StreamIngestResponse(IngestResponse):
+    batches: int
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+IDEMPOTENCY_KEY_MAX_LENGTH = 128
+STREAM_CONTENT_TYPES = {"", "application/x-ndjson", "application/jsonl", "text/plain"}
+
+
 @app.get("/health")
-def health() -> dict:
+async def health() -> dict:
     return {
         "status": "ok",
         "model_loaded": bool(app.state.model_loaded),
@@ -89,43 +219,359 @@ def health() -> dict:
 
 
 @app.post("/ingest", response_model=IngestResponse)
-def ingest(request: IngestRequest) -> IngestResponse:
+async def ingest(request: IngestRequest, http_request: Request) -> IngestResponse | Response:
     service: AnomalyService | None = app.state.service
     if service is None:
         raise HTTPException(status_code=503, detail="Model not loaded. Train a model first.")
+    if settings.ingest_max_lines and len(request.lines) > settings.ingest_max_lines:
+        app.state.admission.record_too_large()
+        raise HTTPException(
+            status_code=413, detail=f"Request exceeds {settings.ingest_max_lines} lines"
+        )
     try:
-        results = service.ingest(request.lines, request.format)
+        with _admit(len(request.lines), _client_source(http_request)):
+            results = await service.ingest(request.lines, request.format)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if request.results == "columnar":
+        return _columnar_response(request.lines, results, service.model_version)
     anomalies = sum(1 for result in results if result.is_anomaly)
     return IngestResponse(
         received=len(results),
         anomalies=anomalies,
-        model_version=service.metadata.get("version", "unknown"),
+        model_version=service.model_version,
     )
 
 
+@app.post("/ingest/stream", response_model=StreamIngestResponse)
+async def ingest_stream(
+    request: Request,
+    fmt: Literal["jsonl", "plain"] = Query(default="jsonl", alias="format"),
+) -> StreamIngestResponse:
+    service: AnomalyService | None = app.state.service
+    if service is None:
+        raise HTTPException(status_code=503, detail="Model not loaded. Train a model first.")
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in STREAM_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding not in {"identity", "gzip"}:
+        raise HTTPException(status_code=415, detail=f"Unsupported content encoding: {encoding}")
+
+    key = request.headers.get("idempotency-key")
+    if key is not None and not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+    progress = None
+    if key is not None:
+        progress = await run_in_threadpool(service.storage.get_ingest_progress, key)
+    if progress is not None and progress["completed"]:
+        return StreamIngestResponse(
+            received=progress["lines"],
+            anomalies=progress["anomalies"],
+            batches=progress["batches"],
+            model_version=service.model_version,
+        )
+
+    decoder = LineDecoder(compression="gzip" if encoding == "gzip" else None)
+    source = _client_source(request)
+    batch_size = settings.ingest_batch_size
+    received = anomalies = batches = skip = 0
+    if progress is not None:
+        received, anomalies, batches = progress["lines"], progress["anomalies"], progress["batches"]
+        skip = received
+    batch: list[str] = []
+
+    async def flush() -> None:
+        nonlocal received, anomalies, batches
+        with _admit(len(batch), source):
+            results = await service.ingest_batch(batch, fmt, durable=key is not None)
+        received += len(results)
+        anomalies += sum(1 for result in results if result.is_anomaly)
+        batches += 1
+        if key is not None:
+            await run_in_threadpool(
+                service.storage.record_ingest_progress, key, received, anomalies, batches
+            )
+
+    try:
+        async for chunk in request.stream():
+            for line in decoder.feed(chunk):
+                if not line.strip():
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                batch.append(line)
+                if len(batch) >= batch_size:
+                    await flush()
+                    batch = []
+        batch.extend(line for line in decoder.close() if line.strip())
+        del batch[:skip]
+        if batch:
+            await flush()
+        if key is not None:
+            await run_in_threadpool(
+                service.storage.record_ingest_progress, key, received, anomalies, batches, True
+            )
+    except HTTPException as exc:
+        exc.detail = f"{exc.detail} (accepted {received} lines before the error)"
+        raise
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400, detail=f"{exc} (accepted {received} lines before the error)"
+        ) from exc
+    return StreamIngestResponse(
+        received=received,
+        anomalies=anomalies,
+        batches=batches,
+        model_version=service.model_version,
+    )
+
+
+def _columnar_response(
+    lines: list[str], results: list[AnomalyResult], model_version: str
+) -> Response:
+    scores = np.fromiter((result.score for result in results), dtype=float, count=len(results))
+    flags = np.fromiter((result.is_anomaly for result in results), dtype=bool, count=len(results))
+    if len(results) != len(lines):
+        positions = np.flatnonzero([bool(line.strip()) for line in lines])
+        line_scores = np.full(len(lines), None, dtype=object)
+        line_scores[positions] = scores.round(6)
+        line_flags = np.zeros(len(lines), dtype=bool)
+        line_flags[positions] = flags
+    else:
+        line_scores = scores.round(6)
+        line_flags = flags
+    payload = {
+        "received": len(results),
+        "anomalies": int(flags.sum()),
+        "model_version": model_version,
+        "scores": line_scores.tolist(),
+        "is_anomaly": line_flags.tolist(),
+        "anomaly_indices": np.flatnonzero(line_flags).tolist(),
+    }
+    return Response(
+        content=json.dumps(payload, separators=(",", ":")), media_type="application/json"
+    )
+
+
+@contextmanager
+def _admit(events: int, source: str | None) -> Iterator[None]:
+    admission: AdmissionController = app.state.admission
+    try:
+        admission.acquire(events, source)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=429, detail=str(exc), headers={"Retry-After": str(exc.retry_after)}
+        ) from exc
+    try:
+        yield
+    finally:
+        admission.release(events)
+
+
+def _client_source(request: Request) -> str | None:
+    source = request.headers.get("x-log-source")
+    if source:
+        return source
+    return request.client.host if request.client else None
+
+
+def _reload_model() -> None:
+    service: AnomalyService | None = app.state.service
+    if service is not None:
+        service.reload_model()
+
+
+def _on_relay_message(message: dict) -> None:
+    if message.get("type") == PROMETHEUS_SAMPLES:
+        app.state.peer_metrics[str(message["worker"])] = message["samples"]
+    else:
+        app.state.broadcaster.deliver(message)
+
+
+def _share_metrics() -> None:
+    _update_gauges()
+    app.state.relay.send(
+        {
+            "type": PROMETHEUS_SAMPLES,
+            "worker": app.state.worker_slot,
+            "samples": REGISTRY.snapshot(_worker_labels()),
+        }
+    )
+
+
+def _worker_labels() -> dict[str, str] | None:
+    if app.state.worker_slot is None:
+        return None
+    return {"worker": str(app.state.worker_slot)}
+
+
+def _update_gauges() -> None:
+    service: AnomalyService | None = app.state.service
+    if service is not None and service.writer is not None:
+        WRITE_BEHIND_QUEUE_DEPTH.set(service.writer.stats()["queue_depth"])
+
+
 @app.get("/anomalies")
-def anomalies(
+async def anomalies(
+    request: Request,
     limit: int = Query(default=50, ge=1, le=500),
     min_score: float | None = Query(default=None, ge=0.0, le=1.0),
-) -> dict:
+    since: datetime | None = None,
+    until: datetime | None = None,
+    host: str | None = None,
+    service_name: str | None = Query(default=None, alias="service"),
+    level: str | None = None,
+    model_version: str | None = None,
+    order: Literal["score", "time"] = "score",
+    cursor: str | None = None,
+) -> StreamingResponse:
     service: AnomalyService | None = app.state.service
     if service is None:
         raise HTTPException(status_code=503, detail="Model not loaded. Train a model first.")
-    return {"items": service.get_anomalies(limit=limit, min_score=min_score)}
+    query = AnomalyQuery(
+        limit=limit,
+        min_score=min_score,
+        since=since,
+        until=until,
+        host=host,
+        service=service_name,
+        level=level,
+        model_version=model_version,
+        order=order,
+        cursor=cursor,
+    )
+    if cursor is None and limit <= settings.response_cache_max_limit:
+        key = ("anomalies", query.model_dump_json())
+        entry = await run_in_threadpool(
+            service.cached_response, key, lambda: _anomaly_page(service, query)
+        )
+        return _cached_json(entry, request)
+    try:
+        items = service.iter_anomalies(query)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return StreamingResponse(_stream_page(items, query), media_type="application/json")
+
+
+def _stream_page(items: Iterator[dict], query: AnomalyQuery) -> Iterator[bytes]:
+    yield b'{"items":['
+    last = None
+    count = 0
+    for item in items:
+        if count:
+            yield b","
+        yield json.dumps(item, ensure_ascii=True).encode("utf-8")
+        last = item
+        count += 1
+    next_cursor = encode_cursor(last, query.order) if last and count >= query.limit else None
+    yield f'],"next_cursor":{json.dumps(next_cursor)}}}'.encode()
+
+
+def _anomaly_page(service: AnomalyService, query: AnomalyQuery) -> dict:
+    items = service.get_anomalies(query)
+    last = items[-1] if len(items) >= query.limit else None
+    return {"items": items, "next_cursor": encode_cursor(last, query.order) if last else None}
+
+
+def _cached_json(entry: CachedResponse, request: Request) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.etag in _parse_etags(request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _parse_etags(header: str) -> set[str]:
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
 
 
 @app.get("/metrics")
-def metrics() -> dict:
+async def metrics(request: Request) -> Response:
     service: AnomalyService | None = app.state.service
     if service is None:
         raise HTTPException(status_code=503, detail="Model not loaded. Train a model first.")
-    return service.get_metrics()
+    entry = await run_in_threadpool(service.cached_response, "metrics", service.get_metrics)
+    return _cached_json(entry, request)
+
+
+@app.get("/metrics/runtime")
+async def runtime_metrics() -> dict:
+    service: AnomalyService | None = app.state.service
+    data = service.runtime_stats() if service is not None else {}
+    data["worker"] = app.state.worker_slot
+    data["stream"] = app.state.broadcaster.stats()
+    data["admission"] = app.state.admission.stats()
+    if app.state.relay is not None:
+        data["relay"] = app.state.relay.stats()
+    return data
+
+
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    _update_gauges()
+    peers = [app.state.peer_metrics[worker] for worker in sorted(app.state.peer_metrics)]
+    return PlainTextResponse(
+        REGISTRY.render(_worker_labels(), peers), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+@app.get("/stream/events")
+async def stream_events(request: Request) -> StreamingResponse:
+    broadcaster: EventBroadcaster = app.state.broadcaster
+    subscription = broadcaster.subscribe()
+    return StreamingResponse(
+        _sse_events(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(request: Request, subscription: Subscription) -> AsyncIterator[bytes]:
+    dropped = 0
+    try:
+        yield b"retry: 3000\n\n"
+        while not await request.is_disconnected():
+            messages = await subscription.get(settings.stream_keepalive_seconds)
+            if not messages:
+                yield b": keepalive\n\n"
+                continue
+            if subscription.dropped > dropped:
+                messages.insert(0, {"type": "dropped", "count": subscription.dropped - dropped})
+                dropped = subscription.dropped
+            for message in messages:
+                data = json.dumps(message, ensure_ascii=True)
+                yield f"event: {message['type']}\ndata: {data}\n\n".encode()
+    finally:
+        app.state.broadcaster.unsubscribe(subscription)
+
+
+@app.get("/timeseries")
+async def timeseries(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    source: str | None = None,
+    level: str | None = None,
+    model_version: str | None = None,
+    limit: int = Query(default=360, ge=1, le=10080),
+) -> dict:
+    service: AnomalyService | None = app.state.service
+    if service is None:
+        raise HTTPException(status_code=503, detail="Model not loaded. Train a model first.")
+    items = await run_in_threadpool(
+        service.get_timeseries,
+        since=since,
+        until=until,
+        source=source,
+        level=level,
+        model_version=model_version,
+        limit=limit,
+    )
+    return {"items": items}
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
-def dashboard() -> str:
+async def dashboard() -> str:
     return DASHBOARD_HTML
 
 
@@ -192,6 +638,9 @@ DASHBOARD_HTML = """
     table { width: 100%; border-collapse: collapse; margin-top: 12px; }
     th, td { text-align: left; padding: 8px 6px; border-bottom: 1px solid #e6edf3; font-size: 13px; color: var(--ink); }
     th { color: var(--ink-muted); font-weight: 600; font-size: 12px; text-transform: uppercase; letter-spacing: 0.04em; }
+    .chart { width: 100%; height: 160px; display: block; margin-top: 8px; }
+    .chart .events { fill: none; stroke: #123e60; stroke-width: 2; vector-effect: non-scaling-stroke; }
+    .chart .anomalies { fill: none; stroke: var(--accent); stroke-width: 2; vector-effect: non-scaling-stroke; }
     .badge { display: inline-block; padding: 2px 10px; border-radius: 999px; background: var(--accent-soft); color: #8a2d0f; font-size: 11px; font-weight: 600; }
     @keyframes floatIn {
       from { opacity: 0; transform: translateY(12px); }
@@ -228,6 +677,10 @@ DASHBOARD_HTML = """
         <div class="metric" id="last">-</div>
       </div>
     </div>
+    <div class="card" style="margin-top: 16px;">
+      <h3>Events and anomalies per minute</h3>
+      <svg id="timeseries" class="chart" viewBox="0 0 600 160" preserveAspectRatio="none"></svg>
+    </div>
     <div class="card" style="margin-top: 16px;">
       <h3>Latest anomalies</h3>
       <table>
@@ -248,30 +701,82 @@ DASHBOARD_HTML = """
     async function loadMetrics() {
       const response = await fetch('/metrics');
       const metrics = await response.json();
-      document.getElementById('total').textContent = metrics.total_events;
-      document.getElementById('anomalies').textContent = metrics.anomalies;
-      document.getElementById('rate').textContent = (metrics.anomaly_rate * 100).toFixed(1) + '%';
-      document.getElementById('last').textContent = metrics.last_ingest || '-';
+      live.total = metrics.total_events;
+      live.anomalies = metrics.anomalies;
+      renderMetrics(metrics.last_ingest);
     }
 
     async function loadAnomalies() {
-      const response = await fetch('/anomalies?limit=10');
+      const response = await fetch('/anomalies?limit=10&order=time');
+      const data = await response.json();
+      document.getElementById('anomaly-table').innerHTML = data.items.map(renderAnomalyRow).join('');
+    }
+
+    async function loadTimeseries() {
+      const response = await fetch('/timeseries?limit=120');
       const data = await response.json();
-      const rows = data.items.map(item => {
-        return `<tr>
+      const peak = Math.max(1, ...data.items.map(item => item.events));
+      const step = data.items.length > 1 ? 600 / (data.items.length - 1) : 0;
+      const points = key => data.items.map((item, i) => {
+        return `${(i * step).toFixed(1)},${(155 - item[key] / peak * 150).toFixed(1)}`;
+      }).join(' ');
+      document.getElementById('timeseries').innerHTML =
+        `<polyline class="events" points="${points('events')}" />` +
+        `<polyline class="anomalies" points="${points('anomalies')}" />`;
+    }
+
+    function renderAnomalyRow(item) {
+      return `<tr>
           <td>${item.timestamp}</td>
           <td>${item.host || item.service || '-'}</td>
           <td><span class="badge">${item.level}</span></td>
           <td>${item.message}</td>
           <td>${item.anomaly_score.toFixed(2)}</td>
         </tr>`;
-      });
-      document.getElementById('anomaly-table').innerHTML = rows.join('');
     }
 
-    loadMetrics();
-    loadAnomalies();
-    setInterval(() => { loadMetrics(); loadAnomalies(); }, 5000);
+    const live = { total: 0, anomalies: 0, timeseriesAt: 0 };
+
+    function renderMetrics(lastIngest) {
+      document.getElementById('total').textContent = live.total;
+      document.getElementById('anomalies').textContent = live.anomalies;
+      const rate = live.total ? live.anomalies / live.total : 0;
+      document.getElementById('rate').textContent = (rate * 100).toFixed(1) + '%';
+      document.getElementById('last').textContent = lastIngest || '-';
+    }
+
+    function refreshTimeseries() {
+      const now = Date.now();
+      if (now - live.timeseriesAt >= 5000) {
+        live.timeseriesAt = now;
+        loadTimeseries();
+      }
+    }
+
+    function reloadAll() {
+      loadMetrics();
+      loadAnomalies();
+      refreshTimeseries();
+    }
+
+    const stream = new EventSource('/stream/events');
+    stream.addEventListener('open', reloadAll);
+    stream.addEventListener('dropped', reloadAll);
+    stream.addEventListener('metrics', event => {
+      const delta = JSON.parse(event.data);
+      live.total += delta.events;
+      live.anomalies += delta.anomalies;
+      renderMetrics(delta.last_ingest);
+      refreshTimeseries();
+    });
+    stream.addEventListener('anomalies', event => {
+      const items = JSON.parse(event.data).items;
+      const table = document.getElementById('anomaly-table');
+      table.insertAdjacentHTML('afterbegin', items.slice(-10).reverse().map(renderAnomalyRow).join(''));
+      while (table.rows.length > 10) {
+        table.deleteRow(-1);
+      }
+    });
   </script>
 </body>
 </html>
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: dict[str, int],
+        on_reject: Callable[[], None] | None = None,
+    ) -> None:
+        self.app = app
+        self.limits = limits
+        self.on_reject = on_reject
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope["path"], 0) if scope["type"] == "http" else 0
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            self._rejected()
+            response = JSONResponse({"detail": _detail(limit)}, status_code=413)
+            await response(scope, receive, send)
+            return
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    self._rejected()
+                    raise HTTPException(status_code=413, detail=_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _rejected(self) -> None:
+        if self.on_reject is not None:
+            self.on_reject()
+
+
+def _detail(limit: int) -> str:
+    return f"Request body exceeds {limit} bytes"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from infrastructure.instrumentation import INGEST_SHED
+
+DRAIN_WINDOW_SECONDS = 10.0
+MAX_RETRY_AFTER_SECONDS = 60
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(f"Ingest {reason}; retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, amount: float, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        needed = min(amount, self.burst)
+        if self.tokens < needed:
+            return (needed - self.tokens) / self.rate
+        self.tokens -= amount
+        return 0.0
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_inflight_events: int = 0,
+        source_rate: float = 0.0,
+        source_burst: float = 0.0,
+        max_sources: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_inflight_events = max_inflight_events
+        self.source_rate = source_rate
+        self.source_burst = source_burst or source_rate
+        self.max_sources = max_sources
+        self.clock = clock
+        self.inflight_events = 0
+        self.admitted_requests = 0
+        self.admitted_events = 0
+        self.rejected: dict[str, int] = {"saturated": 0, "quota": 0, "too_large": 0}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._drained: deque[tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def admit(self, events: int, source: str | None = None) -> Iterator[None]:
+        self.acquire(events, source)
+        try:
+            yield
+        finally:
+            self.release(events)
+
+    def acquire(self, events: int, source: str | None = None) -> None:
+        now = self.clock()
+        with self._lock:
+            limit = self.max_inflight_events
+            if limit and self.inflight_events and self.inflight_events + events > limit:
+                backlog = self.inflight_events + events - limit
+                self._reject("saturated", backlog / max(self._drain_rate(now), 1.0))
+            if self.source_rate > 0 and source is not None:
+                wait = self._bucket(source, now).take(events, now)
+                if wait > 0:
+                    self._reject("quota", wait)
+            self.inflight_events += events
+            self.admitted_requests += 1
+            self.admitted_events += events
+
+    def release(self, events: int) -> None:
+        now = self.clock()
+        with self._lock:
+            self.inflight_events -= events
+            self._drained.append((now, events))
+            self._trim(now)
+
+    def record_too_large(self) -> None:
+        with self._lock:
+            self.rejected["too_large"] += 1
+        INGEST_SHED.inc(reason="too_large")
+
+    def drain_rate(self) -> float:
+        with self._lock:
+            return self._drain_rate(self.clock())
+
+    def stats(self) -> dict[str, object]:
+        now = self.clock()
+        with self._lock:
+            return {
+                "inflight_events": self.inflight_events,
+                "max_inflight_events": self.max_inflight_events,
+                "admitted_requests": self.admitted_requests,
+                "admitted_events": self.admitted_events,
+                "rejected": dict(self.rejected),
+                "drain_events_per_second": self._drain_rate(now),
+                "tracked_sources": len(self._buckets),
+            }
+
+    def _reject(self, reason: str, wait_seconds: float) -> None:
+        self.rejected[reason] += 1
+        INGEST_SHED.inc(reason=reason)
+        retry_after = min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(wait_seconds)))
+        raise AdmissionRejected(reason, retry_after)
+
+    def _bucket(self, source: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(source)
+        if bucket is None:
+            if len(self._buckets) >= self.max_sources:
+                self._buckets.pop(next(iter(self._buckets)))
+            bucket = self._buckets[source] = TokenBucket(self.source_rate, self.source_burst, now)
+        return bucket
+
+    def _drain_rate(self, now: float) -> float:
+        self._trim(now)
+        if not self._drained:
+            return 0.0
+        span = max(now - self._drained[0][0], 1.0)
+        return sum(events for _, events in self._drained) / span
+
+    def _trim(self, now: float) -> None:
+        while self._drained and now - self._drained[0][0] > DRAIN_WINDOW_SECONDS:
+            self._drained.popleft()
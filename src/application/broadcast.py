@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from collections.abc import Callable
+
+
+class Subscription:
+    def __init__(self, max_buffer: int) -> None:
+        self.dropped = 0
+        self._buffer: deque[dict] = deque(maxlen=max_buffer)
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def push(self, message: dict) -> None:
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(message)
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            pass
+
+    async def get(self, timeout: float) -> list[dict]:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        with self._lock:
+            messages = list(self._buffer)
+            self._buffer.clear()
+        return messages
+
+
+class EventBroadcaster:
+    def __init__(
+        self, max_buffer: int = 256, forward: Callable[[dict], None] | None = None
+    ) -> None:
+        self.max_buffer = max_buffer
+        self.forward = forward
+        self.published = 0
+        self.relayed = 0
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_buffer)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscription in subscribers:
+            subscription.push(message)
+        if self.forward is not None:
+            self.forward(message)
+
+    def deliver(self, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.relayed += 1
+        for subscription in subscribers:
+            subscription.push(message)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "relayed": self.relayed,
+            "dropped": sum(subscription.dropped for subscription in subscribers),
+        }
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from domain.models import AnomalyResult
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+IngestHandler = Callable[[list[str], str], Awaitable[list[AnomalyResult]]]
+
+
+class _PendingBatch:
+    def __init__(self) -> None:
+        self.requests: list[tuple[list[str], asyncio.Future]] = []
+        self.events = 0
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class IngestCoalescer:
+    def __init__(
+        self, handler: IngestHandler, max_events: int = 500, max_wait_ms: float = 10.0
+    ) -> None:
+        self.handler = handler
+        self.max_events = max_events
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: dict[str, _PendingBatch] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.requests = 0
+        self.events = 0
+        self.bypassed = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    async def submit(self, lines: list[str], fmt: str) -> list[AnomalyResult]:
+        lines = [line for line in lines if line.strip()]
+        if not lines:
+            return []
+        if len(lines) >= self.max_events:
+            self.bypassed += 1
+            return await self.handler(lines, fmt)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(fmt)
+        if batch is None:
+            batch = self._pending[fmt] = _PendingBatch()
+            batch.timer = loop.call_later(self.max_wait, self._flush, fmt)
+        batch.requests.append((lines, future))
+        batch.events += len(lines)
+        if batch.events >= self.max_events:
+            self._flush(fmt)
+        return await future
+
+    async def drain(self) -> None:
+        for fmt in list(self._pending):
+            self._flush(fmt)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, object]:
+        labels = [*(str(bound) for bound in BATCH_SIZE_BUCKETS), "+Inf"]
+        buckets = dict(zip(labels, self.batch_size_counts, strict=True))
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "events": self.events,
+            "bypassed": self.bypassed,
+            "avg_batch_events": self.events / self.batches if self.batches else 0.0,
+            "batch_size_counts": buckets,
+        }
+
+    def _flush(self, fmt: str) -> None:
+        batch = self._pending.pop(fmt, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._run(fmt, batch.requests))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, fmt: str, requests: list[tuple[list[str], asyncio.Future]]) -> None:
+        lines = [line for request_lines, _ in requests for line in request_lines]
+        self._observe(len(requests), len(lines))
+        try:
+            results = await self.handler(lines, fmt)
+        except ValueError as exc:
+            if len(requests) == 1:
+                _fail(requests[0][1], exc)
+                return
+            await asyncio.gather(*(self._run_single(fmt, *request) for request in requests))
+            return
+        except Exception as exc:
+            for _, future in requests:
+                _fail(future, exc)
+            return
+        offset = 0
+        for request_lines, future in requests:
+            if not future.done():
+                future.set_result(results[offset : offset + len(request_lines)])
+            offset += len(request_lines)
+
+    async def _run_single(self, fmt: str, lines: list[str], future: asyncio.Future) -> None:
+        try:
+            results = await self.handler(lines, fmt)
+        except Exception as exc:
+            _fail(future, exc)
+            return
+        if not future.done():
+            future.set_result(results)
+
+    def _observe(self, requests: int, events: int) -> None:
+        self.batches += 1
+        self.requests += requests
+        self.events += events
+        for index, bound in enumerate(BATCH_SIZE_BUCKETS):
+            if events <= bound:
+                self.batch_size_counts[index] += 1
+                return
+        self.batch_size_counts[-1] += 1
+
+
+def _fail(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
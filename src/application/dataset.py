@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from application.ingestion import iter_lines
+from application.parsers import LogParser
+from domain.models import LogEvent
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_BYTES = 1 << 20
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ARRAY_TYPES = {
+    "timestamps": "q",
+    "utc_offsets": "i",
+    "level_ids": "i",
+    "message_ids": "i",
+    "message_lengths": "i",
+    "source_ids": "i",
+    "has_ip": "b",
+    "user_lengths": "i",
+    "request_lengths": "i",
+    "attribute_counts": "i",
+}
+TABLES = ("levels", "messages", "sources")
+
+
+@dataclass
+class EventColumns:
+    timestamps: np.ndarray
+    utc_offsets: np.ndarray
+    level_ids: np.ndarray
+    message_ids: np.ndarray
+    message_lengths: np.ndarray
+    source_ids: np.ndarray
+    has_ip: np.ndarray
+    user_lengths: np.ndarray
+    request_lengths: np.ndarray
+    attribute_counts: np.ndarray
+    levels: list[str]
+    messages: list[str]
+    sources: list[str]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_events(cls, events: Iterable[LogEvent]) -> EventColumns:
+        builder = _ColumnsBuilder()
+        for event in events:
+            builder.append(event)
+        return builder.build()
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], fmt: str, parser: LogParser) -> EventColumns:
+        builder = _ColumnsBuilder()
+        for line in lines:
+            for event in parser.parse_lines([line], fmt):
+                builder.append(event)
+        return builder.build()
+
+    def save(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_TYPES:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        for name in TABLES:
+            encoded = [value.encode("utf-8") for value in getattr(self, name)]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            np.save(directory / f"{name}.offsets.npy", offsets)
+            (directory / f"{name}.bin").write_bytes(b"".join(encoded))
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> EventColumns:
+        mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in ARRAY_TYPES}
+        tables = {}
+        for name in TABLES:
+            offsets = np.load(directory / f"{name}.offsets.npy").tolist()
+            blob = (directory / f"{name}.bin").read_bytes()
+            tables[name] = [
+                blob[start:end].decode("utf-8")
+                for start, end in zip(offsets[:-1], offsets[1:], strict=True)
+            ]
+        return cls(**arrays, **tables)
+
+
+class _ColumnsBuilder:
+    def __init__(self) -> None:
+        self.arrays = {name: array(code) for name, code in ARRAY_TYPES.items()}
+        self.tables: dict[str, dict[str, int]] = {name: {} for name in TABLES}
+
+    def append(self, event: LogEvent) -> None:
+        timestamp = event.timestamp
+        offset = timestamp.utcoffset()
+        if offset is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        delta = timestamp - EPOCH
+        message = event.message or ""
+        arrays = self.arrays
+        arrays["timestamps"].append(
+            (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+        )
+        arrays["utc_offsets"].append(int(offset.total_seconds()) if offset else 0)
+        arrays["level_ids"].append(self._intern("levels", event.level))
+        arrays["message_ids"].append(self._intern("messages", message))
+        arrays["message_lengths"].append(len(message))
+        arrays["source_ids"].append(self._intern("sources", event.source))
+        arrays["has_ip"].append(1 if event.ip else 0)
+        arrays["user_lengths"].append(len(event.user) if event.user else 0)
+        arrays["request_lengths"].append(len(event.request_id) if event.request_id else 0)
+        arrays["attribute_counts"].append(len(event.attributes) if event.attributes else 0)
+
+    def build(self) -> EventColumns:
+        arrays = {
+            name: np.frombuffer(values, dtype=values.typecode).copy()
+            if values
+            else np.zeros(0, dtype=values.typecode)
+            for name, values in self.arrays.items()
+        }
+        arrays["has_ip"] = arrays["has_ip"].astype(bool)
+        tables = {name: list(values) for name, values in self.tables.items()}
+        return EventColumns(**arrays, **tables)
+
+    def _intern(self, table: str, value: str) -> int:
+        values = self.tables[table]
+        index = values.get(value)
+        if index is None:
+            index = values[value] = len(values)
+        return index
+
+
+class DatasetCache:
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def load_or_build(
+        self, path: Path, fmt: str, parser: LogParser | None = None
+    ) -> tuple[EventColumns, bool]:
+        parser = parser or LogParser()
+        key, source = self.key(path, fmt, parser)
+        entry = self.cache_dir / key
+        if (entry / "meta.json").exists():
+            logger.info("dataset_cache_hit", extra={"path": str(path), "key": key})
+            return EventColumns.load(entry), True
+        columns = EventColumns.from_lines(iter_lines(path), fmt, parser)
+        self._store(entry, columns, source)
+        logger.info("dataset_cached", extra={"path": str(path), "key": key, "rows": len(columns)})
+        return EventColumns.load(entry), False
+
+    def key(self, path: Path, fmt: str, parser: LogParser) -> tuple[str, dict[str, object]]:
+        path = Path(path).resolve()
+        stat = path.stat()
+        source = {
+            "path": str(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "content_hash": _file_digest(path),
+            "format": fmt.lower(),
+            "plain_patterns": [regex.pattern for regex in parser.plain_regexes],
+            "version": CACHE_FORMAT_VERSION,
+        }
+        encoded = json.dumps(source, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest(), source
+
+    def _store(self, entry: Path, columns: EventColumns, source: dict[str, object]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".building-"))
+        try:
+            columns.save(staging)
+            meta = {**source, "rows": len(columns), "created_at": datetime.now(timezone.utc)}
+            (staging / "meta.json").write_text(json.dumps(meta, default=str), encoding="utf-8")
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not (entry / "meta.json").exists():
+                raise
+        self._evict_stale(entry, source["path"])
+
+    def _evict_stale(self, current: Path, source_path: object) -> None:
+        for meta_path in self.cache_dir.glob("*/meta.json"):
+            entry = meta_path.parent
+            if entry == current:
+                continue
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if meta.get("path") == source_path:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
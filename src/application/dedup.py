@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from domain.models import AnomalyResult, LogEvent
+
+ISO_TIMESTAMP_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+)
+
+TimestampSplitter = Callable[[str], tuple[str, datetime | None]]
+
+
+def split_iso_timestamp(line: str) -> tuple[str, datetime | None]:
+    match = ISO_TIMESTAMP_RE.search(line)
+    if match is None:
+        return line, None
+    try:
+        timestamp = datetime.fromisoformat(match[0].replace(",", ".").replace("Z", "+00:00"))
+    except ValueError:
+        return line, None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return line[: match.start()] + line[match.end() :], timestamp
+
+
+@dataclass
+class CollapsedLines:
+    lines: list[str] = field(default_factory=list)
+    counts: list[int] = field(default_factory=list)
+    last_timestamps: list[datetime | None] = field(default_factory=list)
+    positions: list[int] = field(default_factory=list)
+    continues: list[bool] = field(default_factory=list)
+
+    @property
+    def collapsed(self) -> int:
+        return len(self.positions) - len(self.lines)
+
+    def annotate(self, index: int, event: LogEvent) -> LogEvent:
+        event.repeat_count = self.counts[index]
+        event.continues_group = self.continues[index]
+        last = self.last_timestamps[index]
+        if self.counts[index] > 1 and last is not None and last > event.timestamp:
+            event.last_timestamp = last
+        return event
+
+    def apply(self, results: Sequence[AnomalyResult]) -> list[AnomalyResult]:
+        if len(results) != len(self.lines):
+            raise ValueError("Scored results do not match collapsed lines")
+        for index, result in enumerate(results):
+            self.annotate(index, result.event)
+        return [results[position] for position in self.positions]
+
+
+class LineDeduplicator:
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        max_keys: int = 10000,
+        splitter: TimestampSplitter = split_iso_timestamp,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.splitter = splitter
+        self.lines_in = 0
+        self.lines_out = 0
+        self.continued = 0
+        self._groups: OrderedDict[bytes, datetime] = OrderedDict()
+        self._latest: datetime | None = None
+        self._lock = threading.Lock()
+
+    def collapse(self, lines: Sequence[str]) -> CollapsedLines:
+        collapsed = CollapsedLines()
+        indexes: dict[bytes, int] = {}
+        first_timestamps: list[datetime | None] = []
+        with self._lock:
+            for line in lines:
+                if not line.strip():
+                    continue
+                stripped, timestamp = self.splitter(line)
+                key = hashlib.blake2b(stripped.encode("utf-8"), digest_size=16).digest()
+                index = indexes.get(key)
+                if index is not None and _within(
+                    first_timestamps[index], timestamp, self.window_seconds
+                ):
+                    collapsed.counts[index] += 1
+                    last = collapsed.last_timestamps[index]
+                    if timestamp is not None and (last is None or timestamp > last):
+                        collapsed.last_timestamps[index] = timestamp
+                    collapsed.positions.append(index)
+                    continue
+                first_seen = self._groups.get(key)
+                continues = first_seen is not None and _within(
+                    first_seen, timestamp, self.window_seconds
+                )
+                if not continues:
+                    first_seen = timestamp
+                    self._track(key, timestamp)
+                index = len(collapsed.lines)
+                if len(indexes) < self.max_keys or key in indexes:
+                    indexes[key] = index
+                collapsed.lines.append(line)
+                collapsed.counts.append(1)
+                collapsed.last_timestamps.append(timestamp)
+                collapsed.continues.append(continues)
+                first_timestamps.append(first_seen)
+                collapsed.positions.append(index)
+            self.lines_in += len(collapsed.positions)
+            self.lines_out += len(collapsed.lines)
+            self.continued += sum(collapsed.continues)
+        return collapsed
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            lines_in, lines_out = self.lines_in, self.lines_out
+            continued, tracked = self.continued, len(self._groups)
+        return {
+            "window_seconds": self.window_seconds,
+            "lines": lines_in,
+            "representatives": lines_out,
+            "collapsed": lines_in - lines_out,
+            "continued": continued,
+            "tracked_keys": tracked,
+        }
+
+    def _track(self, key: bytes, timestamp: datetime | None) -> None:
+        self._groups.pop(key, None)
+        if timestamp is None:
+            return
+        if self._latest is None or timestamp > self._latest:
+            self._latest = timestamp
+        while self._groups:
+            oldest, first_seen = next(iter(self._groups.items()))
+            expired = (self._latest - first_seen).total_seconds() > self.window_seconds
+            if not expired and len(self._groups) < self.max_keys:
+                break
+            del self._groups[oldest]
+        self._groups[key] = timestamp
+
+
+def _within(first: datetime | None, timestamp: datetime | None, window: float) -> bool:
+    if first is None or timestamp is None:
+        return True
+    return abs((timestamp - first).total_seconds()) <= window
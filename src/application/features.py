@@ -7,7 +7,9 @@ from datetime import datetime
 
 import numpy as np
 
+from application.dataset import EventColumns
 from domain.models import LogEvent
+from infrastructure.instrumentation import timed
 
 LEVEL_MAP = {
     "DEBUG": 0,
@@ -17,6 +19,7 @@ LEVEL_MAP = {
     "ERROR": 4,
     "CRITICAL": 5,
     "ALERT": 6,
+    "EMERGENCY": 7,
 }
 
 IP_RE = re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")
@@ -65,23 +68,48 @@ class FeatureExtractor:
         ]
 
     def transform(self, events: list[LogEvent]) -> np.ndarray:
-        rows = [self._event_to_features(event) for event in events]
-        return np.array(rows, dtype=float)
+        with timed("featurize", len(events)):
+            rows = [self._event_to_features(event) for event in events]
+            return np.array(rows, dtype=float)
+
+    def transform_columns(self, columns: EventColumns) -> np.ndarray:
+        with timed("featurize", len(columns)):
+            messages = np.array(
+                [_message_features(message) for message in columns.messages], dtype=float
+            ).reshape(-1, 10)[columns.message_ids]
+            levels = np.array(
+                [LEVEL_MAP.get(level.upper(), 7) for level in columns.levels], dtype=float
+            )
+            hosts = np.array([_hash_bucket(source) for source in columns.sources], dtype=float)
+            seconds = columns.timestamps // 1_000_000_000 + columns.utc_offsets
+            hour = ((seconds // 3600) % 24).astype(float)
+            weekday = ((seconds // 86400 + 3) % 7).astype(float)
+            radians = 2 * np.pi * hour / 24.0
+            has_ip = (columns.has_ip | (messages[:, 8] > 0)).astype(float)
+            return np.column_stack(
+                [
+                    levels[columns.level_ids],
+                    messages[:, :9],
+                    has_ip,
+                    hour,
+                    np.sin(radians),
+                    np.cos(radians),
+                    weekday,
+                    (weekday >= 5).astype(float),
+                    (columns.user_lengths > 0).astype(float),
+                    columns.user_lengths.astype(float),
+                    (columns.request_lengths > 0).astype(float),
+                    columns.request_lengths.astype(float),
+                    columns.attribute_counts.astype(float),
+                    hosts[columns.source_ids],
+                    messages[:, 9],
+                ]
+            )
 
     def _event_to_features(self, event: LogEvent) -> list[float]:
         level_code = LEVEL_MAP.get(event.level.upper(), 7)
-        message = event.message or ""
-        message_len = float(len(message))
-        words = WORD_RE.findall(message)
-        message_words = float(len(words))
-        unique_word_ratio = _safe_ratio(len(set(words)), len(words))
-        digit_count = float(len(DIGIT_RE.findall(message)))
-        digit_ratio = _safe_ratio(digit_count, message_len)
-        uppercase_ratio = _uppercase_ratio(message)
-        special_char_count = float(len(SPECIAL_RE.findall(message)))
-        keyword_hits = float(len(KEYWORD_RE.findall(message)))
-        ip_count = float(len(IP_RE.findall(message)))
-        has_ip = 1.0 if event.ip or ip_count else 0.0
+        message_features = _message_features(event.message or "")
+        has_ip = 1.0 if event.ip or message_features[8] else 0.0
         hour, hour_sin, hour_cos, weekday, is_weekend = _time_features(event.timestamp)
         has_user = 1.0 if event.user else 0.0
         user_length = float(len(event.user)) if event.user else 0.0
@@ -89,18 +117,9 @@ class FeatureExtractor:
         request_length = float(len(event.request_id)) if event.request_id else 0.0
         attributes_count = float(len(event.attributes)) if event.attributes else 0.0
         host_hash = _hash_bucket(event.source)
-        template_hash = _hash_bucket(_normalize_message(message))
         return [
             float(level_code),
-            message_len,
-            message_words,
-            unique_word_ratio,
-            digit_count,
-            digit_ratio,
-            uppercase_ratio,
-            special_char_count,
-            keyword_hits,
-            ip_count,
+            *message_features[:9],
             has_ip,
             hour,
             hour_sin,
@@ -113,10 +132,28 @@ class FeatureExtractor:
             request_length,
             attributes_count,
             host_hash,
-            template_hash,
+            message_features[9],
         ]
 
 
+def _message_features(message: str) -> tuple[float, ...]:
+    message_len = float(len(message))
+    words = WORD_RE.findall(message)
+    digit_count = float(len(DIGIT_RE.findall(message)))
+    return (
+        message_len,
+        float(len(words)),
+        _safe_ratio(len(set(words)), len(words)),
+        digit_count,
+        _safe_ratio(digit_count, message_len),
+        _uppercase_ratio(message),
+        float(len(SPECIAL_RE.findall(message))),
+        float(len(KEYWORD_RE.findall(message))),
+        float(len(IP_RE.findall(message))),
+        _hash_bucket(_normalize_message(message)),
+    )
+
+
 def _time_features(timestamp: datetime) -> tuple[float, float, float, float, float]:
     hour = float(timestamp.hour)
     weekday = float(timestamp.weekday())
@@ -1,19 +1,37 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import BinaryIO
 
 from application.parsers import LogParser
 from domain.models import LogEvent
 
+MAX_LINE_BYTES = 1 << 20
+INFLATE_CHUNK_BYTES = 1 << 20
+READ_CHUNK_BYTES = 1 << 20
+PREFETCH_CHUNKS = 4
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
 
 class LogIngestor:
     def __init__(self, parser: LogParser) -> None:
         self.parser = parser
 
     def ingest_file(self, path: Path, fmt: str) -> list[LogEvent]:
-        lines = path.read_text(encoding="utf-8").splitlines()
-        return self.parser.parse_lines(lines, fmt)
+        return self.parser.parse_lines(iter_lines(path), fmt)
 
     def ingest_stream(self, source: StreamSource) -> Iterable[LogEvent]:
         return source.read()
@@ -22,3 +40,142 @@ class LogIngestor:
 class StreamSource:
     def read(self) -> Iterable[LogEvent]:
         raise NotImplementedError("Implement stream reading for Kafka or Redis Streams")
+
+
+class LineDecoder:
+    def __init__(
+        self, compression: str | None = None, max_line_bytes: int = MAX_LINE_BYTES
+    ) -> None:
+        if compression not in {None, "gzip"}:
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.max_line_bytes = max_line_bytes
+        self._decompressor = _gzip_decompressor() if compression == "gzip" else None
+        self._received = False
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> list[str]:
+        lines: list[str] = []
+        for data in self._inflate(chunk):
+            lines.extend(self._split(data))
+        return lines
+
+    def close(self) -> list[str]:
+        if self._decompressor is not None and self._received and not self._decompressor.eof:
+            raise ValueError("Truncated gzip stream")
+        tail, self._buffer = self._buffer, b""
+        return [tail.decode("utf-8")] if tail else []
+
+    def _inflate(self, chunk: bytes) -> Iterator[bytes]:
+        if self._decompressor is None:
+            yield chunk
+            return
+        data = chunk
+        while data:
+            self._received = True
+            try:
+                output = self._decompressor.decompress(data, INFLATE_CHUNK_BYTES)
+            except zlib.error as exc:
+                raise ValueError(f"Invalid gzip stream: {exc}") from exc
+            if output:
+                yield output
+            if self._decompressor.unconsumed_tail:
+                data = self._decompressor.unconsumed_tail
+            elif self._decompressor.eof and self._decompressor.unused_data:
+                data = self._decompressor.unused_data
+                self._decompressor = _gzip_decompressor()
+            else:
+                data = b""
+
+    def _split(self, data: bytes) -> list[str]:
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+        if len(self._buffer) > self.max_line_bytes:
+            raise ValueError(f"Line exceeds {self.max_line_bytes} bytes")
+        return [line.decode("utf-8") for line in lines]
+
+
+def detect_compression(path: Path) -> str | None:
+    with open(path, "rb") as handle:
+        head = handle.read(6)
+    for magic, compression in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_log_file(path: Path) -> BinaryIO:
+    compression = detect_compression(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ValueError(f"{path} is zstd-compressed; install zstandard to read it") from exc
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def iter_lines(path: Path, prefetch: bool | None = None) -> Iterator[str]:
+    handle = open_log_file(path)
+    if prefetch is None:
+        prefetch = not isinstance(handle, io.BufferedReader)
+    chunks = _prefetch_chunks(handle) if prefetch else _read_chunks(handle)
+    pending = b""
+    for chunk in chunks:
+        head, separator, tail = chunk.rpartition(b"\n")
+        if not separator:
+            pending += tail
+            continue
+        yield from (pending + head).decode("utf-8").splitlines()
+        pending = tail
+    if pending:
+        yield from pending.decode("utf-8").splitlines()
+
+
+def _read_chunks(handle: BinaryIO) -> Iterator[bytes]:
+    with handle:
+        while chunk := handle.read(READ_CHUNK_BYTES):
+            yield chunk
+
+
+def _prefetch_chunks(handle: BinaryIO, depth: int = PREFETCH_CHUNKS) -> Iterator[bytes]:
+    chunks: queue.Queue[bytes | BaseException | None] = queue.Queue(depth)
+    stopped = threading.Event()
+
+    def put(item: bytes | BaseException | None) -> None:
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def produce() -> None:
+        try:
+            for chunk in _read_chunks(handle):
+                if stopped.is_set():
+                    return
+                put(chunk)
+        except BaseException as exc:
+            put(exc)
+            return
+        put(None)
+
+    thread = threading.Thread(target=produce, name="log-decompress", daemon=True)
+    thread.start()
+    try:
+        while (item := chunks.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _gzip_decompressor():
+    return zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from application.training import retrain_from_storage
+from infrastructure.registry import ModelRegistry
+from infrastructure.settings import Settings
+from infrastructure.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    name = "periodic_job"
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("periodic_job_failed", extra={"job": self.name})
+            self._stop.wait(self.interval_seconds)
+
+
+class RetentionJob(PeriodicJob):
+    name = "retention_job"
+
+    def __init__(self, storage: Storage, retention_days: int, interval_seconds: float) -> None:
+        super().__init__(interval_seconds)
+        self.storage = storage
+        self.retention_days = retention_days
+
+    def run_once(self) -> None:
+        compacted = self.storage.compact_expired(self.retention_days)
+        if compacted:
+            logger.info(
+                "raw_records_compacted",
+                extra={"count": compacted, "retention_days": self.retention_days},
+            )
+
+
+class ModelWatchJob(PeriodicJob):
+    name = "model_watch_job"
+
+    def __init__(self, reload_model: Callable[[], object], interval_seconds: float) -> None:
+        super().__init__(interval_seconds)
+        self.reload_model = reload_model
+
+    def run_once(self) -> None:
+        self.reload_model()
+
+
+class MetricsShareJob(PeriodicJob):
+    name = "metrics_share_job"
+
+    def __init__(self, share: Callable[[], object], interval_seconds: float) -> None:
+        super().__init__(interval_seconds)
+        self.share = share
+
+    def run_once(self) -> None:
+        self.share()
+
+
+class RetrainJob(PeriodicJob):
+    name = "retrain_job"
+
+    def __init__(
+        self,
+        settings: Settings,
+        interval_seconds: float,
+        on_model_changed: Callable[[], object] | None = None,
+        isolated: bool = True,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(interval_seconds)
+        self.settings = settings
+        self.seed = seed
+        self.registry = ModelRegistry(settings.artifact_dir)
+        self.on_model_changed = on_model_changed
+        self.isolated = isolated
+        self.last_metadata: dict[str, object] | None = None
+
+    def _run(self) -> None:
+        self._stop.wait(self.interval_seconds)
+        super()._run()
+
+    def run_once(self) -> None:
+        lock = self.registry.retrain_lock()
+        if lock.acquire(blocking=False):
+            try:
+                if self._recently_trained():
+                    self.last_metadata = None
+                else:
+                    self.last_metadata = self._retrain()
+            finally:
+                lock.release()
+        if self.on_model_changed is not None:
+            self.on_model_changed()
+
+    def _recently_trained(self) -> bool:
+        try:
+            trained_at = self.registry.latest_metadata().get("trained_at")
+        except FileNotFoundError:
+            return False
+        if not trained_at:
+            return False
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(str(trained_at))
+        return age < timedelta(seconds=self.interval_seconds)
+
+    def _retrain(self) -> dict[str, object] | None:
+        if not self.isolated:
+            return run_retrain(self.settings, self.seed)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            return executor.submit(run_retrain, self.settings, self.seed).result()
+
+
+def run_retrain(settings: Settings, seed: int | None = None) -> dict[str, object] | None:
+    storage = Storage(settings.database_url, settings)
+    try:
+        return retrain_from_storage(
+            storage,
+            ModelRegistry(settings.artifact_dir),
+            settings.model_type,
+            window_days=settings.retrain_window_days,
+            max_events=settings.retrain_max_events,
+            min_events=settings.retrain_min_events,
+            seed=seed,
+        )
+    finally:
+        storage.engine.dispose()
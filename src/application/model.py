@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
+from application.dataset import EventColumns
 from domain.models import AnomalyResult, LogEvent
 
 
@@ -14,6 +15,14 @@ class IAnomalyDetector(ABC):
     def score(self, events: list[LogEvent]) -> list[float]:
         raise NotImplementedError
 
+    @abstractmethod
+    def train_columns(self, columns: EventColumns) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def score_columns(self, columns: EventColumns) -> list[float]:
+        raise NotImplementedError
+
     @abstractmethod
     def predict(self, events: list[LogEvent], threshold: float) -> list[AnomalyResult]:
         raise NotImplementedError
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import random
+
+from domain.models import AnomalyResult
+
+
+class PersistencePolicy:
+    def __init__(self, normal_sample_rate: float = 1.0, seed: int | None = None) -> None:
+        if not 0.0 <= normal_sample_rate <= 1.0:
+            raise ValueError("normal_sample_rate must be between 0 and 1")
+        self.normal_sample_rate = normal_sample_rate
+        self._random = random.Random(seed)
+
+    def apply(self, results: list[AnomalyResult]) -> list[AnomalyResult]:
+        rate = self.normal_sample_rate
+        weight = 1.0 / rate if rate > 0 else 0.0
+        for result in results:
+            if result.event.continues_group:
+                result.weight = 0.0
+            elif rate < 1.0 and not result.is_anomaly:
+                result.weight = weight if self._random.random() < rate else 0.0
+        return results
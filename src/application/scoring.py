@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from application.model import IAnomalyDetector
+from application.parsers import LogParser
+from domain.models import AnomalyResult
+from infrastructure.registry import ModelRegistry
+
+_registry: ModelRegistry | None = None
+_parser: LogParser | None = None
+_detector: IAnomalyDetector | None = None
+_metadata: dict[str, object] = {}
+
+
+def scoring_worker_count(requested: int, slot: int = 0, web_workers: int = 1) -> int:
+    total = max(0, min(requested, (os.cpu_count() or 1) - 1))
+    return total // web_workers + (1 if slot < total % web_workers else 0)
+
+
+def _init_worker(artifact_dir: str, metadata: dict[str, object]) -> None:
+    global _registry, _parser
+    _registry = ModelRegistry(artifact_dir)
+    _parser = LogParser()
+    _load_detector(metadata)
+
+
+def _load_detector(metadata: dict[str, object]) -> None:
+    global _detector, _metadata
+    _detector = _registry.load(metadata)
+    _metadata = metadata
+
+
+def _ready() -> None:
+    return None
+
+
+def _score_lines(
+    lines: list[str], fmt: str, threshold: float, metadata: dict[str, object]
+) -> list[AnomalyResult]:
+    if _metadata.get("path") != metadata.get("path"):
+        _load_detector(metadata)
+    events = _parser.parse_lines(lines, fmt)
+    return _detector.predict(events, threshold)
+
+
+class ScoringPool:
+    def __init__(
+        self,
+        artifact_dir: str,
+        workers: int,
+        metadata: dict[str, object],
+        start_method: str = "spawn",
+    ) -> None:
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(artifact_dir, metadata),
+        )
+        for future in [self.executor.submit(_ready) for _ in range(workers)]:
+            future.result()
+
+    async def score_lines(
+        self, lines: list[str], fmt: str, threshold: float, metadata: dict[str, object]
+    ) -> list[AnomalyResult]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, _score_lines, lines, fmt, threshold, metadata
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
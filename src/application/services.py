@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable, Hashable, Iterator
+from datetime import datetime, timezone
 
+from application.broadcast import EventBroadcaster
+from application.cache import CachedResponse, ResponseCache
+from application.coalescer import IngestCoalescer
+from application.dedup import CollapsedLines, LineDeduplicator
 from application.features import FeatureExtractor
 from application.parsers import LogParser
-from domain.models import AnomalyResult
+from application.persistence import PersistencePolicy
+from application.scoring import ScoringPool
+from domain.models import AnomalyQuery, AnomalyResult, LogEvent
+from infrastructure.instrumentation import INGEST_BATCH_EVENTS, MODEL_INFO, timed
 from infrastructure.registry import ModelRegistry
 from infrastructure.settings import Settings
 from infrastructure.storage import Storage
+from infrastructure.write_behind import WriteBehindWriter
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +31,38 @@ class AnomalyService:
         feature_extractor: FeatureExtractor,
         registry: ModelRegistry,
         storage: Storage,
+        writer: WriteBehindWriter | None = None,
+        policy: PersistencePolicy | None = None,
+        broadcaster: EventBroadcaster | None = None,
+        scoring_pool: ScoringPool | None = None,
     ) -> None:
         self.settings = settings
         self.parser = parser
         self.feature_extractor = feature_extractor
         self.registry = registry
         self.storage = storage
+        self.writer = writer
+        self.policy = policy or PersistencePolicy()
+        self.broadcaster = broadcaster
+        self.scoring_pool = scoring_pool
         self.detector, self.metadata = self.registry.load_latest()
+        MODEL_INFO.replace(1, version=self.model_version)
+        self.cache = ResponseCache(settings.response_cache_ttl_seconds)
+        self.deduplicator = (
+            LineDeduplicator(settings.dedup_window_seconds, settings.dedup_max_keys)
+            if settings.dedup_window_seconds > 0
+            else None
+        )
+        self.coalescer = (
+            IngestCoalescer(
+                self.ingest_batch,
+                max_events=settings.coalesce_max_events,
+                max_wait_ms=settings.coalesce_max_wait_ms,
+            )
+            if settings.coalesce_enabled
+            else None
+        )
+        self._commits = 0
 
     @property
     def threshold(self) -> float:
@@ -39,15 +75,154 @@ class AnomalyService:
             return self.settings.baseline_threshold
         return self.settings.anomaly_threshold
 
-    def ingest(self, lines: list[str], fmt: str) -> list[AnomalyResult]:
-        events = self.parser.parse_lines(lines, fmt)
-        results = self.detector.predict(events, self.threshold)
-        self.storage.save_results(results)
-        logger.info("ingested_logs", extra={"count": len(results)})
+    @property
+    def model_version(self) -> str:
+        return str(self.metadata.get("version", "unknown"))
+
+    def reload_model(self) -> bool:
+        if self.registry.latest_metadata().get("version") == self.metadata.get("version"):
+            return False
+        detector, metadata = self.registry.load_latest()
+        self.detector, self.metadata = detector, metadata
+        MODEL_INFO.replace(1, version=self.model_version)
+        logger.info("model_reloaded", extra={"version": self.model_version})
+        return True
+
+    async def ingest(self, lines: list[str], fmt: str) -> list[AnomalyResult]:
+        if self.coalescer is not None:
+            return await self.coalescer.submit(lines, fmt)
+        return await self.ingest_batch(lines, fmt)
+
+    async def ingest_batch(
+        self, lines: list[str], fmt: str, durable: bool = False
+    ) -> list[AnomalyResult]:
+        loop = asyncio.get_running_loop()
+        collapsed = None
+        if self.deduplicator is not None:
+            collapsed = await loop.run_in_executor(None, self.collapse_lines, lines)
+            lines = collapsed.lines
+        if self.scoring_pool is not None:
+            results = await self.scoring_pool.score_lines(lines, fmt, self.threshold, self.metadata)
+        else:
+            results = await loop.run_in_executor(None, self.score_lines, lines, fmt)
+        expanded = collapsed.apply(results) if collapsed is not None else results
+        await loop.run_in_executor(None, self.persist, results, durable)
+        return expanded
+
+    async def drain(self) -> None:
+        if self.coalescer is not None:
+            await self.coalescer.drain()
+
+    def collapse_lines(self, lines: list[str]) -> CollapsedLines | None:
+        if self.deduplicator is None:
+            return None
+        with timed("dedup", len(lines)):
+            return self.deduplicator.collapse(lines)
+
+    def score_lines(self, lines: list[str], fmt: str) -> list[AnomalyResult]:
+        with timed("parse", len(lines)):
+            events = self.parser.parse_lines(lines, fmt)
+        return self.score_events(events)
+
+    def ingest_events(self, events: list[LogEvent]) -> list[AnomalyResult]:
+        results = self.score_events(events)
+        self.persist(results)
         return results
 
-    def get_anomalies(self, limit: int = 50, min_score: float | None = None) -> list[dict]:
-        return self.storage.get_anomalies(limit=limit, min_score=min_score)
+    def score_events(self, events: list[LogEvent]) -> list[AnomalyResult]:
+        with timed("predict", len(events)):
+            return self.detector.predict(events, self.threshold)
+
+    def persist(self, results: list[AnomalyResult], durable: bool = False) -> None:
+        INGEST_BATCH_EVENTS.observe(len(results))
+        results = self.policy.apply(results)
+        with timed("persist", len(results)):
+            if self.writer is not None and not durable:
+                self.writer.submit(results)
+            else:
+                self.storage.save_results(results)
+                self._commits += 1
+        logger.info("ingested_logs", extra={"count": len(results)})
+        if self.broadcaster is not None:
+            self._broadcast(results)
+
+    def _broadcast(self, results: list[AnomalyResult]) -> None:
+        anomalies = [result for result in results if result.is_anomaly]
+        repeats = sum(result.event.repeat_count for result in results)
+        if anomalies:
+            self.broadcaster.publish(
+                {"type": "anomalies", "items": [_result_to_dict(result) for result in anomalies]}
+            )
+        self.broadcaster.publish(
+            {
+                "type": "metrics",
+                "events": repeats,
+                "anomalies": sum(result.event.repeat_count for result in anomalies),
+                "last_ingest": datetime.now(timezone.utc).isoformat(),
+                "model_version": self.model_version,
+            }
+        )
+
+    @property
+    def data_version(self) -> int:
+        flushes = self.writer.flushes if self.writer is not None else 0
+        return self._commits + flushes
+
+    def cached_response(self, key: Hashable, compute: Callable[[], object]) -> CachedResponse:
+        return self.cache.get(key, self.data_version, compute)
+
+    def get_anomalies(self, query: AnomalyQuery) -> list[dict]:
+        return self.storage.get_anomalies(query)
+
+    def iter_anomalies(self, query: AnomalyQuery) -> Iterator[dict]:
+        return self.storage.iter_anomalies(query)
+
+    def get_timeseries(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        source: str | None = None,
+        level: str | None = None,
+        model_version: str | None = None,
+        limit: int = 360,
+    ) -> list[dict]:
+        return self.storage.timeseries(
+            since=since,
+            until=until,
+            source=source,
+            level=level,
+            model_version=model_version,
+            limit=limit,
+        )
 
     def get_metrics(self) -> dict:
         return self.storage.metrics()
+
+    def runtime_stats(self) -> dict:
+        stats: dict[str, object] = {"response_cache": self.cache.stats()}
+        if self.writer is not None:
+            stats["write_behind"] = self.writer.stats()
+        if self.deduplicator is not None:
+            stats["dedup"] = self.deduplicator.stats()
+        if self.coalescer is not None:
+            stats["coalescer"] = self.coalescer.stats()
+        return stats
+
+
+def _result_to_dict(result: AnomalyResult) -> dict:
+    event = result.event
+    return {
+        "timestamp": event.timestamp.isoformat(),
+        "level": event.level,
+        "message": event.message,
+        "host": event.host,
+        "service": event.service,
+        "user": event.user,
+        "ip": event.ip,
+        "request_id": event.request_id,
+        "attributes": event.attributes,
+        "anomaly_score": result.score,
+        "model_version": result.model_version,
+        "repeat_count": event.repeat_count,
+        "last_timestamp": event.last_timestamp.isoformat() if event.last_timestamp else None,
+    }
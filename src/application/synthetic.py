@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import csv
 import json
 import random
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
 
 from domain.models import LogEvent
 
@@ -26,6 +32,9 @@ ANOMALY_MESSAGES = [
     "Service crash detected",
     "Suspicious command execution",
 ]
+LABELS = ("normal", "anomaly", "burst", "new_template")
+HOSTILE_LABELS = (1, 2)
+SECONDS_PER_DAY = 86400.0
 
 
 def generate_events(
@@ -49,7 +58,7 @@ def generate_events(
 def to_json_lines(events: Iterable[LogEvent]) -> list[str]:
     lines: list[str] = []
     for event in events:
-        payload = event.model_dump()
+        payload = event.model_dump(exclude={"repeat_count", "last_timestamp", "continues_group"})
         payload["timestamp"] = event.timestamp.isoformat()
         lines.append(json.dumps(payload, ensure_ascii=True))
     return lines
@@ -116,3 +125,336 @@ def _generate_anomaly_events(count: int, start_time: datetime) -> list[LogEvent]
             )
         )
     return events
+
+
+@dataclass(frozen=True)
+class Burst:
+    offset_seconds: float
+    duration_seconds: float
+    events_per_second: float
+    message: str = "Multiple failed logins detected"
+    level: str = "ERROR"
+    host: str | None = None
+
+
+@dataclass(frozen=True)
+class NewTemplate:
+    offset_seconds: float
+    message: str
+    share: float = 0.01
+    level: str = "INFO"
+
+
+@dataclass
+class TrafficProfile:
+    events_per_second: float = 50.0
+    diurnal_amplitude: float = 0.6
+    peak_hour: float = 14.0
+    hosts: int = len(HOSTS)
+    host_skew: float = 1.1
+    anomaly_ratio: float = 0.0
+    bursts: list[Burst] = field(default_factory=list)
+    new_templates: list[NewTemplate] = field(default_factory=list)
+
+
+@dataclass
+class TrafficChunk:
+    start: int
+    timestamps: np.ndarray
+    levels: np.ndarray
+    hosts: np.ndarray
+    messages: np.ndarray
+    users: np.ndarray
+    octets: np.ndarray
+    request_numbers: np.ndarray
+    latencies: np.ndarray
+    labels: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def split(self, count: int, start: int) -> tuple[TrafficChunk, TrafficChunk | None]:
+        head = TrafficChunk(start, *(getattr(self, name)[:count] for name in _CHUNK_ARRAYS))
+        if count >= len(self):
+            return head, None
+        return head, TrafficChunk(0, *(getattr(self, name)[count:] for name in _CHUNK_ARRAYS))
+
+    def extend(self, other: TrafficChunk) -> TrafficChunk:
+        return TrafficChunk(
+            self.start,
+            *(
+                np.concatenate((getattr(self, name), getattr(other, name)))
+                for name in _CHUNK_ARRAYS
+            ),
+        )
+
+
+_CHUNK_ARRAYS = (
+    "timestamps",
+    "levels",
+    "hosts",
+    "messages",
+    "users",
+    "octets",
+    "request_numbers",
+    "latencies",
+    "labels",
+)
+
+
+class SyntheticTraffic:
+    def __init__(
+        self,
+        profile: TrafficProfile | None = None,
+        start_time: datetime | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.profile = profile or TrafficProfile()
+        if self.profile.events_per_second <= 0:
+            raise ValueError("events_per_second must be positive")
+        if not 0 <= self.profile.diurnal_amplitude < 1:
+            raise ValueError("diurnal_amplitude must be in [0, 1)")
+        start_time = start_time or datetime(2026, 1, 1, tzinfo=timezone.utc)
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        self.start_time = start_time.astimezone(timezone.utc)
+        self.rng = np.random.default_rng(seed)
+        self.host_names = list(HOSTS[: self.profile.hosts]) + [
+            f"node-{index:03d}" for index in range(len(HOSTS), self.profile.hosts)
+        ]
+        ranks = np.arange(1, len(self.host_names) + 1, dtype=float)
+        weights = ranks**-self.profile.host_skew
+        self.host_weights = weights / weights.sum()
+        self.level_names = _Table(NORMAL_LEVELS + ANOMALY_LEVELS)
+        self.message_names = _Table(MESSAGES + ANOMALY_MESSAGES)
+        self.burst_ids = [
+            (
+                self.level_names.add(burst.level),
+                self.message_names.add(burst.message),
+                self._host_id(burst.host or self.host_names[0]),
+            )
+            for burst in self.profile.bursts
+        ]
+        self.template_ids = [
+            (self.level_names.add(template.level), self.message_names.add(template.message))
+            for template in self.profile.new_templates
+        ]
+        self._start_ms = int(self.start_time.timestamp() * 1000)
+        self._phase = (
+            self.start_time - self.start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        ).total_seconds()
+        self._clock = 0.0
+        self._overflow: TrafficChunk | None = None
+
+    def chunks(self, total: int, chunk_size: int = 100_000) -> Iterator[TrafficChunk]:
+        emitted = 0
+        while emitted < total:
+            size = min(chunk_size, total - emitted)
+            pending = self._overflow
+            if pending is None:
+                pending = self._next_chunk(size)
+            elif len(pending) < size:
+                pending = pending.extend(self._next_chunk(size - len(pending)))
+            chunk, self._overflow = pending.split(size, emitted)
+            emitted += len(chunk)
+            yield chunk
+
+    def json_lines(self, chunk: TrafficChunk) -> list[str]:
+        levels = self.level_names.encoded
+        messages = self.message_names.encoded
+        hosts = [json.dumps(host) for host in self.host_names]
+        users = [json.dumps(user) for user in USERS]
+        return [
+            f'{{"timestamp": "{timestamp}+00:00", "level": {levels[level]}, '
+            f'"message": {messages[message]}, "host": {hosts[host]}, "service": null, '
+            f'"user": {users[user]}, "ip": "{_ip(label, octet)}", '
+            f'"request_id": "{_request_id(label, number)}", '
+            f'"attributes": {{"latency_ms": {latency}}}}}'
+            for timestamp, level, message, host, user, octet, number, latency, label in zip(
+                self._timestamps(chunk), *_columns(chunk), strict=True
+            )
+        ]
+
+    def plain_lines(self, chunk: TrafficChunk) -> list[str]:
+        levels = self.level_names.values
+        messages = self.message_names.values
+        return [
+            f"{timestamp}+00:00 {levels[level]} {self.host_names[host]} {messages[message]} "
+            f"user={USERS[user]} ip={_ip(label, octet)} request_id={_request_id(label, number)}"
+            for timestamp, level, message, host, user, octet, number, _, label in zip(
+                self._timestamps(chunk), *_columns(chunk), strict=True
+            )
+        ]
+
+    def _next_chunk(self, size: int) -> TrafficChunk:
+        profile = self.profile
+        rng = self.rng
+        peak_rate = profile.events_per_second * (1 + profile.diurnal_amplitude)
+        begin = clock = self._clock
+        parts: list[np.ndarray] = []
+        needed = size
+        while needed > 0:
+            candidates = int(needed * (1 + profile.diurnal_amplitude) * 1.1) + 16
+            times = clock + np.cumsum(rng.exponential(1 / peak_rate, candidates))
+            kept = times[rng.random(candidates) * peak_rate < self._rate(times)][:needed]
+            parts.append(kept)
+            needed -= len(kept)
+            clock = float(kept[-1]) if needed == 0 else float(times[-1])
+        accepted = np.concatenate(parts)
+        self._clock = clock
+        count = len(accepted)
+
+        labels = np.zeros(count, dtype=np.uint8)
+        anomalies = rng.random(count) < profile.anomaly_ratio
+        labels[anomalies] = 1
+        levels = rng.integers(0, len(NORMAL_LEVELS), count)
+        levels[anomalies] = rng.integers(
+            len(NORMAL_LEVELS), len(NORMAL_LEVELS) + len(ANOMALY_LEVELS), int(anomalies.sum())
+        )
+        messages = rng.integers(0, len(MESSAGES), count)
+        messages[anomalies] = rng.integers(
+            len(MESSAGES), len(MESSAGES) + len(ANOMALY_MESSAGES), int(anomalies.sum())
+        )
+        for template, (level_id, message_id) in zip(
+            profile.new_templates, self.template_ids, strict=True
+        ):
+            injected = (
+                (accepted >= template.offset_seconds)
+                & (labels == 0)
+                & (rng.random(count) < template.share)
+            )
+            labels[injected] = 3
+            levels[injected] = level_id
+            messages[injected] = message_id
+        hosts = rng.choice(len(self.host_names), count, p=self.host_weights)
+
+        columns = [(accepted, levels, messages, hosts, labels)]
+        for burst, (level_id, message_id, host_id) in zip(
+            profile.bursts, self.burst_ids, strict=True
+        ):
+            low = max(begin, burst.offset_seconds)
+            high = min(self._clock, burst.offset_seconds + burst.duration_seconds)
+            if high <= low:
+                continue
+            extra = int(rng.poisson(burst.events_per_second * (high - low)))
+            columns.append(
+                (
+                    rng.uniform(low, high, extra),
+                    np.full(extra, level_id),
+                    np.full(extra, message_id),
+                    np.full(extra, host_id),
+                    np.full(extra, 2, dtype=np.uint8),
+                )
+            )
+        seconds, levels, messages, hosts, labels = (
+            np.concatenate(column) for column in zip(*columns, strict=True)
+        )
+        order = np.argsort(seconds, kind="stable")
+        count = len(order)
+        normal = ~np.isin(labels[order], HOSTILE_LABELS)
+        return TrafficChunk(
+            start=0,
+            timestamps=self._start_ms + np.round(seconds[order] * 1000).astype(np.int64),
+            levels=levels[order],
+            hosts=hosts[order],
+            messages=messages[order],
+            users=rng.integers(0, len(USERS), count),
+            octets=np.where(normal, rng.integers(2, 251, count), rng.integers(1, 251, count)),
+            request_numbers=np.where(
+                normal, rng.integers(1000, 10000, count), rng.integers(10000, 100000, count)
+            ),
+            latencies=np.where(
+                normal, rng.integers(10, 251, count), rng.integers(500, 2001, count)
+            ),
+            labels=labels[order],
+        )
+
+    def _rate(self, seconds: np.ndarray) -> np.ndarray:
+        profile = self.profile
+        hours = ((seconds + self._phase) % SECONDS_PER_DAY) / 3600.0
+        shape = np.cos(2 * np.pi * (hours - profile.peak_hour) / 24.0)
+        return profile.events_per_second * (1 + profile.diurnal_amplitude * shape)
+
+    def _timestamps(self, chunk: TrafficChunk) -> list[str]:
+        return np.datetime_as_string(chunk.timestamps.astype("datetime64[ms]"), unit="ms").tolist()
+
+    def _host_id(self, host: str) -> int:
+        if host not in self.host_names:
+            self.host_names.append(host)
+            self.host_weights = np.append(self.host_weights, 0.0)
+        return self.host_names.index(host)
+
+
+def write_traffic(
+    traffic: SyntheticTraffic,
+    total: int,
+    path: Path,
+    fmt: str = "jsonl",
+    labels_path: Path | None = None,
+    chunk_size: int = 100_000,
+) -> dict[str, int]:
+    fmt = fmt.lower()
+    if fmt not in {"jsonl", "plain"}:
+        raise ValueError(f"Unsupported format: {fmt}")
+    render = traffic.json_lines if fmt == "jsonl" else traffic.plain_lines
+    counts = dict.fromkeys(LABELS, 0)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        output = stack.enter_context(open(path, "w", encoding="utf-8"))
+        labels = None
+        if labels_path is not None:
+            labels_path.parent.mkdir(parents=True, exist_ok=True)
+            labels = csv.writer(stack.enter_context(open(labels_path, "w", newline="")))
+            labels.writerow(("line", "label"))
+        for chunk in traffic.chunks(total, chunk_size):
+            output.write("\n".join(render(chunk)))
+            output.write("\n")
+            for code, count in enumerate(np.bincount(chunk.labels, minlength=len(LABELS))):
+                counts[LABELS[code]] += int(count)
+            if labels is not None:
+                flagged = np.flatnonzero(chunk.labels)
+                labels.writerows(
+                    (chunk.start + index, LABELS[code])
+                    for index, code in zip(
+                        flagged.tolist(), chunk.labels[flagged].tolist(), strict=True
+                    )
+                )
+    return counts
+
+
+class _Table:
+    def __init__(self, values: Iterable[str]) -> None:
+        self.values: list[str] = []
+        self.encoded: list[str] = []
+        for value in values:
+            self.add(value)
+
+    def add(self, value: str) -> int:
+        if value not in self.values:
+            self.values.append(value)
+            self.encoded.append(json.dumps(value))
+        return self.values.index(value)
+
+
+def _columns(chunk: TrafficChunk) -> list[list[int]]:
+    return [
+        getattr(chunk, name).tolist()
+        for name in (
+            "levels",
+            "messages",
+            "hosts",
+            "users",
+            "octets",
+            "request_numbers",
+            "latencies",
+            "labels",
+        )
+    ]
+
+
+def _ip(label: int, octet: int) -> str:
+    return f"203.0.113.{octet}" if label in HOSTILE_LABELS else f"10.0.0.{octet}"
+
+
+def _request_id(label: int, number: int) -> str:
+    return f"anomaly-{number}" if label in HOSTILE_LABELS else f"req-{number}"
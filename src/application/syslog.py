@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+
+from application.dedup import LineDeduplicator
+from application.ingestion import MAX_LINE_BYTES, StreamSource
+from domain.models import LogEvent
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_LEVELS = ("EMERGENCY", "ALERT", "CRITICAL", "ERROR", "WARNING", "NOTICE", "INFO", "DEBUG")
+RFC5424_RE = re.compile(
+    r"^<(?P<pri>\d{1,3})>(?P<version>\d{1,2}) (?P<timestamp>\S+) (?P<host>\S+) "
+    r"(?P<app>\S+) (?P<procid>\S+) (?P<msgid>\S+) (?P<sd>-|(?:\[(?:[^\]\\]|\\.)*\])+)"
+    r"(?: (?P<message>.*))?$",
+    re.DOTALL,
+)
+RFC3164_RE = re.compile(
+    r"^<(?P<pri>\d{1,3})>(?P<timestamp>[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d) (?P<host>\S+) "
+    r"(?:(?P<tag>[^\s:\[]+)(?:\[(?P<procid>[^\]]*)\])?: ?)?(?P<message>.*)$",
+    re.DOTALL,
+)
+PRI_RE = re.compile(r"^<(?P<pri>\d{1,3})>(?P<message>.*)$", re.DOTALL)
+
+
+def parse_syslog(
+    message: str, peer: str | None = None, received_at: datetime | None = None
+) -> LogEvent:
+    received_at = received_at or datetime.now(timezone.utc)
+    message = message.rstrip("\r\n\x00")
+    match = RFC5424_RE.match(message)
+    if match:
+        attributes = {
+            key: match[key] for key in ("procid", "msgid") if match[key] and match[key] != "-"
+        }
+        if match["sd"] != "-":
+            attributes["structured_data"] = match["sd"]
+        return _event(
+            int(match["pri"]),
+            _rfc5424_timestamp(match["timestamp"], received_at),
+            _nil(match["host"]) or peer,
+            _nil(match["app"]),
+            (match["message"] or "").removeprefix("\ufeff"),
+            attributes,
+        )
+    match = RFC3164_RE.match(message)
+    if match:
+        attributes = {"procid": match["procid"]} if match["procid"] else {}
+        return _event(
+            int(match["pri"]),
+            _rfc3164_timestamp(match["timestamp"], received_at),
+            match["host"],
+            match["tag"],
+            match["message"],
+            attributes,
+        )
+    match = PRI_RE.match(message)
+    if match:
+        return _event(int(match["pri"]), received_at, peer, None, match["message"], {})
+    return LogEvent(timestamp=received_at, level="INFO", message=message, host=peer or "unknown")
+
+
+class SyslogFrameDecoder:
+    def __init__(self, max_frame_bytes: int = MAX_LINE_BYTES) -> None:
+        self.max_frame_bytes = max_frame_bytes
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._buffer += data
+        frames: list[bytes] = []
+        while self._buffer:
+            if self._buffer[:1].isdigit():
+                length, separator, rest = self._buffer.partition(b" ")
+                if not separator:
+                    if len(length) > 10:
+                        raise ValueError("Invalid octet count")
+                    break
+                if not length.isdigit() or int(length) > self.max_frame_bytes:
+                    raise ValueError("Invalid octet count")
+                if len(rest) < int(length):
+                    break
+                frames.append(rest[: int(length)])
+                self._buffer = rest[int(length) :]
+                continue
+            frame, separator, rest = self._buffer.partition(b"\n")
+            if not separator:
+                if len(frame) > self.max_frame_bytes:
+                    raise ValueError("Syslog frame exceeds maximum size")
+                break
+            if frame.strip():
+                frames.append(frame)
+            self._buffer = rest
+        return frames
+
+    def close(self) -> list[bytes]:
+        frame, self._buffer = self._buffer, b""
+        return [frame] if frame.strip() else []
+
+
+class SyslogSource(StreamSource):
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        udp_port: int | None = 5514,
+        tcp_port: int | None = 5514,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        batch_interval: float = 0.5,
+        max_frame_bytes: int = MAX_LINE_BYTES,
+        dedup_window_seconds: float = 0.0,
+        dedup_max_keys: int = 10000,
+    ) -> None:
+        self.host = host
+        self.udp_port = udp_port
+        self.tcp_port = tcp_port
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_frame_bytes = max_frame_bytes
+        self.deduplicator = (
+            LineDeduplicator(dedup_window_seconds, dedup_max_keys, splitter=_split_keyed_frame)
+            if dedup_window_seconds > 0
+            else None
+        )
+        self.received = 0
+        self.dropped = 0
+        self.max_queue_depth = 0
+        self.tcp_connections = 0
+        self._queue: asyncio.Queue[tuple[bytes, str | None, datetime]] | None = None
+        self._udp: asyncio.DatagramTransport | None = None
+        self._tcp: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.queue_size)
+        if self.udp_port is not None:
+            self._udp, _ = await loop.create_datagram_endpoint(
+                lambda: _UdpProtocol(self), local_addr=(self.host, self.udp_port)
+            )
+            self.udp_port = self._udp.get_extra_info("sockname")[1]
+        if self.tcp_port is not None:
+            self._tcp = await asyncio.start_server(self._handle_tcp, self.host, self.tcp_port)
+            self.tcp_port = self._tcp.sockets[0].getsockname()[1]
+        logger.info(
+            "syslog_listening", extra={"udp_port": self.udp_port, "tcp_port": self.tcp_port}
+        )
+
+    async def next_batch(self) -> list[LogEvent]:
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        deadline = loop.time() + self.batch_interval
+        while len(items) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return _parse_items(items, self.deduplicator)
+
+    async def run(self, handler: Callable[[list[LogEvent]], object]) -> None:
+        loop = asyncio.get_running_loop()
+        await self.start()
+        try:
+            while True:
+                batch: list[LogEvent] = []
+                try:
+                    batch = await self.next_batch()
+                    await loop.run_in_executor(None, handler, batch)
+                except Exception:
+                    logger.exception("syslog_batch_failed", extra={"events": len(batch)})
+        finally:
+            await self.close()
+            remaining = self._drain()
+            if remaining:
+                await loop.run_in_executor(None, handler, remaining)
+
+    def read(self) -> Iterator[LogEvent]:
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.start())
+            while True:
+                yield from loop.run_until_complete(self.next_batch())
+        finally:
+            loop.run_until_complete(self.close())
+            loop.close()
+
+    async def close(self) -> None:
+        if self._udp is not None:
+            self._udp.close()
+            self._udp = None
+        if self._tcp is not None:
+            self._tcp.close()
+            await self._tcp.wait_closed()
+            self._tcp = None
+
+    def stats(self) -> dict[str, int]:
+        stats = {
+            "received": self.received,
+            "dropped": self.dropped,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "tcp_connections": self.tcp_connections,
+        }
+        if self.deduplicator is not None:
+            stats["collapsed"] = self.deduplicator.stats()["collapsed"]
+        return stats
+
+    def accept(self, frame: bytes, peer: str | None) -> None:
+        self.received += 1
+        try:
+            self._queue.put_nowait((frame, peer, datetime.now(timezone.utc)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        peer_host = peer[0] if peer else None
+        decoder = SyslogFrameDecoder(self.max_frame_bytes)
+        self.tcp_connections += 1
+        try:
+            while chunk := await reader.read(1 << 16):
+                for frame in decoder.feed(chunk):
+                    await self._put(frame, peer_host)
+            for frame in decoder.close():
+                await self._put(frame, peer_host)
+        except ValueError as exc:
+            logger.warning("syslog_framing_error", extra={"peer": peer_host, "error": str(exc)})
+        finally:
+            self.tcp_connections -= 1
+            writer.close()
+
+    async def _put(self, frame: bytes, peer: str | None) -> None:
+        self.received += 1
+        await self._queue.put((frame, peer, datetime.now(timezone.utc)))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    def _drain(self) -> list[LogEvent]:
+        items = []
+        while self._queue is not None and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return _parse_items(items, self.deduplicator)
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, source: SyslogSource) -> None:
+        self.source = source
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        self.source.accept(data, addr[0] if addr else None)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning("syslog_udp_error", extra={"error": str(exc)})
+
+
+def _parse_items(
+    items: list[tuple[bytes, str | None, datetime]],
+    deduplicator: LineDeduplicator | None = None,
+) -> list[LogEvent]:
+    if deduplicator is None:
+        parsed = (_parse_item(*item) for item in items)
+        return [event for event in parsed if event is not None]
+    collapsed = deduplicator.collapse(
+        [f"{peer or ''}\x00{frame.decode('utf-8', errors='replace')}" for frame, peer, _ in items]
+    )
+    first_items: dict[int, int] = {}
+    for position, index in enumerate(collapsed.positions):
+        first_items.setdefault(index, position)
+    events = []
+    for index, position in first_items.items():
+        event = _parse_item(*items[position])
+        if event is not None:
+            events.append(collapsed.annotate(index, event))
+    return events
+
+
+def _parse_item(frame: bytes, peer: str | None, received_at: datetime) -> LogEvent | None:
+    try:
+        return parse_syslog(frame.decode("utf-8", errors="replace"), peer, received_at)
+    except ValueError as exc:
+        logger.warning("syslog_invalid_frame", extra={"peer": peer, "error": str(exc)})
+        return None
+
+
+def _split_keyed_frame(keyed: str) -> tuple[str, datetime | None]:
+    peer, _, message = keyed.partition("\x00")
+    received_at = datetime.now(timezone.utc)
+    match = RFC5424_RE.match(message)
+    if match and match["timestamp"] != "-":
+        timestamp = _rfc5424_timestamp(match["timestamp"], received_at)
+    else:
+        match = RFC3164_RE.match(message)
+        if match is None:
+            return keyed, None
+        timestamp = _rfc3164_timestamp(match["timestamp"], received_at)
+    start, end = match.span("timestamp")
+    return f"{peer}\x00{message[:start]}{message[end:]}", timestamp
+
+
+def _event(
+    pri: int,
+    timestamp: datetime,
+    host: str | None,
+    service: str | None,
+    message: str,
+    attributes: dict[str, str],
+) -> LogEvent:
+    attributes = {"facility": str(pri >> 3), **attributes}
+    return LogEvent(
+        timestamp=timestamp,
+        level=SEVERITY_LEVELS[pri & 7],
+        message=message,
+        host=host,
+        service=service,
+        attributes=attributes,
+    )
+
+
+def _nil(value: str) -> str | None:
+    return None if value == "-" else value
+
+
+def _rfc5424_timestamp(value: str, received_at: datetime) -> datetime:
+    if value == "-":
+        return received_at
+    try:
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return received_at
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+def _rfc3164_timestamp(value: str, received_at: datetime) -> datetime:
+    try:
+        parsed = datetime.strptime(f"{received_at.year} {value}", "%Y %b %d %H:%M:%S")
+    except ValueError:
+        return received_at
+    timestamp = parsed.replace(tzinfo=timezone.utc)
+    if timestamp - received_at > timedelta(days=1):
+        timestamp = timestamp.replace(year=timestamp.year - 1)
+    return timestamp
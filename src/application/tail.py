@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from application.dedup import LineDeduplicator
+from application.ingestion import MAX_LINE_BYTES, StreamSource
+from application.parsers import LogParser
+from domain.models import LogEvent
+from infrastructure.files import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_BYTES = 1 << 16
+
+
+@dataclass
+class TailBatch:
+    events: list[LogEvent]
+    lines: int
+    offsets: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+class _Follower:
+    def __init__(self, path: Path, checkpoint: dict[str, int] | None, from_end: bool) -> None:
+        self.path = path
+        self.handle: BinaryIO | None = None
+        self.inode = 0
+        self.device = 0
+        self.offset = 0
+        self.partial = b""
+        self.rotations = 0
+        self.truncations = 0
+        self._resume = checkpoint
+        self._from_end = from_end
+
+    def poll(self, max_bytes: int) -> list[bytes]:
+        if self.handle is None and not self._open():
+            return []
+        data = self.handle.read(max_bytes)
+        if data:
+            return self._split(data)
+        return self._check_replaced()
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def state(self) -> dict[str, int]:
+        if self.handle is None and self._resume:
+            return dict(self._resume)
+        return {"inode": self.inode, "device": self.device, "offset": self.offset}
+
+    def _open(self) -> bool:
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(handle.fileno())
+        self.handle, self.inode, self.device = handle, stat.st_ino, stat.st_dev
+        self.offset, self.partial = 0, b""
+        resume, self._resume = self._resume, None
+        if resume and resume.get("inode") == stat.st_ino and resume.get("device") == stat.st_dev:
+            if resume.get("offset", 0) <= stat.st_size:
+                self.offset = int(resume["offset"])
+        elif resume is None and self._from_end:
+            self.offset = stat.st_size
+        self._from_end = False
+        handle.seek(self.offset)
+        return True
+
+    def _check_replaced(self) -> list[bytes]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self.inode or stat.st_dev != self.device:
+            tail = [self.partial] if self.partial else []
+            self.offset += len(self.partial)
+            self.close()
+            self.rotations += 1
+            logger.info("tail_file_rotated", extra={"path": str(self.path)})
+            return tail
+        if stat.st_size < self.offset + len(self.partial):
+            self.handle.seek(0)
+            self.offset, self.partial = 0, b""
+            self.truncations += 1
+            logger.info("tail_file_truncated", extra={"path": str(self.path)})
+        return []
+
+    def _split(self, data: bytes) -> list[bytes]:
+        buffer = self.partial + data
+        *lines, self.partial = buffer.split(b"\n")
+        if len(self.partial) > MAX_LINE_BYTES:
+            lines.append(self.partial)
+            self.partial = b""
+        self.offset += len(buffer) - len(self.partial)
+        return lines
+
+
+class FileTailSource(StreamSource):
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        checkpoint_path: Path,
+        fmt: str = "jsonl",
+        parser: LogParser | None = None,
+        batch_size: int = 500,
+        batch_interval: float = 1.0,
+        poll_interval: float = 0.25,
+        from_end: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        dedup_window_seconds: float = 0.0,
+        dedup_max_keys: int = 10000,
+    ) -> None:
+        self.checkpoint_path = Path(checkpoint_path)
+        self.fmt = fmt
+        self.parser = parser or LogParser()
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.deduplicator = (
+            LineDeduplicator(dedup_window_seconds, dedup_max_keys)
+            if dedup_window_seconds > 0
+            else None
+        )
+        self.invalid_lines = 0
+        self._stopped = threading.Event()
+        saved = self._load_checkpoint()
+        self.followers = [
+            _Follower(path, saved.get(str(path.resolve())), from_end) for path in paths
+        ]
+
+    def read(self) -> Iterable[LogEvent]:
+        for batch in self.batches():
+            yield from batch.events
+            self.commit(batch)
+
+    def batches(self) -> Iterator[TailBatch]:
+        lines: list[str] = []
+        started: float | None = None
+        while not self._stopped.is_set():
+            polled = self.poll()
+            if polled:
+                lines.extend(polled)
+                started = started if started is not None else self.clock()
+            if lines and (
+                len(lines) >= self.batch_size or self.clock() - started >= self.batch_interval
+            ):
+                yield self._batch(lines)
+                lines, started = [], None
+            elif not polled:
+                self._stopped.wait(self.poll_interval)
+        if lines:
+            yield self._batch(lines)
+
+    def poll(self) -> list[str]:
+        lines: list[str] = []
+        for follower in self.followers:
+            chunk = follower.poll(READ_CHUNK_BYTES)
+            lines.extend(line.decode("utf-8", errors="replace") for line in chunk)
+        return lines
+
+    def commit(self, batch: TailBatch) -> None:
+        atomic_write_json(self.checkpoint_path, {"files": batch.offsets})
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def close(self) -> None:
+        for follower in self.followers:
+            follower.close()
+
+    def stats(self) -> dict[str, int]:
+        stats = {
+            "invalid_lines": self.invalid_lines,
+            "rotations": sum(follower.rotations for follower in self.followers),
+            "truncations": sum(follower.truncations for follower in self.followers),
+        }
+        if self.deduplicator is not None:
+            stats["collapsed"] = self.deduplicator.stats()["collapsed"]
+        return stats
+
+    def _batch(self, lines: list[str]) -> TailBatch:
+        return TailBatch(events=self._parse(lines), lines=len(lines), offsets=self._offsets())
+
+    def _parse(self, lines: list[str]) -> list[LogEvent]:
+        collapsed = self.deduplicator.collapse(lines) if self.deduplicator is not None else None
+        events: list[LogEvent] = []
+        for index, line in enumerate(collapsed.lines if collapsed else lines):
+            try:
+                parsed = self.parser.parse_lines([line], self.fmt)
+            except ValueError as exc:
+                self.invalid_lines += collapsed.counts[index] if collapsed else 1
+                logger.warning("tail_invalid_line", extra={"error": str(exc)})
+                continue
+            if collapsed:
+                parsed = [collapsed.annotate(index, event) for event in parsed]
+            events.extend(parsed)
+        return events
+
+    def _offsets(self) -> dict[str, dict[str, int]]:
+        return {str(follower.path.resolve()): follower.state() for follower in self.followers}
+
+    def _load_checkpoint(self) -> dict[str, dict[str, int]]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as handle:
+                return json.load(handle).get("files", {})
+        except FileNotFoundError:
+            return {}
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import uuid
+
+PLACEHOLDER = "<*>"
+PARAM_INT = 0
+PARAM_IPV4 = 1
+PARAM_UUID = 2
+PARAM_UUID_UPPER = 3
+PARAM_TEXT = 4
+UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+PARAM_RE = re.compile(
+    r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+    r"|\b\d{1,3}(?:\.\d{1,3}){3}\b"
+    r"|\b0x[0-9a-fA-F]+\b"
+    r"|\b\d+\b",
+    re.ASCII,
+)
+
+
+def extract_template(message: str) -> tuple[str, list[str]] | None:
+    if PLACEHOLDER in message:
+        return None
+    params: list[str] = []
+
+    def replace(match: re.Match[str]) -> str:
+        params.append(match.group(0))
+        return PLACEHOLDER
+
+    return PARAM_RE.sub(replace, message), params
+
+
+def render_template(template: str, params: list[str] | None) -> str:
+    if not params:
+        return template
+    parts = template.split(PLACEHOLDER)
+    if len(parts) != len(params) + 1:
+        raise ValueError("Template parameter count mismatch")
+    rendered = [parts[0]]
+    for param, part in zip(params, parts[1:], strict=True):
+        rendered.append(param)
+        rendered.append(part)
+    return "".join(rendered)
+
+
+def template_id(template: str) -> int:
+    digest = hashlib.blake2b(template.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def pack_params(params: list[str]) -> bytes:
+    packed = bytearray()
+    for param in params:
+        if (
+            param.isascii()
+            and param.isdigit()
+            and (param == "0" or not param.startswith("0"))
+            and len(param) < 20
+        ):
+            packed.append(PARAM_INT)
+            _write_varint(packed, int(param))
+        elif (octets := _ipv4_octets(param)) is not None:
+            packed.append(PARAM_IPV4)
+            packed.extend(octets)
+        elif UUID_RE.fullmatch(param) and (param.islower() or param.isupper()):
+            packed.append(PARAM_UUID_UPPER if param.isupper() else PARAM_UUID)
+            packed.extend(bytes.fromhex(param.replace("-", "")))
+        else:
+            encoded = param.encode("utf-8")
+            packed.append(PARAM_TEXT)
+            _write_varint(packed, len(encoded))
+            packed.extend(encoded)
+    return bytes(packed)
+
+
+def unpack_params(packed: bytes) -> list[str]:
+    params: list[str] = []
+    position = 0
+    while position < len(packed):
+        kind = packed[position]
+        position += 1
+        if kind == PARAM_INT:
+            value, position = _read_varint(packed, position)
+            params.append(str(value))
+        elif kind == PARAM_IPV4:
+            params.append(".".join(str(octet) for octet in packed[position : position + 4]))
+            position += 4
+        elif kind in (PARAM_UUID, PARAM_UUID_UPPER):
+            text = str(uuid.UUID(bytes=bytes(packed[position : position + 16])))
+            params.append(text.upper() if kind == PARAM_UUID_UPPER else text)
+            position += 16
+        elif kind == PARAM_TEXT:
+            length, position = _read_varint(packed, position)
+            params.append(bytes(packed[position : position + length]).decode("utf-8"))
+            position += length
+        else:
+            raise ValueError(f"Unknown parameter tag: {kind}")
+    return params
+
+
+def _ipv4_octets(param: str) -> bytes | None:
+    parts = param.split(".")
+    if len(parts) != 4 or not all(part.isascii() and part.isdigit() for part in parts):
+        return None
+    if any(part != str(int(part)) or int(part) > 255 for part in parts):
+        return None
+    return bytes(int(part) for part in parts)
+
+
+def _write_varint(packed: bytearray, value: int) -> None:
+    while value >= 0x80:
+        packed.append(value & 0x7F | 0x80)
+        value >>= 7
+    packed.append(value)
+
+
+def _read_varint(packed: bytes, position: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = packed[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
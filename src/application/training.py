@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import heapq
+import logging
+import random
 from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TypeVar
 
 import numpy as np
 
+from application.dataset import EventColumns
 from application.features import FeatureExtractor
+from application.ingestion import iter_lines
+from application.parsers import LogParser
 from domain.models import LogEvent
 from infrastructure.models.baseline import FrequencyBaselineDetector
 from infrastructure.models.isolation_forest import IsolationForestDetector
 from infrastructure.registry import ModelRegistry
+from infrastructure.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 def train_model(
@@ -19,16 +33,42 @@ def train_model(
 ) -> dict[str, object]:
     events_list = list(events)
     model_type = model_type.lower()
-    if model_type == "baseline":
-        detector = FrequencyBaselineDetector(model_version="baseline")
-    elif model_type in {"isolation_forest", "iforest"}:
-        detector = IsolationForestDetector(
-            feature_extractor=feature_extractor, model_version="iforest"
-        )
-    else:
-        raise ValueError(f"Unsupported model type: {model_type}")
+    detector = _build_detector(model_type, feature_extractor)
     detector.train(events_list)
     scores = detector.score(events_list)
+    return _save_trained(detector, scores, model_type, registry, feature_extractor)
+
+
+def train_model_from_columns(
+    columns: EventColumns,
+    model_type: str,
+    registry: ModelRegistry,
+    feature_extractor: FeatureExtractor,
+) -> dict[str, object]:
+    model_type = model_type.lower()
+    detector = _build_detector(model_type, feature_extractor)
+    detector.train_columns(columns)
+    scores = detector.score_columns(columns)
+    return _save_trained(detector, scores, model_type, registry, feature_extractor)
+
+
+def _build_detector(
+    model_type: str, feature_extractor: FeatureExtractor
+) -> FrequencyBaselineDetector | IsolationForestDetector:
+    if model_type == "baseline":
+        return FrequencyBaselineDetector(model_version="baseline")
+    if model_type in {"isolation_forest", "iforest"}:
+        return IsolationForestDetector(feature_extractor=feature_extractor, model_version="iforest")
+    raise ValueError(f"Unsupported model type: {model_type}")
+
+
+def _save_trained(
+    detector: FrequencyBaselineDetector | IsolationForestDetector,
+    scores: list[float],
+    model_type: str,
+    registry: ModelRegistry,
+    feature_extractor: FeatureExtractor,
+) -> dict[str, object]:
     threshold, quantile = _calibrate_threshold(scores, model_type, detector)
     train_metrics = {
         "score_mean": float(np.mean(scores)) if scores else 0.0,
@@ -44,6 +84,74 @@ def train_model(
     )
 
 
+def bootstrap_model(registry: ModelRegistry, log_path: Path, fmt: str, model_type: str) -> bool:
+    with registry.bootstrap_lock():
+        try:
+            registry.load_latest()
+            return True
+        except FileNotFoundError:
+            pass
+        if not log_path.exists():
+            logger.warning("bootstrap_path_missing", extra={"path": str(log_path)})
+            return False
+        events = LogParser().parse_lines(iter_lines(log_path), fmt)
+        train_model(events, model_type, registry, FeatureExtractor())
+        logger.info("model_bootstrapped", extra={"path": str(log_path)})
+        return True
+
+
+def retrain_from_storage(
+    storage: Storage,
+    registry: ModelRegistry,
+    model_type: str,
+    window_days: float,
+    max_events: int,
+    min_events: int = 1,
+    seed: int | None = None,
+    now: datetime | None = None,
+) -> dict[str, object] | None:
+    until = now or datetime.now(timezone.utc)
+    since = until - timedelta(days=window_days)
+    scanned = 0
+
+    def weighted_rows():
+        nonlocal scanned
+        for row in storage.iter_normal_records(since=since, until=until):
+            scanned += 1
+            yield row.id, float(row.weight) * row.repeat_count
+
+    sample = weighted_reservoir(weighted_rows(), max_events, random.Random(seed))
+    if len(sample) < min_events:
+        logger.warning(
+            "retrain_skipped",
+            extra={"scanned": scanned, "sampled": len(sample), "min_events": min_events},
+        )
+        return None
+    events = storage.load_events(sample)
+    metadata = train_model(events, model_type, registry, FeatureExtractor())
+    logger.info(
+        "model_retrained",
+        extra={"version": metadata["version"], "scanned": scanned, "sampled": len(events)},
+    )
+    return metadata
+
+
+def weighted_reservoir(
+    items: Iterable[tuple[T, float]], size: int, rng: random.Random | None = None
+) -> list[T]:
+    rng = rng or random.Random()
+    heap: list[tuple[float, int, T]] = []
+    for index, (item, weight) in enumerate(items):
+        if weight <= 0:
+            continue
+        key = rng.random() ** (1.0 / weight)
+        if len(heap) < size:
+            heapq.heappush(heap, (key, index, item))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, index, item))
+    return [item for _, _, item in sorted(heap, key=lambda entry: entry[1])]
+
+
 def _calibrate_threshold(
     scores: list[float],
     model_type: str,
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -16,6 +16,9 @@ class LogEvent(BaseModel):
     ip: str | None = None
     request_id: str | None = None
     attributes: dict[str, Any] = Field(default_factory=dict)
+    repeat_count: int = Field(default=1, ge=1)
+    last_timestamp: datetime | None = None
+    continues_group: bool = False
 
     @model_validator(mode="after")
     def validate_host_or_service(self) -> LogEvent:
@@ -33,3 +36,17 @@ class AnomalyResult(BaseModel):
     score: float
     is_anomaly: bool
     model_version: str
+    weight: float = 1.0
+
+
+class AnomalyQuery(BaseModel):
+    limit: int = 50
+    min_score: float | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    host: str | None = None
+    service: str | None = None
+    level: str | None = None
+    model_version: str | None = None
+    order: Literal["score", "time"] = "score"
+    cursor: str | None = None
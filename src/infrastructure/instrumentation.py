@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...], *extra: str) -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key, strict=True)
+        ]
+        pairs.extend(label for label in extra if label)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self, const: str = "") -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(const),
+        ]
+
+    def samples(self, const: str = "") -> list[str]:
+        with self._lock:
+            return self._samples(const)
+
+    def _samples(self, const: str) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self, const: str) -> list[str]:
+        return [
+            f"{self.name}{self._labels(key, const)} {_number(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def replace(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values = {key: value}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _samples(self, const: str) -> list[str]:
+        lines = []
+        for key, series in self._series.items():
+            labels = self._labels(key, const)
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), series, strict=False):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(
+                    f"{self.name}_bucket{self._labels(key, const, le)} {_number(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{labels} {series[-2]!r}")
+            lines.append(f"{self.name}_count{labels} {_number(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets, labelnames))
+
+    def render(
+        self,
+        labels: Mapping[str, str] | None = None,
+        peers: Iterable[Mapping[str, list[str]]] = (),
+    ) -> str:
+        const = _const_labels(labels)
+        peers = list(peers)
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(const))
+            for samples in peers:
+                lines.extend(samples.get(metric.name, ()))
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self, labels: Mapping[str, str] | None = None) -> dict[str, list[str]]:
+        const = _const_labels(labels)
+        return {metric.name: metric.samples(const) for metric in self._metrics}
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+STAGE_SECONDS = REGISTRY.histogram(
+    "log_detector_stage_seconds",
+    "Wall time spent in each processing stage.",
+    LATENCY_BUCKETS,
+    ("stage",),
+)
+STAGE_EVENTS = REGISTRY.counter(
+    "log_detector_stage_events_total",
+    "Events processed by each processing stage.",
+    ("stage",),
+)
+INGEST_BATCH_EVENTS = REGISTRY.histogram(
+    "log_detector_ingest_batch_events",
+    "Events per ingested batch.",
+    SIZE_BUCKETS,
+)
+INGEST_SHED = REGISTRY.counter(
+    "log_detector_ingest_shed_total",
+    "Ingest requests rejected by admission control.",
+    ("reason",),
+)
+WRITE_BEHIND_QUEUE_DEPTH = REGISTRY.gauge(
+    "log_detector_write_behind_queue_depth",
+    "Results waiting in the write-behind queue.",
+)
+MODEL_INFO = REGISTRY.gauge(
+    "log_detector_model_info",
+    "Currently loaded model version.",
+    ("version",),
+)
+
+
+class timed:
+    __slots__ = ("stage", "events", "start")
+
+    def __init__(self, stage: str, events: int = 0) -> None:
+        self.stage = stage
+        self.events = events
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, stage=self.stage)
+        if self.events:
+            STAGE_EVENTS.inc(self.events, stage=self.stage)
+
+
+def _const_labels(labels: Mapping[str, str] | None) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in (labels or {}).items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
@@ -5,6 +5,9 @@ import re
 from collections import Counter
 from pathlib import Path
 
+import numpy as np
+
+from application.dataset import EventColumns
 from application.model import IAnomalyDetector
 from domain.models import AnomalyResult, LogEvent
 
@@ -24,22 +27,32 @@ class FrequencyBaselineDetector(IAnomalyDetector):
         self.model_version = model_version
 
     def train(self, events: list[LogEvent]) -> None:
-        templates = [_event_template(event) for event in events]
-        self.template_counts = Counter(templates)
+        self._fit(Counter(_event_template(event) for event in events))
+
+    def score(self, events: list[LogEvent]) -> list[float]:
+        return [self._template_score(_event_template(event)) for event in events]
+
+    def train_columns(self, columns: EventColumns) -> None:
+        templates, inverse = _column_templates(columns)
+        counts: Counter[str] = Counter()
+        for template, count in zip(templates, np.bincount(inverse).tolist(), strict=True):
+            counts[template] += count
+        self._fit(counts)
+
+    def score_columns(self, columns: EventColumns) -> list[float]:
+        templates, inverse = _column_templates(columns)
+        scores = np.array([self._template_score(template) for template in templates], dtype=float)
+        return scores[inverse].tolist()
+
+    def _fit(self, template_counts: Counter[str]) -> None:
+        self.template_counts = template_counts
         self.total = sum(self.template_counts.values())
         self.max_count = max(self.template_counts.values(), default=0)
 
-    def score(self, events: list[LogEvent]) -> list[float]:
-        scores: list[float] = []
-        for event in events:
-            template = _event_template(event)
-            count = self.template_counts.get(template, 0)
-            if self.max_count == 0:
-                scores.append(1.0)
-            else:
-                frequency = count / self.max_count
-                scores.append(1.0 - frequency)
-        return scores
+    def _template_score(self, template: str) -> float:
+        if self.max_count == 0:
+            return 1.0
+        return 1.0 - self.template_counts.get(template, 0) / self.max_count
 
     def predict(self, events: list[LogEvent], threshold: float) -> list[AnomalyResult]:
         scores = self.score(events)
@@ -91,3 +104,20 @@ def _event_template(event: LogEvent) -> str:
     level = event.level.upper()
     source = event.source
     return f"{level}|{source}|{normalized}"
+
+
+def _column_templates(columns: EventColumns) -> tuple[list[str], np.ndarray]:
+    keys = (columns.message_ids.astype(np.int64) * len(columns.sources) + columns.source_ids) * len(
+        columns.levels
+    ) + columns.level_ids
+    unique, inverse = np.unique(keys, return_inverse=True)
+    normalized: dict[int, str] = {}
+    templates = []
+    for key in unique.tolist():
+        rest, level_id = divmod(key, len(columns.levels))
+        message_id, source_id = divmod(rest, len(columns.sources))
+        if message_id not in normalized:
+            normalized[message_id] = _normalize_message(columns.messages[message_id])
+        level = columns.levels[level_id].upper()
+        templates.append(f"{level}|{columns.sources[source_id]}|{normalized[message_id]}")
+    return templates, inverse.reshape(-1)
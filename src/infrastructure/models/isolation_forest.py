@@ -7,9 +7,11 @@ import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
+from application.dataset import EventColumns
 from application.features import FeatureExtractor
 from application.model import IAnomalyDetector
 from domain.models import AnomalyResult, LogEvent
+from infrastructure.instrumentation import timed
 
 
 class IsolationForestDetector(IAnomalyDetector):
@@ -34,17 +36,29 @@ class IsolationForestDetector(IAnomalyDetector):
         self.score_max: float | None = None
 
     def train(self, events: list[LogEvent]) -> None:
-        features = self.feature_extractor.transform(events)
+        self._fit(self.feature_extractor.transform(events))
+
+    def score(self, events: list[LogEvent]) -> list[float]:
+        return self._score_features(self.feature_extractor.transform(events))
+
+    def train_columns(self, columns: EventColumns) -> None:
+        self._fit(self.feature_extractor.transform_columns(columns))
+
+    def score_columns(self, columns: EventColumns) -> list[float]:
+        return self._score_features(self.feature_extractor.transform_columns(columns))
+
+    def _fit(self, features: np.ndarray) -> None:
         scaled = self.scaler.fit_transform(features)
         self.model.fit(scaled)
         raw_scores = -self.model.decision_function(scaled)
         self.score_min = float(np.min(raw_scores))
         self.score_max = float(np.max(raw_scores))
 
-    def score(self, events: list[LogEvent]) -> list[float]:
-        features = self.feature_extractor.transform(events)
-        scaled = self.scaler.transform(features)
-        raw_scores = -self.model.decision_function(scaled)
+    def _score_features(self, features: np.ndarray) -> list[float]:
+        with timed("scale", len(features)):
+            scaled = self.scaler.transform(features)
+        with timed("forest", len(features)):
+            raw_scores = -self.model.decision_function(scaled)
         return [_normalize_score(score, self.score_min, self.score_max) for score in raw_scores]
 
     def predict(self, events: list[LogEvent], threshold: float) -> list[AnomalyResult]:
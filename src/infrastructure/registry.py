@@ -6,6 +6,7 @@ from pathlib import Path
 
 from application.features import FeatureExtractor
 from application.model import IAnomalyDetector
+from infrastructure.files import FileLock, atomic_write_json
 from infrastructure.models.baseline import FrequencyBaselineDetector
 from infrastructure.models.isolation_forest import IsolationForestDetector
 
@@ -22,35 +23,57 @@ class ModelRegistry:
         feature_extractor: FeatureExtractor,
         train_metrics: dict[str, float] | None = None,
     ) -> dict[str, object]:
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-        model_dir = self.base_path / f"{model_type}_{timestamp}"
+        version = timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        suffix = 0
+        while (self.base_path / f"{model_type}_{version}").exists():
+            suffix += 1
+            version = f"{timestamp}-{suffix}"
+        model_dir = self.base_path / f"{model_type}_{version}"
         detector.save(str(model_dir))
         metadata = {
             "model_type": model_type,
-            "version": timestamp,
+            "version": version,
             "trained_at": datetime.now(timezone.utc).isoformat(),
             "feature_names": feature_extractor.feature_names,
             "train_metrics": train_metrics or {},
             "path": str(model_dir),
         }
-        with open(model_dir / "metadata.json", "w", encoding="utf-8") as handle:
-            json.dump(metadata, handle, ensure_ascii=True, indent=2)
-        with open(self.base_path / "latest.json", "w", encoding="utf-8") as handle:
-            json.dump(metadata, handle, ensure_ascii=True, indent=2)
+        atomic_write_json(model_dir / "metadata.json", metadata)
+        atomic_write_json(self.base_path / "latest.json", metadata)
         return metadata
 
-    def load_latest(self) -> tuple[IAnomalyDetector, dict[str, object]]:
+    def latest_metadata(self) -> dict[str, object]:
         latest_path = self.base_path / "latest.json"
         if not latest_path.exists():
             raise FileNotFoundError("No model artifacts found. Train a model first.")
         with open(latest_path, encoding="utf-8") as handle:
-            metadata = json.load(handle)
+            return json.load(handle)
+
+    def load_latest(self) -> tuple[IAnomalyDetector, dict[str, object]]:
+        metadata = self.latest_metadata()
+        return self.load(metadata), metadata
+
+    def load(self, metadata: dict[str, object]) -> IAnomalyDetector:
         model_type = metadata.get("model_type")
         model_path = metadata.get("path")
         if not model_type or not model_path:
             raise ValueError("Invalid model metadata")
-        detector = _load_detector(model_type, model_path)
-        return detector, metadata
+        return _PRELOADED.get(model_path) or _load_detector(model_type, model_path)
+
+    def preload(self) -> dict[str, object]:
+        detector, metadata = self.load_latest()
+        _PRELOADED.clear()
+        _PRELOADED[str(metadata["path"])] = detector
+        return metadata
+
+    def bootstrap_lock(self) -> FileLock:
+        return FileLock(self.base_path / ".bootstrap.lock")
+
+    def retrain_lock(self) -> FileLock:
+        return FileLock(self.base_path / ".retrain.lock")
+
+
+_PRELOADED: dict[str, IAnomalyDetector] = {}
 
 
 def _load_detector(model_type: str, path: str) -> IAnomalyDetector:
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import logging
+import selectors
+import socket
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+RELAY_MAX_PENDING_BYTES = 4 * 1024 * 1024
+RELAY_SEND_TIMEOUT_SECONDS = 1.0
+
+
+class _Peer:
+    def __init__(self, slot: int, sock: socket.socket) -> None:
+        self.slot = slot
+        self.sock = sock
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+
+
+class RelayHub:
+    def __init__(self, max_pending_bytes: int = RELAY_MAX_PENDING_BYTES) -> None:
+        self.max_pending_bytes = max_pending_bytes
+        self.relayed = 0
+        self.dropped = 0
+        self._selector = selectors.DefaultSelector()
+        self._peers: dict[int, _Peer] = {}
+
+    def attach(self, slot: int) -> socket.socket:
+        self.detach(slot)
+        hub_end, worker_end = socket.socketpair()
+        hub_end.setblocking(False)
+        peer = self._peers[slot] = _Peer(slot, hub_end)
+        self._selector.register(hub_end, selectors.EVENT_READ, peer)
+        return worker_end
+
+    def detach(self, slot: int) -> None:
+        peer = self._peers.pop(slot, None)
+        if peer is not None:
+            self._selector.unregister(peer.sock)
+            peer.sock.close()
+
+    def close(self) -> None:
+        for slot in list(self._peers):
+            self.detach(slot)
+        self._selector.close()
+
+    def close_inherited(self) -> None:
+        for peer in self._peers.values():
+            peer.sock.close()
+        self._peers.clear()
+        self._selector.close()
+
+    def poll(self, timeout: float) -> None:
+        for key, mask in self._selector.select(timeout):
+            peer: _Peer = key.data
+            if self._peers.get(peer.slot) is not peer:
+                continue
+            if mask & selectors.EVENT_READ:
+                self._read(peer)
+            if mask & selectors.EVENT_WRITE and self._peers.get(peer.slot) is peer:
+                self._write(peer)
+
+    def _read(self, peer: _Peer) -> None:
+        try:
+            data = peer.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.detach(peer.slot)
+            return
+        peer.inbox += data
+        if b"\n" not in data:
+            if len(peer.inbox) > self.max_pending_bytes:
+                peer.inbox.clear()
+                self.dropped += 1
+            return
+        *frames, peer.inbox = peer.inbox.split(b"\n")
+        for frame in frames:
+            if frame:
+                self._forward(peer.slot, bytes(frame) + b"\n")
+
+    def _forward(self, source: int, frame: bytes) -> None:
+        self.relayed += 1
+        for peer in list(self._peers.values()):
+            if peer.slot == source:
+                continue
+            if len(peer.outbox) + len(frame) > self.max_pending_bytes:
+                self.dropped += 1
+                continue
+            peer.outbox += frame
+            self._write(peer)
+
+    def _write(self, peer: _Peer) -> None:
+        try:
+            sent = peer.sock.send(peer.outbox)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.detach(peer.slot)
+            return
+        del peer.outbox[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if peer.outbox else 0)
+        self._selector.modify(peer.sock, events, peer)
+
+
+class RelayClient:
+    def __init__(
+        self, sock: socket.socket, send_timeout: float = RELAY_SEND_TIMEOUT_SECONDS
+    ) -> None:
+        self.sock = sock
+        self.sock.settimeout(send_timeout)
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def send(self, message: dict) -> None:
+        frame = json.dumps(message, ensure_ascii=True, separators=(",", ":")).encode() + b"\n"
+        with self._send_lock:
+            try:
+                self.sock.sendall(frame)
+            except OSError:
+                self.dropped += 1
+                return
+            self.sent += 1
+
+    def start(self, handler: Callable[[dict], None]) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(handler,), name="relay_client", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._closed.set()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.sock.close()
+
+    def stats(self) -> dict[str, int]:
+        return {"sent": self.sent, "received": self.received, "dropped": self.dropped}
+
+    def _run(self, handler: Callable[[dict], None]) -> None:
+        buffer = bytearray()
+        while not self._closed.is_set():
+            try:
+                data = self.sock.recv(65536)
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            if b"\n" not in data:
+                continue
+            *frames, buffer = buffer.split(b"\n")
+            for frame in frames:
+                try:
+                    message = json.loads(frame)
+                except ValueError:
+                    self.dropped += 1
+                    continue
+                self.received += 1
+                try:
+                    handler(message)
+                except Exception:
+                    logger.exception("relay_handler_failed")
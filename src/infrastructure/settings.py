@@ -7,15 +7,56 @@ class Settings(BaseSettings):
     app_name: str = "ML Anomaly Detection for Logs"
     environment: str = "dev"
     database_url: str = "sqlite:///./data/logdetector.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 500
+    db_prepare_threshold: int | None = 5
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
     artifact_dir: str = "./artifacts"
     model_type: str = "isolation_forest"
     anomaly_threshold: float = 0.5
     baseline_threshold: float = 0.85
     log_level: str = "INFO"
     ingest_batch_size: int = 500
+    scoring_workers: int = 0
+    web_workers: int = 1
+    ingest_max_inflight_events: int = 50000
+    ingest_max_lines: int = 50000
+    ingest_max_body_bytes: int = 16 * 1024 * 1024
+    ingest_stream_max_body_bytes: int = 0
+    ingest_source_rate: float = 0.0
+    ingest_source_burst: float = 0.0
+    coalesce_enabled: bool = False
+    coalesce_max_events: int = 500
+    coalesce_max_wait_ms: float = 10.0
+    dedup_window_seconds: float = 0.0
+    dedup_max_keys: int = 10000
+    response_cache_ttl_seconds: float = 5.0
+    response_cache_max_limit: int = 50
+    stream_client_buffer: int = 256
+    stream_keepalive_seconds: float = 15.0
     auto_train_on_startup: bool = False
     bootstrap_log_path: str = "./data/logs/normal.jsonl"
     bootstrap_log_format: str = "jsonl"
+    dataset_cache_dir: str = "./data/cache"
+    raw_retention_days: int = 0
+    retention_interval_seconds: float = 3600.0
+    retrain_interval_seconds: float = 0.0
+    retrain_window_days: float = 7.0
+    retrain_max_events: int = 200000
+    retrain_min_events: int = 1000
+    normal_sample_rate: float = 1.0
+    write_behind_enabled: bool = False
+    write_behind_max_pending: int = 50000
+    write_behind_batch_size: int = 5000
+    write_behind_flush_interval_seconds: float = 1.0
+    write_behind_spill_path: str | None = None
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -1,34 +1,94 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import base64
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
+    ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
+    MetaData,
+    PrimaryKeyConstraint,
     String,
     Text,
+    UniqueConstraint,
+    and_,
+    case,
     create_engine,
+    delete,
+    event,
+    exists,
     func,
+    insert,
+    inspect,
+    or_,
     select,
+    text,
+    tuple_,
+    update,
 )
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, Row, make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session, declarative_base
 
-from domain.models import AnomalyResult
+from application.templates import (
+    extract_template,
+    pack_params,
+    render_template,
+    template_id,
+    unpack_params,
+)
+from domain.models import AnomalyQuery, AnomalyResult, LogEvent
+from infrastructure.instrumentation import timed
+from infrastructure.settings import Settings
 
 Base = declarative_base()
 
+ROLLUP_KEY = ("minute", "source", "level", "model_version")
+STREAM_BATCH_SIZE = 500
+MIGRATION_BATCH_SIZE = 5000
+TRAINING_PAGE_SIZE = 50000
+PARTITION_CREATE_ATTEMPTS = 3
+TEMPLATE_CACHE_SIZE = 10000
+INGEST_PROGRESS_RETENTION = timedelta(days=1)
+SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+class MessageTemplate(Base):
+    __tablename__ = "templates"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    template = Column(Text, nullable=False)
+
 
 class LogRecord(Base):
     __tablename__ = "log_records"
+    __table_args__ = (
+        Index("ix_log_records_timestamp", "timestamp"),
+        Index("ix_log_records_anomaly_score", "is_anomaly", "anomaly_score", "id"),
+        Index("ix_log_records_anomaly_time", "is_anomaly", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime(timezone=True), nullable=False)
     level = Column(String(32), nullable=False)
-    message = Column(Text, nullable=False)
+    message = Column(Text, nullable=True)
+    template_id = Column(BigInteger, ForeignKey("templates.id"), nullable=True)
+    params = Column(JSON(none_as_null=True), nullable=True)
+    packed_params = Column(LargeBinary, nullable=True)
     host = Column(String(128), nullable=True)
     service = Column(String(128), nullable=True)
     user = Column(String(128), nullable=True)
@@ -38,70 +98,561 @@ class LogRecord(Base):
     anomaly_score = Column(Float, nullable=False)
     is_anomaly = Column(Boolean, default=False)
     model_version = Column(String(64), nullable=False)
+    weight = Column(Float, nullable=False, default=1.0, server_default=text("1"))
+    repeat_count = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    last_timestamp = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
 
+class LogRollup(Base):
+    __tablename__ = "log_rollups"
+    __table_args__ = (UniqueConstraint(*ROLLUP_KEY, name="uq_log_rollups_key"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    minute = Column(DateTime(timezone=True), nullable=False)
+    source = Column(String(128), nullable=False)
+    level = Column(String(32), nullable=False)
+    model_version = Column(String(64), nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    anomaly_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_max = Column(Float, nullable=False, default=0.0)
+
+
+class IngestProgress(Base):
+    __tablename__ = "ingest_progress"
+
+    key = Column(String(128), primary_key=True)
+    lines = Column(Integer, nullable=False, default=0)
+    anomalies = Column(Integer, nullable=False, default=0)
+    batches = Column(Integer, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
 class Storage:
-    def __init__(self, database_url: str) -> None:
-        self.engine = create_engine(database_url, future=True)
+    def __init__(self, database_url: str, settings: Settings | None = None) -> None:
+        self.engine = create_storage_engine(database_url, settings or Settings())
+        self.partitioned = False
+        self._partition_days: set[datetime] = set()
+        self._templates = TemplateCache()
+        self._templated_message: str | None = ""
 
     def init_db(self) -> None:
+        if self.engine.dialect.name == "postgresql":
+            self._init_partitioned_records()
         Base.metadata.create_all(self.engine)
+        table = LogRecord.__table__
+        with self.engine.begin() as conn:
+            _add_missing_columns(conn, table)
+            if self.engine.dialect.name == "postgresql":
+                conn.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN message DROP NOT NULL"))
+        self._backfill_rollups()
+        for index in LogRecord.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+        self.inspect_schema()
+
+    def inspect_schema(self) -> None:
+        table = LogRecord.__table__
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == "postgresql":
+                self.partitioned = bool(
+                    conn.execute(
+                        text(
+                            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"
+                        ),
+                        {"name": table.name},
+                    ).first()
+                )
+            columns = {column["name"]: column for column in inspect(conn).get_columns(table.name)}
+        self._templated_message = None if columns["message"]["nullable"] else ""
 
     def save_results(self, results: list[AnomalyResult]) -> None:
-        with Session(self.engine) as session:
+        with timed("storage_save", len(results)):
+            stored = [result for result in results if result.weight > 0]
+            rollups: dict[tuple, dict] = {}
             for result in results:
-                event = result.event
-                record = LogRecord(
-                    timestamp=event.timestamp,
-                    level=event.level,
-                    message=event.message,
-                    host=event.host,
-                    service=event.service,
-                    user=event.user,
-                    ip=event.ip,
-                    request_id=event.request_id,
-                    attributes=event.attributes,
-                    anomaly_score=result.score,
-                    is_anomaly=result.is_anomaly,
-                    model_version=result.model_version,
+                _accumulate(
+                    rollups,
+                    _rollup_key(result),
+                    result.score,
+                    result.is_anomaly,
+                    result.event.repeat_count,
                 )
-                session.add(record)
-            session.commit()
+            if self.partitioned:
+                self._ensure_partitions(result.event.timestamp for result in stored)
+            with Session(self.engine) as session:
+                compressed = [self._compress_message(result.event.message) for result in stored]
+                self._insert_templates(session, compressed)
+                for result, (message, tid, _, packed) in zip(stored, compressed, strict=True):
+                    event = result.event
+                    record = LogRecord(
+                        timestamp=event.timestamp,
+                        level=event.level,
+                        message=message,
+                        template_id=tid,
+                        packed_params=packed,
+                        host=event.host,
+                        service=event.service,
+                        user=event.user,
+                        ip=event.ip,
+                        request_id=event.request_id,
+                        attributes=event.attributes,
+                        anomaly_score=result.score,
+                        is_anomaly=result.is_anomaly,
+                        model_version=result.model_version,
+                        weight=result.weight,
+                        repeat_count=event.repeat_count,
+                        last_timestamp=event.last_timestamp,
+                    )
+                    session.add(record)
+                self._upsert_rollups(session, list(rollups.values()))
+                with timed("db_commit"):
+                    session.commit()
 
-    def get_anomalies(self, limit: int = 50, min_score: float | None = None) -> list[dict]:
+    def get_anomalies(self, query: AnomalyQuery | None = None) -> list[dict]:
+        return list(self.iter_anomalies(query or AnomalyQuery()))
+
+    def iter_anomalies(self, query: AnomalyQuery) -> Iterator[dict]:
+        sort_column = LogRecord.anomaly_score if query.order == "score" else LogRecord.timestamp
+        stmt = (
+            select(LogRecord)
+            .where(LogRecord.is_anomaly.is_(True))
+            .where(*_time_range(LogRecord.timestamp, query.since, query.until))
+        )
+        if query.min_score is not None:
+            stmt = stmt.where(LogRecord.anomaly_score >= query.min_score)
+        filters = (
+            (LogRecord.host, query.host),
+            (LogRecord.service, query.service),
+            (LogRecord.level, query.level),
+            (LogRecord.model_version, query.model_version),
+        )
+        for column, value in filters:
+            if value is not None:
+                stmt = stmt.where(column == value)
+        if query.cursor is not None:
+            key, last_id = decode_cursor(query.cursor, query.order)
+            stmt = stmt.where(
+                or_(sort_column < key, and_(sort_column == key, LogRecord.id < last_id))
+            )
+        stmt = stmt.order_by(sort_column.desc(), LogRecord.id.desc()).limit(query.limit)
+        return self._stream_records(stmt)
+
+    def _stream_records(self, stmt) -> Iterator[dict]:
         with Session(self.engine) as session:
+            records = session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+            for page in records.scalars().partitions():
+                messages = self._record_messages(session, page)
+                for record, message in zip(page, messages, strict=True):
+                    yield self._record_to_dict(record, message)
+
+    def iter_normal_records(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        page_size: int = TRAINING_PAGE_SIZE,
+    ) -> Iterator[Row]:
+        columns = (LogRecord.id, LogRecord.timestamp, LogRecord.weight, LogRecord.repeat_count)
+        last: tuple[datetime, int] | None = None
+        while True:
             stmt = (
-                select(LogRecord)
-                .where(LogRecord.is_anomaly.is_(True))
-                .order_by(LogRecord.anomaly_score.desc())
+                select(*columns)
+                .where(LogRecord.is_anomaly.is_(False))
+                .where(*_time_range(LogRecord.timestamp, since, until))
+            )
+            if last is not None:
+                stmt = stmt.where(tuple_(LogRecord.timestamp, LogRecord.id) > last)
+            stmt = stmt.order_by(LogRecord.timestamp, LogRecord.id).limit(page_size)
+            count = 0
+            with Session(self.engine) as session:
+                rows = session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+                for row in rows:
+                    count += 1
+                    last = (row.timestamp, row.id)
+                    yield row
+            if count < page_size:
+                return
+
+    def load_events(self, ids: Iterable[int]) -> list[LogEvent]:
+        ids = list(ids)
+        events: list[LogEvent] = []
+        with Session(self.engine) as session:
+            for offset in range(0, len(ids), MIGRATION_BATCH_SIZE):
+                chunk = ids[offset : offset + MIGRATION_BATCH_SIZE]
+                stmt = (
+                    select(LogRecord)
+                    .where(LogRecord.id.in_(chunk))
+                    .order_by(LogRecord.timestamp, LogRecord.id)
+                )
+                records = session.execute(stmt).scalars().all()
+                messages = self._record_messages(session, records)
+                events.extend(
+                    LogEvent(
+                        timestamp=_as_utc(record.timestamp),
+                        level=record.level,
+                        message=message,
+                        host=record.host,
+                        service=record.service,
+                        user=record.user,
+                        ip=record.ip,
+                        request_id=record.request_id,
+                        attributes=record.attributes or {},
+                        repeat_count=record.repeat_count,
+                    )
+                    for record, message in zip(records, messages, strict=True)
+                )
+                session.expunge_all()
+        return events
+
+    def migrate_templates(self, batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+        migrated = 0
+        last_id = 0
+        while True:
+            with Session(self.engine) as session:
+                rows = session.execute(
+                    select(
+                        LogRecord.id,
+                        LogRecord.message,
+                        LogRecord.template_id,
+                        LogRecord.params,
+                        LogRecord.params.is_not(None).label("has_params"),
+                    )
+                    .where(LogRecord.id > last_id)
+                    .where(or_(LogRecord.template_id.is_(None), LogRecord.params.is_not(None)))
+                    .order_by(LogRecord.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    return migrated
+                last_id = rows[-1].id
+                compressed = [
+                    self._compress_message(row.message) if row.template_id is None else None
+                    for row in rows
+                ]
+                self._insert_templates(session, [entry for entry in compressed if entry])
+                updates = []
+                for row, entry in zip(rows, compressed, strict=True):
+                    if entry is None:
+                        packed = pack_params(row.params) if row.params else None
+                        updates.append({"id": row.id, "params": None, "packed_params": packed})
+                    elif entry[1] is None:
+                        if row.has_params:
+                            updates.append({"id": row.id, "params": None})
+                    else:
+                        message, tid, _, packed = entry
+                        updates.append(
+                            {
+                                "id": row.id,
+                                "message": message,
+                                "template_id": tid,
+                                "params": None,
+                                "packed_params": packed,
+                            }
+                        )
+                        migrated += 1
+                if updates:
+                    session.execute(update(LogRecord), updates)
+                session.commit()
+
+    def _compress_message(
+        self, message: str
+    ) -> tuple[str | None, int | None, str | None, bytes | None]:
+        extracted = extract_template(message)
+        if extracted is None:
+            return message, None, None, None
+        template, params = extracted
+        tid = template_id(template)
+        self._templates.put(tid, template)
+        return self._templated_message, tid, template, pack_params(params) if params else None
+
+    def _insert_templates(
+        self,
+        session: Session,
+        compressed: list[tuple[str | None, int | None, str | None, bytes | None]],
+    ) -> None:
+        templates = {tid: template for _, tid, template, _ in compressed if tid is not None}
+        ids = set(templates)
+        rows = [{"id": tid, "template": templates[tid]} for tid in sorted(ids)]
+        if not rows:
+            return
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            session.execute(postgresql.insert(MessageTemplate).on_conflict_do_nothing(), rows)
+        elif dialect == "sqlite":
+            session.execute(sqlite.insert(MessageTemplate).on_conflict_do_nothing(), rows)
+        else:
+            existing = set(
+                session.execute(select(MessageTemplate.id).where(MessageTemplate.id.in_(ids)))
+                .scalars()
+                .all()
+            )
+            session.add_all(MessageTemplate(**row) for row in rows if row["id"] not in existing)
+            session.flush()
+
+    def _record_messages(self, session: Session, records: list[LogRecord]) -> list[str]:
+        templates: dict[int, str] = {}
+        missing = set()
+        for record in records:
+            if record.template_id is None or record.template_id in templates:
+                continue
+            template = self._templates.get(record.template_id)
+            if template is None:
+                missing.add(record.template_id)
+            else:
+                templates[record.template_id] = template
+        if missing:
+            loaded = session.execute(
+                select(MessageTemplate.id, MessageTemplate.template).where(
+                    MessageTemplate.id.in_(missing)
+                )
             )
-            if min_score is not None:
-                stmt = stmt.where(LogRecord.anomaly_score >= min_score)
-            stmt = stmt.limit(limit)
-            records = session.execute(stmt).scalars().all()
-        return [self._record_to_dict(record) for record in records]
+            for tid, template in loaded:
+                templates[tid] = template
+                self._templates.put(tid, template)
+        return [_render_record(record, templates) for record in records]
 
-    def metrics(self) -> dict[str, float | int | str | None]:
+    def metrics(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> dict[str, float | int | str | None]:
         with Session(self.engine) as session:
-            total = session.execute(select(func.count(LogRecord.id))).scalar_one()
-            anomalies = session.execute(
-                select(func.count(LogRecord.id)).where(LogRecord.is_anomaly.is_(True))
-            ).scalar_one()
+            total, anomalies = session.execute(
+                select(
+                    func.coalesce(func.sum(LogRollup.event_count), 0),
+                    func.coalesce(func.sum(LogRollup.anomaly_count), 0),
+                ).where(*_time_range(LogRollup.minute, since, until))
+            ).one()
             latest = session.execute(select(func.max(LogRecord.created_at))).scalar_one()
+        total = int(total)
+        anomalies = int(anomalies)
         return {
-            "total_events": int(total),
-            "anomalies": int(anomalies),
+            "total_events": total,
+            "anomalies": anomalies,
             "anomaly_rate": float(anomalies) / float(total) if total else 0.0,
             "last_ingest": latest.isoformat() if latest else None,
         }
 
-    def _record_to_dict(self, record: LogRecord) -> dict:
+    def timeseries(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        source: str | None = None,
+        level: str | None = None,
+        model_version: str | None = None,
+        limit: int = 360,
+    ) -> list[dict]:
+        stmt = (
+            select(
+                LogRollup.minute,
+                func.sum(LogRollup.event_count).label("events"),
+                func.sum(LogRollup.anomaly_count).label("anomalies"),
+                func.sum(LogRollup.score_sum).label("score_sum"),
+                func.max(LogRollup.score_max).label("score_max"),
+            )
+            .where(*_time_range(LogRollup.minute, since, until))
+            .group_by(LogRollup.minute)
+            .order_by(LogRollup.minute.desc())
+            .limit(limit)
+        )
+        filters = (
+            (LogRollup.source, source),
+            (LogRollup.level, level),
+            (LogRollup.model_version, model_version),
+        )
+        for column, value in filters:
+            if value is not None:
+                stmt = stmt.where(column == value)
+        with Session(self.engine) as session:
+            rows = session.execute(stmt).all()
+        return [
+            {
+                "minute": _as_utc(row.minute).isoformat(),
+                "events": int(row.events),
+                "anomalies": int(row.anomalies),
+                "score_avg": float(row.score_sum) / row.events if row.events else 0.0,
+                "score_max": float(row.score_max),
+            }
+            for row in reversed(rows)
+        ]
+
+    def get_ingest_progress(self, key: str) -> dict | None:
+        with Session(self.engine) as session:
+            row = session.get(IngestProgress, key)
+            if row is None:
+                return None
+            return {
+                "lines": row.lines,
+                "anomalies": row.anomalies,
+                "batches": row.batches,
+                "completed": row.completed,
+            }
+
+    def record_ingest_progress(
+        self, key: str, lines: int, anomalies: int, batches: int, completed: bool = False
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        with Session(self.engine) as session:
+            session.merge(
+                IngestProgress(
+                    key=key,
+                    lines=lines,
+                    anomalies=anomalies,
+                    batches=batches,
+                    completed=completed,
+                    updated_at=now,
+                )
+            )
+            if completed:
+                session.execute(
+                    delete(IngestProgress).where(
+                        IngestProgress.updated_at < now - INGEST_PROGRESS_RETENTION
+                    )
+                )
+            session.commit()
+
+    def compact_expired(self, retention_days: int, now: datetime | None = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        cutoff = _day_start(now - timedelta(days=retention_days))
+        compacted = 0
+        while True:
+            with Session(self.engine) as session:
+                oldest = session.execute(
+                    select(func.min(LogRecord.timestamp)).where(LogRecord.timestamp < cutoff)
+                ).scalar_one()
+            if oldest is None:
+                return compacted
+            day_count = self._compact_day(_day_start(oldest))
+            if day_count == 0:
+                return compacted
+            compacted += day_count
+
+    def _compact_day(self, day: datetime) -> int:
+        next_day = day + timedelta(days=1)
+        day_range = _time_range(LogRecord.timestamp, day, next_day)
+        with Session(self.engine) as session:
+            count = session.execute(select(func.count(LogRecord.id)).where(*day_range)).scalar_one()
+            if self.partitioned:
+                session.execute(text(f"DROP TABLE IF EXISTS {_partition_name(day)}"))
+                self._partition_days.discard(day)
+            session.execute(delete(LogRecord).where(*day_range))
+            session.commit()
+        return int(count)
+
+    def _backfill_rollups(self) -> None:
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            minute = func.date_trunc("minute", LogRecord.timestamp)
+        elif dialect == "sqlite":
+            minute = func.strftime("%Y-%m-%d %H:%M:00.000000", LogRecord.timestamp)
+        else:
+            return
+        source = func.coalesce(
+            func.nullif(LogRecord.host, ""), func.nullif(LogRecord.service, ""), "unknown"
+        )
+        count = LogRecord.weight * LogRecord.repeat_count
+        aggregated = (
+            select(
+                minute,
+                source,
+                LogRecord.level,
+                LogRecord.model_version,
+                func.round(func.sum(count)),
+                func.round(func.sum(case((LogRecord.is_anomaly.is_(True), count), else_=0))),
+                func.sum(LogRecord.anomaly_score * count),
+                func.max(LogRecord.anomaly_score),
+            )
+            .where(~exists().where(LogRollup.id.is_not(None)))
+            .group_by(minute, source, LogRecord.level, LogRecord.model_version)
+        )
+        columns = [*ROLLUP_KEY, "event_count", "anomaly_count", "score_sum", "score_max"]
+        with self.engine.begin() as conn:
+            if dialect == "postgresql":
+                conn.execute(text(f"LOCK TABLE {LogRollup.__tablename__} IN EXCLUSIVE MODE"))
+            conn.execute(insert(LogRollup).from_select(columns, aggregated))
+
+    def _upsert_rollups(self, session: Session, rows: list[dict]) -> None:
+        if not rows:
+            return
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(LogRollup)
+            greatest = func.greatest
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(LogRollup)
+            greatest = func.max
+        else:
+            self._merge_rollups(session, rows)
+            return
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={
+                "event_count": LogRollup.event_count + stmt.excluded.event_count,
+                "anomaly_count": LogRollup.anomaly_count + stmt.excluded.anomaly_count,
+                "score_sum": LogRollup.score_sum + stmt.excluded.score_sum,
+                "score_max": greatest(LogRollup.score_max, stmt.excluded.score_max),
+            },
+        )
+        session.execute(stmt, rows)
+
+    def _merge_rollups(self, session: Session, rows: list[dict]) -> None:
+        for row in rows:
+            existing = session.execute(
+                select(LogRollup).filter_by(**{name: row[name] for name in ROLLUP_KEY})
+            ).scalar_one_or_none()
+            if existing is None:
+                session.add(LogRollup(**row))
+                continue
+            existing.event_count += row["event_count"]
+            existing.anomaly_count += row["anomaly_count"]
+            existing.score_sum += row["score_sum"]
+            existing.score_max = max(existing.score_max, row["score_max"])
+
+    def _init_partitioned_records(self) -> None:
+        table = LogRecord.__table__
+        with self.engine.begin() as conn:
+            if not inspect(conn).has_table(table.name):
+                metadata = MetaData()
+                MessageTemplate.__table__.to_metadata(metadata).create(conn, checkfirst=True)
+                partitioned = table.to_metadata(metadata)
+                partitioned.c.timestamp.primary_key = True
+                partitioned.append_constraint(
+                    PrimaryKeyConstraint(partitioned.c.id, partitioned.c.timestamp)
+                )
+                partitioned.dialect_options["postgresql"]["partition_by"] = "RANGE (timestamp)"
+                partitioned.create(conn)
+                conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {table.name}_default "
+                        f"PARTITION OF {table.name} DEFAULT"
+                    )
+                )
+
+    def _ensure_partitions(self, timestamps: Iterable[datetime]) -> None:
+        days = {_day_start(timestamp) for timestamp in timestamps} - self._partition_days
+        for day in sorted(days):
+            self._create_partition(day)
+            self._partition_days.add(day)
+
+    def _create_partition(self, day: datetime) -> None:
+        name = _partition_name(day)
+        for attempt in range(PARTITION_CREATE_ATTEMPTS):
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(_partition_ddl(day)))
+                return
+            except DBAPIError:
+                with self.engine.connect() as conn:
+                    if inspect(conn).has_table(name):
+                        return
+                if attempt == PARTITION_CREATE_ATTEMPTS - 1:
+                    raise
+
+    def _record_to_dict(self, record: LogRecord, message: str) -> dict:
         return {
             "id": record.id,
             "timestamp": record.timestamp.isoformat(),
             "level": record.level,
-            "message": record.message,
+            "message": message,
             "host": record.host,
             "service": record.service,
             "user": record.user,
@@ -110,4 +661,173 @@ class Storage:
             "attributes": record.attributes,
             "anomaly_score": record.anomaly_score,
             "model_version": record.model_version,
+            "repeat_count": record.repeat_count,
+            "last_timestamp": record.last_timestamp.isoformat() if record.last_timestamp else None,
         }
+
+
+def create_storage_engine(database_url: str, settings: Settings) -> Engine:
+    url = make_url(database_url)
+    options: dict = {"future": True, "query_cache_size": settings.db_statement_cache_size}
+    if url.get_backend_name() == "sqlite":
+        engine = create_engine(url, **options)
+        event.listen(engine, "connect", _sqlite_pragmas(settings))
+        return engine
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    if url.get_driver_name() == "psycopg":
+        options["connect_args"] = {"prepare_threshold": settings.db_prepare_threshold}
+    return create_engine(url, **options)
+
+
+def _sqlite_pragmas(settings: Settings):
+    journal_mode = settings.sqlite_journal_mode.upper()
+    synchronous = settings.sqlite_synchronous.upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLite journal mode: {settings.sqlite_journal_mode}")
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported SQLite synchronous mode: {settings.sqlite_synchronous}")
+    pragmas = [
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+    ]
+
+    def on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def encode_cursor(item: dict, order: str) -> str:
+    key = item["anomaly_score"] if order == "score" else item["timestamp"]
+    raw = json.dumps([order, key, item["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str) -> tuple[float | datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, key, record_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_order != order:
+            raise ValueError(f"Cursor was issued for order={cursor_order}")
+        if order == "time":
+            return datetime.fromisoformat(key), int(record_id)
+        return float(key), int(record_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {exc}") from exc
+
+
+class TemplateCache:
+    def __init__(self, max_entries: int = TEMPLATE_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tid: int) -> str | None:
+        with self._lock:
+            template = self._entries.get(tid)
+            if template is not None:
+                self._entries.move_to_end(tid)
+            return template
+
+    def put(self, tid: int, template: str) -> None:
+        with self._lock:
+            self._entries[tid] = template
+            self._entries.move_to_end(tid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _render_record(record: LogRecord, templates: dict[int, str]) -> str:
+    if record.template_id is None:
+        return record.message
+    if record.packed_params is not None:
+        params = unpack_params(record.packed_params)
+    else:
+        params = record.params
+    return render_template(templates[record.template_id], params)
+
+
+def _add_missing_columns(conn, table) -> None:
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    preparer = conn.dialect.identifier_preparer
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        ddl = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN "
+        ddl += f"{preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)}"
+        if column.server_default is not None:
+            ddl += f" DEFAULT {column.server_default.arg.text}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+        conn.execute(text(ddl))
+
+
+def _rollup_key(result: AnomalyResult) -> tuple:
+    event = result.event
+    return (_minute_start(event.timestamp), event.source, event.level, result.model_version)
+
+
+def _accumulate(
+    aggregates: dict[tuple, dict], key: tuple, score: float, is_anomaly: bool, count: int = 1
+) -> None:
+    row = aggregates.get(key)
+    if row is None:
+        row = dict(zip(ROLLUP_KEY, key, strict=True))
+        row.update(event_count=0, anomaly_count=0, score_sum=0.0, score_max=0.0)
+        aggregates[key] = row
+    row["event_count"] += count
+    row["anomaly_count"] += count if is_anomaly else 0
+    row["score_sum"] += float(score) * count
+    row["score_max"] = max(row["score_max"], float(score))
+
+
+def _time_range(column, since: datetime | None, until: datetime | None) -> list:
+    clauses = []
+    if since is not None:
+        clauses.append(column >= since)
+    if until is not None:
+        clauses.append(column < until)
+    return clauses
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _day_start(value: datetime) -> datetime:
+    return _as_utc(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _minute_start(value: datetime) -> datetime:
+    return _as_utc(value).replace(second=0, microsecond=0)
+
+
+def _partition_name(day: datetime) -> str:
+    return f"{LogRecord.__tablename__}_p{day:%Y%m%d}"
+
+
+def _partition_ddl(day: datetime) -> str:
+    next_day = day + timedelta(days=1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {_partition_name(day)} "
+        f"PARTITION OF {LogRecord.__tablename__} "
+        f"FOR VALUES FROM ('{day.isoformat()}') TO ('{next_day.isoformat()}')"
+    )
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from domain.models import AnomalyResult
+from infrastructure.files import atomic_write_json
+from infrastructure.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindWriter:
+    def __init__(
+        self,
+        storage: Storage,
+        max_pending: int = 50000,
+        batch_size: int = 5000,
+        flush_interval: float = 1.0,
+        spill_path: str | None = None,
+    ) -> None:
+        self.storage = storage
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._pending: deque[AnomalyResult] = deque()
+        self._condition = threading.Condition()
+        self._spill_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.flushes = 0
+        self.flushed_events = 0
+        self.failed_flushes = 0
+        self.spilled_events = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    def start(self, replay: bool = True) -> None:
+        if self._thread is not None:
+            return
+        if replay:
+            self.replay_spill()
+        self._thread = threading.Thread(target=self._run, name="write_behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, results: list[AnomalyResult]) -> None:
+        if not results:
+            return
+        with self._condition:
+            while len(self._pending) + len(results) > self.max_pending and self._pending:
+                if self._closed:
+                    break
+                if self.spill_path is not None:
+                    self._spill(results)
+                    return
+                self._condition.wait()
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            self._pending.extend(results)
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def close(self, timeout: float | None = 30.0) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._condition:
+            remaining = list(self._pending)
+            self._pending.clear()
+        if not remaining:
+            return
+        if self.spill_path is not None:
+            self._spill(remaining)
+        else:
+            logger.warning("write_behind_dropped_on_close", extra={"count": len(remaining)})
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "queue_depth": len(self._pending),
+            "max_pending": self.max_pending,
+            "flushes": self.flushes,
+            "flushed_events": self.flushed_events,
+            "failed_flushes": self.failed_flushes,
+            "spilled_events": self.spilled_events,
+            "last_flush_seconds": self.last_flush_seconds,
+            "max_flush_seconds": self.max_flush_seconds,
+            "avg_flush_seconds": self.total_flush_seconds / self.flushes if self.flushes else 0.0,
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed and not self._pending:
+                    return
+                size = min(len(self._pending), self.batch_size)
+                batch = [self._pending.popleft() for _ in range(size)]
+                self._condition.notify_all()
+            if batch and not self._flush(batch):
+                with self._condition:
+                    self._pending.extendleft(reversed(batch))
+                    if self._closed:
+                        return
+                time.sleep(self.flush_interval)
+
+    def _flush(self, batch: list[AnomalyResult]) -> bool:
+        started = time.perf_counter()
+        try:
+            self.storage.save_results(batch)
+        except Exception:
+            self.failed_flushes += 1
+            logger.exception("write_behind_flush_failed", extra={"count": len(batch)})
+            return False
+        elapsed = time.perf_counter() - started
+        self.flushes += 1
+        self.flushed_events += len(batch)
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+        return True
+
+    def _spill(self, results: list[AnomalyResult]) -> None:
+        payload = "".join(result.model_dump_json() + "\n" for result in results).encode("utf-8")
+        with self._spill_lock:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.spill_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+        self.spilled_events += len(results)
+        logger.warning("write_behind_spilled", extra={"count": len(results)})
+
+    def replay_spill(self) -> int:
+        if self.spill_path is None:
+            return 0
+        replaying = self.spill_path.with_name(self.spill_path.name + ".replaying")
+        replayed = 0
+        if replaying.exists():
+            replayed += self._replay_file(replaying)
+        with self._spill_lock:
+            spilled = self.spill_path.exists()
+            if spilled:
+                os.replace(self.spill_path, replaying)
+        if spilled:
+            replayed += self._replay_file(replaying)
+        if replayed:
+            logger.info("write_behind_spill_replayed", extra={"count": replayed})
+        return replayed
+
+    def _replay_file(self, path: Path) -> int:
+        progress_path = path.with_name(path.name + ".offset")
+        offset = 0
+        if progress_path.exists():
+            offset = json.loads(progress_path.read_text(encoding="utf-8")).get("offset", 0)
+        batch: list[AnomalyResult] = []
+        replayed = 0
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            for line in handle:
+                offset += len(line)
+                if line.strip():
+                    batch.append(AnomalyResult.model_validate_json(line))
+                if len(batch) >= self.batch_size:
+                    self.storage.save_results(batch)
+                    replayed += len(batch)
+                    batch = []
+                    atomic_write_json(progress_path, {"offset": offset})
+        if batch:
+            self.storage.save_results(batch)
+            replayed += len(batch)
+        path.unlink()
+        progress_path.unlink(missing_ok=True)
+        return replayed
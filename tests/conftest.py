@@ -1,7 +1,49 @@
+import importlib
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
+from fastapi.testclient import TestClient
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
-if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
+for path in (SRC, ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    clients: list[TestClient] = []
+
+    def start(worker_slot: int | None = None, worker_count: int = 1, **env: str):
+        from application.features import FeatureExtractor
+        from application.training import train_model
+        from domain.models import LogEvent
+        from infrastructure.registry import ModelRegistry
+
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/api.db")
+        monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path / "artifacts"))
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        settings_module = importlib.reload(importlib.import_module("infrastructure.settings"))
+        event = LogEvent(
+            timestamp=datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc),
+            host="auth-svc",
+            level="INFO",
+            message="User login succeeded",
+        )
+        registry = ModelRegistry(settings_module.settings.artifact_dir)
+        train_model([event], "baseline", registry, FeatureExtractor())
+        api_module = importlib.reload(importlib.import_module("api.main"))
+        api_module.app.state.worker_slot = worker_slot
+        api_module.app.state.worker_count = worker_count
+        client = TestClient(api_module.app)
+        client.__enter__()
+        clients.append(client)
+        return client, api_module.app.state.service
+
+    yield start
+    for client in clients:
+        client.__exit__(None, None, None)
@@ -0,0 +1,44 @@
+import pytest
+
+from application.admission import AdmissionController, AdmissionRejected
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_saturated_controller_rejects_with_retry_after_from_drain_rate() -> None:
+    clock = FakeClock()
+    controller = AdmissionController(max_inflight_events=100, clock=clock)
+    controller.acquire(100)
+    clock.now += 2.0
+    controller.release(100)
+    controller.acquire(80)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire(420)
+
+    assert rejected.value.reason == "saturated"
+    assert rejected.value.retry_after == 4
+    controller.release(80)
+    controller.acquire(420)
+    assert controller.stats()["rejected"]["saturated"] == 1
+
+
+def test_source_quota_isolates_noisy_source() -> None:
+    clock = FakeClock()
+    controller = AdmissionController(source_rate=10.0, source_burst=20.0, clock=clock)
+    controller.acquire(20, "noisy")
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire(10, "noisy")
+
+    assert rejected.value.reason == "quota"
+    assert rejected.value.retry_after == 1
+    controller.acquire(20, "quiet")
+    clock.now += 1.0
+    controller.acquire(10, "noisy")
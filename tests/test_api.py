@@ -1,51 +1,310 @@
-import importlib
+import asyncio
+import gzip
 import os
+import threading
 from datetime import datetime, timezone
 
-from fastapi.testclient import TestClient
+from sqlalchemy import event
 
+from application import scoring
 from application.features import FeatureExtractor
 from application.training import train_model
-from domain.models import LogEvent
+from domain.models import AnomalyResult, LogEvent
+from infrastructure import registry as registry_module
 from infrastructure.registry import ModelRegistry
+from infrastructure.storage import Storage
 
+LINE = '{"timestamp":"2026-01-15T10:01:00+00:00","host":"auth-svc","level":"INFO","message":"User login succeeded"}'
+EVENT = LogEvent(
+    timestamp=datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc),
+    host="auth-svc",
+    level="INFO",
+    message="User login succeeded",
+)
 
-def test_health_and_ingest(tmp_path) -> None:
-    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_path}/test.db"
-    os.environ["ARTIFACT_DIR"] = str(tmp_path / "artifacts")
-    os.environ["MODEL_TYPE"] = "baseline"
 
-    settings_module = importlib.import_module("infrastructure.settings")
-    importlib.reload(settings_module)
+def test_health_and_ingest(api_client) -> None:
+    client, _ = api_client()
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["model_loaded"] is True
 
-    events = [
-        LogEvent(
-            timestamp=datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc),
-            host="auth-svc",
-            level="INFO",
-            message="User login succeeded",
-            user="alice",
-            ip="10.0.0.10",
-            request_id="req-1",
-        )
+    ingest_response = client.post("/ingest", json={"format": "jsonl", "lines": [LINE]})
+    assert ingest_response.status_code == 200
+    assert ingest_response.json()["received"] == 1
+
+    anomalies_response = client.get("/anomalies", params={"limit": 10, "order": "time"})
+    assert anomalies_response.status_code == 200
+    page = anomalies_response.json()
+    assert len(page["items"]) <= 1
+    assert page["next_cursor"] is None
+    assert client.get("/anomalies", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    timeseries_response = client.get("/timeseries")
+    assert timeseries_response.status_code == 200
+    assert timeseries_response.json()["items"][0]["events"] == 1
+
+    exposition = client.get("/metrics/prometheus")
+    assert exposition.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'log_detector_stage_seconds_count{stage="parse"}' in exposition.text
+    assert 'log_detector_stage_events_total{stage="storage_save"}' in exposition.text
+
+
+def test_scoring_worker_loads_the_model_it_is_sent(tmp_path, monkeypatch) -> None:
+    registry = ModelRegistry(str(tmp_path / "artifacts"))
+    train_model([EVENT], "baseline", registry, FeatureExtractor())
+    first = registry.latest_metadata()
+    scoring._init_worker(str(registry.base_path), first)
+    train_model([EVENT, EVENT], "baseline", registry, FeatureExtractor())
+    second = registry.latest_metadata()
+    assert second["path"] != first["path"]
+
+    loads: list[object] = []
+    original = ModelRegistry.load
+
+    def counting_load(self, metadata):
+        loads.append(metadata["path"])
+        return original(self, metadata)
+
+    monkeypatch.setattr(ModelRegistry, "load", counting_load)
+    line = EVENT.model_dump_json()
+    for metadata in (first, first, second, second):
+        assert len(scoring._score_lines([line], "jsonl", 0.5, metadata)) == 1
+    assert loads == [second["path"]]
+
+
+class _PreloadedDetector:
+    def predict(self, events, threshold):
+        return [
+            AnomalyResult(event=event, score=1.0, is_anomaly=True, model_version="preloaded")
+            for event in events
+        ]
+
+
+def test_forked_scoring_pool_shares_the_preloaded_model(tmp_path, monkeypatch) -> None:
+    registry = ModelRegistry(str(tmp_path / "artifacts"))
+    metadata = {"model_type": "baseline", "path": str(tmp_path / "missing")}
+    monkeypatch.setitem(registry_module._PRELOADED, metadata["path"], _PreloadedDetector())
+    pool = scoring.ScoringPool(str(registry.base_path), 1, metadata, start_method="fork")
+    try:
+        results = asyncio.run(pool.score_lines([LINE], "jsonl", 0.5, metadata))
+    finally:
+        pool.close()
+    assert [result.model_version for result in results] == ["preloaded"]
+
+
+def test_ingest_through_scoring_pool(api_client, monkeypatch) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    client, _ = api_client(SCORING_WORKERS="1")
+    assert client.app.state.scoring_pool is not None
+    response = client.post("/ingest", json={"format": "jsonl", "lines": [LINE, LINE]})
+    assert response.status_code == 200
+    assert response.json()["received"] == 2
+    columnar = client.post(
+        "/ingest", json={"format": "jsonl", "lines": [LINE, "", LINE], "results": "columnar"}
+    ).json()
+    assert columnar["received"] == 2
+    assert columnar["scores"][1] is None
+    assert len(columnar["scores"]) == len(columnar["is_anomaly"]) == 3
+    assert columnar["anomaly_indices"] == [
+        index for index, flag in enumerate(columnar["is_anomaly"]) if flag
     ]
-    registry = ModelRegistry(settings_module.settings.artifact_dir)
-    train_model(events, "baseline", registry, FeatureExtractor())
-
-    api_module = importlib.import_module("api.main")
-    importlib.reload(api_module)
-
-    with TestClient(api_module.app) as client:
-        response = client.get("/health")
-        assert response.status_code == 200
-        assert response.json()["model_loaded"] is True
-
-        payload = {
-            "format": "jsonl",
-            "lines": [
-                '{"timestamp":"2026-01-15T10:01:00+00:00","host":"auth-svc","level":"INFO","message":"User login succeeded"}'
-            ],
-        }
-        ingest_response = client.post("/ingest", json=payload)
-        assert ingest_response.status_code == 200
-        assert ingest_response.json()["received"] == 1
+    assert columnar["anomalies"] == len(columnar["anomaly_indices"])
+    bad = client.post("/ingest", json={"format": "jsonl", "lines": ["not json"]})
+    assert bad.status_code == 400
+    assert client.get("/metrics").json()["total_events"] == 4
+
+
+def test_stream_ingest_accepts_gzipped_ndjson(api_client) -> None:
+    client, _ = api_client(INGEST_BATCH_SIZE="2")
+    body = gzip.compress(("\n".join([LINE] * 5) + "\n").encode("utf-8"))
+    response = client.post(
+        "/ingest/stream",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.json()["received"] == 5
+    assert response.json()["batches"] == 3
+    assert client.get("/metrics").json()["total_events"] == 5
+
+    broken = client.post("/ingest/stream", content=body[:-8], headers={"Content-Encoding": "gzip"})
+    assert broken.status_code == 400
+    unsupported = client.post("/ingest/stream", content=b"x", headers={"Content-Type": "image/png"})
+    assert unsupported.status_code == 415
+
+
+def test_stream_ingest_resumes_by_idempotency_key(api_client) -> None:
+    client, service = api_client(INGEST_BATCH_SIZE="2")
+    body = ("\n".join([LINE] * 5) + "\n").encode("utf-8")
+    storage = service.storage
+    storage.record_ingest_progress("batch-1", lines=2, anomalies=0, batches=1)
+    resumed = client.post("/ingest/stream", content=body, headers={"Idempotency-Key": "batch-1"})
+    assert resumed.status_code == 200
+    assert resumed.json()["received"] == 5
+    assert resumed.json()["batches"] == 3
+    assert client.get("/metrics").json()["total_events"] == 3
+
+    repeated = client.post("/ingest/stream", content=body, headers={"Idempotency-Key": "batch-1"})
+    assert repeated.json() == resumed.json()
+    assert client.get("/metrics").json()["total_events"] == 3
+    assert storage.get_ingest_progress("batch-1")["completed"]
+
+    invalid = client.post("/ingest/stream", content=body, headers={"Idempotency-Key": "x" * 200})
+    assert invalid.status_code == 400
+
+
+def test_keyed_stream_batches_commit_before_progress(api_client) -> None:
+    client, service = api_client(
+        INGEST_BATCH_SIZE="2",
+        WRITE_BEHIND_ENABLED="true",
+        WRITE_BEHIND_BATCH_SIZE="1000",
+        WRITE_BEHIND_FLUSH_INTERVAL_SECONDS="3600",
+    )
+    body = ("\n".join([LINE] * 5) + "\n").encode("utf-8")
+    response = client.post("/ingest/stream", content=body, headers={"Idempotency-Key": "k"})
+    assert response.json()["received"] == 5
+    assert service.storage.get_ingest_progress("k")["lines"] == 5
+    assert service.storage.metrics()["total_events"] == 5
+    assert service.writer.stats()["queue_depth"] == 0
+
+
+def test_ingest_collapses_duplicate_lines(api_client) -> None:
+    client, _ = api_client(DEDUP_WINDOW_SECONDS="60", RESPONSE_CACHE_TTL_SECONDS="0")
+    template = '{{"timestamp":"2026-01-15T10:01:{second:02d}+00:00","host":"{host}","level":"ERROR","message":"Disk full"}}'
+    lines = [template.format(second=second, host="core-db") for second in range(5)]
+    lines.insert(2, template.format(second=0, host="web-01"))
+    response = client.post("/ingest", json={"lines": lines, "results": "columnar"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["received"] == 6
+    assert len(body["scores"]) == 6
+    assert body["scores"][0] == body["scores"][5]
+
+    metrics = client.get("/metrics").json()
+    assert metrics["total_events"] == 6
+    assert metrics["anomalies"] == body["anomalies"]
+    assert client.get("/metrics/runtime").json()["dedup"]["collapsed"] == 4
+
+    items = client.get("/anomalies", params={"order": "time"}).json()["items"]
+    repeats = {item["host"]: item["repeat_count"] for item in items}
+    assert repeats == {"core-db": 5, "web-01": 1}
+
+    again = client.post("/ingest", json={"lines": [template.format(second=30, host="core-db")]})
+    assert again.json()["received"] == 1
+    assert client.get("/metrics").json()["total_events"] == 7
+    assert len(client.get("/anomalies", params={"order": "time"}).json()["items"]) == len(items)
+    assert client.get("/metrics/runtime").json()["dedup"]["continued"] == 1
+
+
+def test_coalesced_requests_share_the_service_pipeline(api_client) -> None:
+    client, service = api_client(
+        COALESCE_ENABLED="true", COALESCE_MAX_WAIT_MS="50", DEDUP_WINDOW_SECONDS="60"
+    )
+
+    async def submit_both():
+        return await asyncio.gather(
+            service.ingest([LINE, LINE], "jsonl"), service.ingest([LINE], "jsonl")
+        )
+
+    first, second = asyncio.run(submit_both())
+    assert (len(first), len(second)) == (2, 1)
+    runtime = client.get("/metrics/runtime").json()
+    assert runtime["coalescer"]["batches"] == 1
+    assert runtime["coalescer"]["requests"] == 2
+    assert runtime["dedup"]["collapsed"] == 2
+    assert client.get("/metrics").json()["total_events"] == 3
+
+
+def test_cached_reads_revalidate_with_etag(api_client) -> None:
+    client, service = api_client(RESPONSE_CACHE_TTL_SECONDS="60")
+    now = [0.0]
+    service.cache.clock = lambda: now[0]
+    statements: list[str] = []
+    event.listen(
+        service.storage.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    first = client.get("/metrics")
+    etag = first.headers["etag"]
+    assert first.json()["total_events"] == 0
+    statements.clear()
+    not_modified = client.get("/metrics", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert statements == []
+
+    page = client.get("/anomalies", params={"limit": 10})
+    assert page.status_code == 200
+    assert (
+        client.get(
+            "/anomalies", params={"limit": 10}, headers={"If-None-Match": page.headers["etag"]}
+        ).status_code
+        == 304
+    )
+
+    client.post("/ingest", json={"format": "jsonl", "lines": [LINE]})
+    fresh = client.get("/metrics", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["total_events"] == 1
+    assert fresh.headers["etag"] != etag
+
+    other_worker = Storage(service.storage.engine.url.render_as_string())
+    other_worker.save_results(
+        [AnomalyResult(event=EVENT, score=0.1, is_anomaly=False, model_version="v1")]
+    )
+    assert client.get("/metrics").json()["total_events"] == 1
+    now[0] += 61
+    assert client.get("/metrics").json()["total_events"] == 2
+
+
+def test_secondary_worker_skips_shared_startup_work(tmp_path, api_client, monkeypatch) -> None:
+    spill_path = tmp_path / "spill.jsonl"
+    spilled = AnomalyResult(event=EVENT, score=0.1, is_anomaly=False, model_version="v1")
+    spill_path.write_text(spilled.model_dump_json() + "\n", encoding="utf-8")
+    Storage(f"sqlite:///{tmp_path}/api.db").init_db()
+
+    def init_db(self) -> None:
+        raise AssertionError("init_db runs in the parent")
+
+    monkeypatch.setattr(Storage, "init_db", init_db)
+    client, _ = api_client(
+        worker_slot=1,
+        worker_count=2,
+        WRITE_BEHIND_ENABLED="true",
+        WRITE_BEHIND_SPILL_PATH=str(spill_path),
+        RAW_RETENTION_DAYS="1",
+        RETRAIN_INTERVAL_SECONDS="3600",
+    )
+    assert client.get("/health").status_code == 200
+    jobs = {thread.name for thread in threading.enumerate()}
+    assert "model_watch_job" in jobs
+    assert not jobs & {"retention_job", "retrain_job"}
+    assert spill_path.exists()
+    assert client.post("/ingest", json={"lines": [LINE]}).status_code == 200
+
+
+def test_ingest_admission_limits(api_client) -> None:
+    client, _ = api_client(
+        INGEST_MAX_LINES="3",
+        INGEST_MAX_BODY_BYTES="2000",
+        INGEST_SOURCE_RATE="1",
+        INGEST_SOURCE_BURST="2",
+    )
+    headers = {"X-Log-Source": "noisy"}
+    too_many = client.post("/ingest", json={"lines": [LINE] * 4}, headers=headers)
+    assert too_many.status_code == 413
+    too_big = client.post("/ingest", json={"lines": ["x" * 3000]}, headers=headers)
+    assert too_big.status_code == 413
+
+    accepted = client.post("/ingest", json={"lines": [LINE, LINE]}, headers=headers)
+    assert accepted.status_code == 200
+    throttled = client.post("/ingest", json={"lines": [LINE, LINE]}, headers=headers)
+    assert throttled.status_code == 429
+    assert int(throttled.headers["retry-after"]) >= 1
+    other = client.post("/ingest", json={"lines": [LINE]}, headers={"X-Log-Source": "quiet"})
+    assert other.status_code == 200
+
+    admission = client.get("/metrics/runtime").json()["admission"]
+    assert admission["rejected"] == {"saturated": 0, "quota": 1, "too_large": 2}
@@ -0,0 +1,91 @@
+import sys
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_runs, format_report
+from benchmarks.suite import _summarize, run_suite
+
+
+def _run(results: dict[str, tuple[float, float]]) -> dict:
+    return {
+        "results": {
+            key: {"size": int(key.split("@")[1]), "items_per_second": rate, "p99_ms": p99}
+            for key, (rate, p99) in results.items()
+        }
+    }
+
+
+def test_compare_flags_throughput_and_latency_regressions() -> None:
+    baseline = _run(
+        {
+            "parse_jsonl@1000": (1000.0, 10.0),
+            "featurize@1000": (500.0, 20.0),
+            "sqlite_write@1000": (200.0, 50.0),
+            "parse_jsonl@5000": (900.0, 12.0),
+        }
+    )
+    current = _run(
+        {
+            "parse_jsonl@1000": (700.0, 10.0),
+            "featurize@1000": (520.0, 40.0),
+            "sqlite_write@1000": (190.0, 55.0),
+            "new_stage@1000": (1.0, 1.0),
+        }
+    )
+    comparisons, missing = compare_runs(baseline, current, 0.2, 0.3)
+    flagged = {item.key: item.regressions for item in comparisons}
+    assert flagged == {
+        "parse_jsonl@1000": ["throughput -30.0%"],
+        "featurize@1000": ["p99 +100.0%"],
+        "sqlite_write@1000": [],
+    }
+    assert missing == []
+    assert "REGRESSION" in format_report(comparisons, missing)
+
+    _, missing = compare_runs(baseline, _run({"featurize@1000": (500.0, 20.0)}))
+    assert missing == ["parse_jsonl@1000", "sqlite_write@1000"]
+
+
+def test_suite_reports_every_requested_stage() -> None:
+    seen = []
+    report = run_suite(
+        sizes=[300],
+        batch_size=100,
+        repeats=2,
+        stages=["parse_jsonl", "parse_plain", "score_baseline", "sqlite_write"],
+        progress=seen.append,
+    )
+    results = report["results"]
+    assert list(results) == [
+        "parse_jsonl@300",
+        "parse_plain@300",
+        "score_baseline@300",
+        "sqlite_write@300",
+    ]
+    assert [result.key for result in seen] == list(results)
+    for result in results.values():
+        assert result["items"] == 300
+        assert result["items_per_second"] > 0
+        assert result["p50_ms"] <= result["p99_ms"] <= result["max_ms"]
+
+
+def test_summary_takes_latencies_from_the_fastest_pass() -> None:
+    slow = [(100, 0.5), (100, 0.5)]
+    fast = [(100, 0.1), (100, 0.3)]
+    result = _summarize("stage", 200, 100, [slow, fast])
+    assert result.items == 200
+    assert result.seconds == 0.4
+    assert result.items_per_second == 500.0
+    assert result.max_ms == 300.0
+    assert result.p50_ms == 200.0
+
+
+def test_compare_without_baseline_exits_with_instructions(tmp_path, monkeypatch, capsys) -> None:
+    baseline = tmp_path / "baseline.json"
+    argv = ["benchmarks", "compare", str(tmp_path / "latest.json"), "--baseline", str(baseline)]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 2
+    assert f"--output {baseline}" in capsys.readouterr().err
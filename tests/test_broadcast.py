@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+from application.broadcast import EventBroadcaster
+
+
+def test_broadcaster_fans_out_messages_published_from_threads() -> None:
+    broadcaster = EventBroadcaster(max_buffer=10)
+
+    async def run() -> tuple[list[dict], list[dict]]:
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+        publisher = threading.Thread(target=broadcaster.publish, args=({"type": "metrics"},))
+        publisher.start()
+        publisher.join()
+        return await first.get(1.0), await second.get(1.0)
+
+    first, second = asyncio.run(run())
+
+    assert first == second == [{"type": "metrics"}]
+    assert broadcaster.stats()["published"] == 1
+
+
+def test_slow_subscriber_drops_oldest_messages() -> None:
+    broadcaster = EventBroadcaster(max_buffer=3)
+
+    async def run() -> tuple[list[dict], list[dict]]:
+        subscription = broadcaster.subscribe()
+        for index in range(5):
+            broadcaster.publish({"type": "metrics", "index": index})
+        messages = await subscription.get(1.0)
+        assert subscription.dropped == 2
+        broadcaster.unsubscribe(subscription)
+        broadcaster.publish({"type": "metrics", "index": 5})
+        return messages, await subscription.get(0.01)
+
+    messages, after_unsubscribe = asyncio.run(run())
+
+    assert [message["index"] for message in messages] == [2, 3, 4]
+    assert after_unsubscribe == []
+
+
+def test_published_messages_are_forwarded_and_relayed_ones_are_not() -> None:
+    forwarded: list[dict] = []
+    broadcaster = EventBroadcaster(max_buffer=10, forward=forwarded.append)
+
+    async def run() -> list[dict]:
+        subscription = broadcaster.subscribe()
+        broadcaster.publish({"type": "metrics", "worker": 0})
+        broadcaster.deliver({"type": "metrics", "worker": 1})
+        return await subscription.get(1.0)
+
+    assert asyncio.run(run()) == [
+        {"type": "metrics", "worker": 0},
+        {"type": "metrics", "worker": 1},
+    ]
+    assert forwarded == [{"type": "metrics", "worker": 0}]
+    assert broadcaster.stats()["relayed"] == 1
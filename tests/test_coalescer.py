@@ -0,0 +1,55 @@
+import asyncio
+
+from application.coalescer import IngestCoalescer
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, lines: list[str], fmt: str) -> list[str]:
+        self.calls.append(list(lines))
+        if any(line == "bad" for line in lines):
+            raise ValueError("Invalid line")
+        return [f"{fmt}:{line}" for line in lines]
+
+
+def test_concurrent_requests_share_one_batch_and_get_their_own_results() -> None:
+    handler = RecordingHandler()
+    coalescer = IngestCoalescer(handler, max_events=100, max_wait_ms=20)
+
+    async def run() -> list[list[str]]:
+        return await asyncio.gather(
+            coalescer.submit(["a", "b"], "plain"),
+            coalescer.submit(["c", ""], "plain"),
+            coalescer.submit(["d"], "plain"),
+        )
+
+    results = asyncio.run(run())
+
+    assert handler.calls == [["a", "b", "c", "d"]]
+    assert results == [["plain:a", "plain:b"], ["plain:c"], ["plain:d"]]
+    stats = coalescer.stats()
+    assert stats["batches"] == 1
+    assert stats["requests"] == 3
+    assert stats["batch_size_counts"]["5"] == 1
+
+
+def test_invalid_request_does_not_fail_its_batch_neighbours() -> None:
+    handler = RecordingHandler()
+    coalescer = IngestCoalescer(handler, max_events=3, max_wait_ms=1000)
+
+    async def run() -> list[object]:
+        return await asyncio.gather(
+            coalescer.submit(["a"], "plain"),
+            coalescer.submit(["bad", "b"], "plain"),
+            coalescer.submit(["c", "d", "e"], "plain"),
+            return_exceptions=True,
+        )
+
+    ok, failed, bypassed = asyncio.run(run())
+
+    assert ok == ["plain:a"]
+    assert isinstance(failed, ValueError)
+    assert bypassed == ["plain:c", "plain:d", "plain:e"]
+    assert coalescer.stats()["bypassed"] == 1
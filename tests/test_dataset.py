@@ -0,0 +1,101 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from application.dataset import DatasetCache, EventColumns
+from application.features import FeatureExtractor
+from application.parsers import LogParser
+from domain.models import LogEvent
+from infrastructure.models.baseline import FrequencyBaselineDetector
+from infrastructure.models.isolation_forest import IsolationForestDetector
+
+
+def _events() -> list[LogEvent]:
+    base = datetime(2026, 1, 17, 23, 30, tzinfo=timezone.utc)
+    return [
+        LogEvent(
+            timestamp=base + timedelta(minutes=7 * index),
+            host=f"web-{index % 3}",
+            level="INFO" if index % 4 else "error",
+            message=f"GET /orders/{index} from 10.0.0.{index} took {index * 3}ms",
+            user="alice" if index % 2 else None,
+            request_id=f"req-{index}" if index % 5 else None,
+            attributes={"region": "eu"} if index % 3 else {},
+        )
+        for index in range(40)
+    ] + [
+        LogEvent(
+            timestamp=datetime(2026, 1, 18, 1, 5, tzinfo=timezone(timedelta(hours=-5))),
+            host="db-1",
+            level="WARNING",
+            message="",
+        )
+    ]
+
+
+def _write_jsonl(path, events: list[LogEvent]) -> None:
+    path.write_text(
+        "\n".join(json.dumps(event.model_dump(mode="json")) for event in events) + "\n",
+        encoding="utf-8",
+    )
+
+
+def test_column_features_match_event_features() -> None:
+    events = _events()
+    extractor = FeatureExtractor()
+    expected = extractor.transform(events)
+    actual = extractor.transform_columns(EventColumns.from_events(events))
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected)
+
+
+def test_detectors_score_columns_like_events() -> None:
+    events = _events()
+    columns = EventColumns.from_events(events)
+
+    baseline = FrequencyBaselineDetector()
+    baseline.train(events)
+    from_columns = FrequencyBaselineDetector()
+    from_columns.train_columns(columns)
+    assert from_columns.template_counts == baseline.template_counts
+    assert from_columns.score_columns(columns) == baseline.score(events)
+
+    forest = IsolationForestDetector(feature_extractor=FeatureExtractor())
+    forest.train_columns(columns)
+    np.testing.assert_allclose(forest.score_columns(columns), forest.score(events))
+
+
+def test_columns_round_trip_through_memory_mapped_files(tmp_path) -> None:
+    columns = EventColumns.from_events(_events())
+    columns.save(tmp_path / "columns")
+    loaded = EventColumns.load(tmp_path / "columns")
+    assert isinstance(loaded.timestamps, np.memmap)
+    assert loaded.messages == columns.messages
+    assert loaded.sources == columns.sources
+    np.testing.assert_array_equal(loaded.timestamps, columns.timestamps)
+    np.testing.assert_array_equal(loaded.has_ip, columns.has_ip)
+
+
+def test_cache_hits_until_source_or_parser_changes(tmp_path) -> None:
+    source = tmp_path / "train.jsonl"
+    events = _events()
+    _write_jsonl(source, events)
+    cache = DatasetCache(tmp_path / "cache")
+
+    first, hit = cache.load_or_build(source, "jsonl")
+    assert not hit and len(first) == len(events)
+    second, hit = cache.load_or_build(source, "jsonl")
+    assert hit
+    assert second.messages == first.messages
+
+    _, hit = cache.load_or_build(source, "jsonl", LogParser(plain_patterns=[r"(?P<message>.*)"]))
+    assert not hit
+
+    _write_jsonl(source, events[:10])
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed, hit = cache.load_or_build(source, "jsonl")
+    assert not hit and len(changed) == 10
+    assert len(list((tmp_path / "cache").glob("*/meta.json"))) == 1
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+from application.dedup import LineDeduplicator, split_iso_timestamp
+from application.parsers import LogParser
+from application.persistence import PersistencePolicy
+from domain.models import AnomalyResult
+
+LINE = '{{"timestamp":"2026-01-15T10:{minute:02d}:{second:02d}+00:00","host":"auth-svc","level":"INFO","message":"{message}"}}'
+
+
+def _line(minute: int, second: int = 0, message: str = "Cache hit") -> str:
+    return LINE.format(minute=minute, second=second, message=message)
+
+
+def test_split_iso_timestamp_removes_first_timestamp() -> None:
+    rest, timestamp = split_iso_timestamp("2026-01-15 10:00:00,250 INFO web-01 Cache hit")
+    assert rest == " INFO web-01 Cache hit"
+    assert timestamp == datetime(2026, 1, 15, 10, 0, 0, 250000, tzinfo=timezone.utc)
+    assert split_iso_timestamp("no timestamp") == ("no timestamp", None)
+
+
+def test_collapse_groups_repeats_within_window() -> None:
+    deduplicator = LineDeduplicator(window_seconds=60.0)
+    lines = [
+        _line(0, 0),
+        _line(0, 10, "Session refreshed"),
+        "",
+        _line(0, 30),
+        _line(0, 59),
+        _line(2, 0),
+        _line(2, 5),
+    ]
+    collapsed = deduplicator.collapse(lines)
+
+    assert collapsed.lines == [lines[0], lines[1], lines[5]]
+    assert collapsed.counts == [3, 1, 2]
+    assert collapsed.positions == [0, 1, 0, 0, 2, 2]
+    assert collapsed.last_timestamps[0] == datetime(2026, 1, 15, 10, 0, 59, tzinfo=timezone.utc)
+    assert deduplicator.stats()["collapsed"] == 3
+
+    events = LogParser().parse_lines(collapsed.lines, "jsonl")
+    results = [
+        AnomalyResult(event=event, score=0.1, is_anomaly=False, model_version="v1")
+        for event in events
+    ]
+    expanded = collapsed.apply(results)
+    assert len(expanded) == 6
+    assert expanded[2] is results[0]
+    assert results[0].event.repeat_count == 3
+    assert results[0].event.last_timestamp == collapsed.last_timestamps[0]
+    assert results[1].event.repeat_count == 1
+    assert results[1].event.last_timestamp is None
+
+
+def test_collapse_stops_tracking_new_keys_at_limit() -> None:
+    deduplicator = LineDeduplicator(window_seconds=60.0, max_keys=2)
+    lines = [_line(0, 0, f"message {index % 3}") for index in range(9)]
+    collapsed = deduplicator.collapse(lines)
+
+    assert collapsed.counts[:2] == [3, 3]
+    assert len(collapsed.lines) == 5
+    assert sum(collapsed.counts) == 9
+
+
+def test_collapse_carries_groups_across_batches() -> None:
+    deduplicator = LineDeduplicator(window_seconds=60.0, max_keys=2)
+    first = deduplicator.collapse([_line(0, 0), _line(0, 5)])
+    second = deduplicator.collapse([_line(0, 30), _line(0, 40), _line(1, 10)])
+
+    assert first.continues == [False]
+    assert second.lines == [_line(0, 30), _line(1, 10)]
+    assert second.counts == [2, 1]
+    assert second.continues == [True, False]
+
+    events = LogParser().parse_lines(second.lines, "jsonl")
+    results = [
+        AnomalyResult(event=event, score=0.1, is_anomaly=True, model_version="v1")
+        for event in events
+    ]
+    second.apply(results)
+    PersistencePolicy().apply(results)
+    assert [result.weight for result in results] == [0.0, 1.0]
+    assert results[0].event.repeat_count == 2
+
+    deduplicator.collapse([_line(1, 20, "Session refreshed"), _line(1, 30, "Token issued")])
+    assert deduplicator.stats()["tracked_keys"] == 2
+    assert deduplicator.collapse([_line(1, 15)]).continues == [False]
@@ -0,0 +1,65 @@
+import json
+import threading
+from datetime import datetime, timezone
+
+from application import training
+from domain.models import LogEvent
+from infrastructure.files import FileLock, atomic_write_json
+from infrastructure.registry import ModelRegistry
+
+
+def test_atomic_write_json_replaces_file_without_leftovers(tmp_path) -> None:
+    target = tmp_path / "latest.json"
+    atomic_write_json(target, {"version": "1"})
+    atomic_write_json(target, {"version": "2"})
+
+    assert json.loads(target.read_text(encoding="utf-8")) == {"version": "2"}
+    assert [path.name for path in tmp_path.iterdir()] == ["latest.json"]
+    assert target.stat().st_mode & 0o777 == 0o644
+
+
+def test_file_lock_excludes_second_holder(tmp_path) -> None:
+    first = FileLock(tmp_path / "train.lock")
+    second = FileLock(tmp_path / "train.lock")
+
+    assert first.acquire()
+    assert not second.acquire(blocking=False)
+    first.release()
+    assert second.acquire(blocking=False)
+    second.release()
+
+
+def test_concurrent_bootstrap_trains_once(tmp_path, monkeypatch) -> None:
+    log_path = tmp_path / "normal.jsonl"
+    event = LogEvent(
+        timestamp=datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc),
+        host="auth-svc",
+        level="INFO",
+        message="User login succeeded",
+    )
+    log_path.write_text(event.model_dump_json() + "\n", encoding="utf-8")
+    registry = ModelRegistry(str(tmp_path / "artifacts"))
+    calls = []
+    original = training.train_model
+
+    def counting_train_model(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(training, "train_model", counting_train_model)
+    outcomes = []
+    workers = [
+        threading.Thread(
+            target=lambda: outcomes.append(
+                training.bootstrap_model(registry, log_path, "jsonl", "baseline")
+            )
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert outcomes == [True] * 4
+    assert len(calls) == 1
@@ -0,0 +1,92 @@
+import bz2
+import gzip
+import json
+import lzma
+from pathlib import Path
+
+import pytest
+
+from application.ingestion import (
+    LineDecoder,
+    LogIngestor,
+    detect_compression,
+    iter_lines,
+)
+from application.parsers import LogParser
+
+
+def test_line_decoder_joins_lines_split_across_chunks() -> None:
+    decoder = LineDecoder()
+    assert decoder.feed(b'{"a": 1}\n{"b"') == ['{"a": 1}']
+    assert decoder.feed(b": 2}\n") == ['{"b": 2}']
+    assert decoder.feed(b"tail") == []
+    assert decoder.close() == ["tail"]
+
+
+def test_line_decoder_inflates_multi_member_gzip() -> None:
+    body = gzip.compress(b"one\ntwo\n") + gzip.compress(b"three\n")
+    decoder = LineDecoder(compression="gzip")
+    lines = []
+    for offset in range(0, len(body), 7):
+        lines.extend(decoder.feed(body[offset : offset + 7]))
+    lines.extend(decoder.close())
+    assert lines == ["one", "two", "three"]
+
+
+def test_line_decoder_rejects_truncated_gzip_and_long_lines() -> None:
+    decoder = LineDecoder(compression="gzip")
+    decoder.feed(gzip.compress(b"one\ntwo\n")[:-6])
+    with pytest.raises(ValueError):
+        decoder.close()
+    with pytest.raises(ValueError):
+        LineDecoder(max_line_bytes=4).feed(b"too long")
+
+
+@pytest.mark.parametrize(
+    ("compress", "compression"),
+    [(gzip.compress, "gzip"), (bz2.compress, "bz2"), (lzma.compress, "xz"), (None, None)],
+)
+def test_iter_lines_detects_compression_by_magic_bytes(
+    tmp_path: Path, compress, compression
+) -> None:
+    lines = [
+        json.dumps(
+            {
+                "timestamp": "2024-01-01T00:00:00Z",
+                "level": "INFO",
+                "host": "a",
+                "message": f"line {index}",
+            }
+        )
+        for index in range(5000)
+    ]
+    body = ("\r\n".join(lines) + "\n").encode("utf-8")
+    path = tmp_path / "app.log"
+    path.write_bytes(compress(body) if compress else body)
+    assert detect_compression(path) == compression
+    assert list(iter_lines(path)) == lines
+    assert list(iter_lines(path, prefetch=not compression)) == lines
+    events = LogIngestor(LogParser()).ingest_file(path, "jsonl")
+    assert [event.message for event in events] == [f"line {index}" for index in range(5000)]
+
+
+def test_iter_lines_reports_corrupt_and_unsupported_input(tmp_path: Path) -> None:
+    truncated = tmp_path / "truncated.gz"
+    truncated.write_bytes(gzip.compress(b"one\ntwo\n" * 1000)[:-20])
+    with pytest.raises(EOFError):
+        list(iter_lines(truncated))
+    zstd = tmp_path / "app.log.zst"
+    zstd.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 16)
+    assert detect_compression(zstd) == "zstd"
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        with pytest.raises(ValueError, match="zstandard"):
+            list(iter_lines(zstd))
+
+
+def test_iter_lines_reads_zstd_when_available(tmp_path: Path) -> None:
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "app.log"
+    path.write_bytes(zstandard.ZstdCompressor().compress(b"one\ntwo\n"))
+    assert list(iter_lines(path)) == ["one", "two"]
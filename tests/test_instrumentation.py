@@ -0,0 +1,41 @@
+from infrastructure.instrumentation import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_prometheus_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stage time.", (0.01, 0.1), ("stage",))
+    counter = registry.counter("stage_events_total", "Stage events.", ("stage",))
+
+    histogram.observe(0.005, stage="parse")
+    histogram.observe(0.05, stage="parse")
+    histogram.observe(3.0, stage="parse")
+    counter.inc(42, stage="parse")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE stage_seconds histogram" in lines
+    assert 'stage_seconds_bucket{stage="parse",le="0.01"} 1' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="0.1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="parse"} 3' in lines
+    assert 'stage_events_total{stage="parse"} 42' in lines
+
+
+def test_render_labels_worker_and_merges_peer_snapshots() -> None:
+    registry = MetricsRegistry()
+    registry.counter("ingest_shed_total", "Shed requests.", ("reason",)).inc(reason="quota")
+    registry.gauge("queue_depth", "Queue depth.")
+    peer = {"ingest_shed_total": ['ingest_shed_total{reason="quota",worker="1"} 7']}
+
+    lines = registry.render({"worker": "0"}, [peer]).splitlines()
+
+    assert lines.count("# TYPE ingest_shed_total counter") == 1
+    shed = lines.index("# TYPE ingest_shed_total counter")
+    assert lines[shed + 1 : shed + 3] == [
+        'ingest_shed_total{reason="quota",worker="0"} 1',
+        'ingest_shed_total{reason="quota",worker="1"} 7',
+    ]
+    assert registry.snapshot({"worker": "0"}) == {
+        "ingest_shed_total": ['ingest_shed_total{reason="quota",worker="0"} 1'],
+        "queue_depth": [],
+    }
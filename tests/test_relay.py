@@ -0,0 +1,42 @@
+import queue
+import threading
+
+from infrastructure.relay import RelayClient, RelayHub
+
+
+def test_hub_fans_messages_out_to_every_other_worker() -> None:
+    hub = RelayHub()
+    inboxes: list[queue.Queue] = [queue.Queue() for _ in range(3)]
+    clients = [RelayClient(hub.attach(slot)) for slot in range(3)]
+    for client, inbox in zip(clients, inboxes, strict=True):
+        client.start(inbox.put)
+    stop = threading.Event()
+
+    def poll() -> None:
+        while not stop.is_set():
+            hub.poll(0.05)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    try:
+        clients[0].send({"type": "anomalies", "items": ["x" * 200_000]})
+        clients[2].send({"type": "metrics", "events": 3})
+        received = sorted(
+            (inboxes[1].get(timeout=5) for _ in range(2)), key=lambda message: message["type"]
+        )
+        assert [message["type"] for message in received] == ["anomalies", "metrics"]
+        assert received[1] == {"type": "metrics", "events": 3}
+        assert len(inboxes[2].get(timeout=5)["items"][0]) == 200_000
+        assert inboxes[0].get(timeout=5) == {"type": "metrics", "events": 3}
+
+        hub.detach(1)
+        clients[0].send({"type": "metrics", "events": 1})
+        assert inboxes[2].get(timeout=5) == {"type": "metrics", "events": 1}
+        assert inboxes[0].empty() and inboxes[1].empty()
+    finally:
+        stop.set()
+        poller.join()
+        for client in clients:
+            client.close()
+        hub.close()
+    assert hub.relayed == 3
@@ -0,0 +1,132 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from application import jobs as jobs_module
+from application.features import FeatureExtractor
+from application.jobs import RetrainJob
+from application.parsers import LogParser
+from application.services import AnomalyService
+from application.training import retrain_from_storage, train_model, weighted_reservoir
+from domain.models import AnomalyResult, LogEvent
+from infrastructure.files import atomic_write_json
+from infrastructure.registry import ModelRegistry
+from infrastructure.settings import Settings
+from infrastructure.storage import Storage
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _result(minutes_ago: int, message: str, is_anomaly: bool = False) -> AnomalyResult:
+    event = LogEvent(
+        timestamp=NOW - timedelta(minutes=minutes_ago),
+        host="auth-svc",
+        level="INFO",
+        message=message,
+    )
+    return AnomalyResult(event=event, score=0.1, is_anomaly=is_anomaly, model_version="v1")
+
+
+def test_weighted_reservoir_respects_weights_and_size() -> None:
+    rng = random.Random(3)
+    picks = [weighted_reservoir([("a", 1.0), ("b", 3.0)], 1, rng)[0] for _ in range(2000)]
+    assert 0.7 < picks.count("b") / len(picks) < 0.8
+
+    items = [(index, 0.0 if index % 2 else 1.0) for index in range(100)]
+    sample = weighted_reservoir(items, 10, rng)
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert all(index % 2 == 0 for index in sample)
+
+
+def test_normal_records_stream_in_pages(tmp_path) -> None:
+    storage = Storage(f"sqlite:///{tmp_path}/records.db")
+    storage.init_db()
+    results = [_result(minutes, f"Request completed in {minutes} ms") for minutes in range(7)]
+    results.append(_result(3, "Privilege escalation attempt", is_anomaly=True))
+    results.append(_result(60 * 24 * 30, "Request completed in 1 ms"))
+    storage.save_results(results)
+
+    rows = list(storage.iter_normal_records(since=NOW - timedelta(days=7), page_size=3))
+
+    events = storage.load_events(row.id for row in rows)
+    assert [event.message for event in events] == [
+        f"Request completed in {minutes} ms" for minutes in range(6, -1, -1)
+    ]
+    assert events[0].timestamp == NOW - timedelta(minutes=6)
+
+
+def test_retrain_job_registers_model_and_reloads_service(tmp_path) -> None:
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path}/retrain.db",
+        artifact_dir=str(tmp_path / "artifacts"),
+        model_type="baseline",
+        retrain_window_days=365 * 100,
+        retrain_min_events=20,
+    )
+    storage = Storage(settings.database_url, settings)
+    storage.init_db()
+    registry = ModelRegistry(settings.artifact_dir)
+    train_model([_result(0, "Cache hit").event], "baseline", registry, FeatureExtractor())
+    service = AnomalyService(settings, LogParser(), FeatureExtractor(), registry, storage)
+    original = service.model_version
+
+    storage.save_results([_result(minutes, "Session refreshed") for minutes in range(10)])
+    job = RetrainJob(settings, 0.0, on_model_changed=service.reload_model, isolated=False)
+    job.run_once()
+    assert job.last_metadata is None
+    assert service.model_version == original
+
+    storage.save_results([_result(minutes, "Token validated") for minutes in range(30)])
+    job.run_once()
+    assert job.last_metadata is not None
+    assert service.model_version == job.last_metadata["version"] != original
+    assert not service.reload_model()
+
+    metadata = retrain_from_storage(
+        storage, registry, "baseline", window_days=1, max_events=5, now=NOW, seed=1
+    )
+    assert metadata["version"] not in {original, job.last_metadata["version"]}
+
+
+def test_jobs_sharing_a_registry_retrain_once_per_interval(tmp_path) -> None:
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path}/shared.db",
+        artifact_dir=str(tmp_path / "artifacts"),
+        model_type="baseline",
+        retrain_window_days=365 * 100,
+        retrain_min_events=20,
+    )
+    storage = Storage(settings.database_url, settings)
+    storage.init_db()
+    storage.save_results([_result(minutes, "Token validated") for minutes in range(30)])
+    registry = ModelRegistry(settings.artifact_dir)
+    train_model([_result(0, "Cache hit").event], "baseline", registry, FeatureExtractor())
+    metadata = registry.latest_metadata()
+    metadata["trained_at"] = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+    atomic_write_json(registry.base_path / "latest.json", metadata)
+
+    jobs = [RetrainJob(settings, 3600.0, isolated=False) for _ in range(2)]
+    for job in jobs:
+        job.run_once()
+
+    assert jobs[0].last_metadata is not None
+    assert jobs[1].last_metadata is None
+    assert registry.latest_metadata()["version"] == jobs[0].last_metadata["version"]
+    assert len([path for path in registry.base_path.iterdir() if path.is_dir()]) == 2
+
+
+def test_retrain_job_passes_its_seed_to_every_run(tmp_path, monkeypatch) -> None:
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path}/seeded.db", artifact_dir=str(tmp_path / "artifacts")
+    )
+    seeds: list[int | None] = []
+
+    def fake_retrain(*args, seed=None, **kwargs):
+        seeds.append(seed)
+        return None
+
+    monkeypatch.setattr(jobs_module, "retrain_from_storage", fake_retrain)
+    job = RetrainJob(settings, 0.0, isolated=False, seed=11)
+    job.run_once()
+    job.run_once()
+    assert seeds == [11, 11]
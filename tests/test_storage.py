@@ -0,0 +1,321 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from application.persistence import PersistencePolicy
+from application.templates import (
+    extract_template,
+    pack_params,
+    render_template,
+    template_id,
+    unpack_params,
+)
+from domain.models import AnomalyQuery, AnomalyResult, LogEvent
+from infrastructure.settings import Settings
+from infrastructure.storage import (
+    Base,
+    LogRecord,
+    LogRollup,
+    MessageTemplate,
+    Storage,
+    TemplateCache,
+    encode_cursor,
+)
+
+
+def _result(timestamp: datetime, score: float = 0.1, is_anomaly: bool = False) -> AnomalyResult:
+    event = LogEvent(
+        timestamp=timestamp,
+        host="auth-svc",
+        level="INFO",
+        message="User login succeeded",
+    )
+    return AnomalyResult(event=event, score=score, is_anomaly=is_anomaly, model_version="v1")
+
+
+def _storage(tmp_path) -> Storage:
+    storage = Storage(f"sqlite:///{tmp_path}/storage.db")
+    storage.init_db()
+    return storage
+
+
+def test_compact_expired_rolls_up_and_drops_raw_rows(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    now = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+    old = now - timedelta(days=30)
+    storage.save_results(
+        [
+            _result(old),
+            _result(old + timedelta(seconds=20)),
+            _result(old + timedelta(seconds=40), score=0.9, is_anomaly=True),
+            _result(now),
+        ]
+    )
+    before = storage.metrics()
+
+    compacted = storage.compact_expired(retention_days=7, now=now)
+
+    assert compacted == 3
+    with Session(storage.engine) as session:
+        assert session.execute(select(func.count(LogRecord.id))).scalar_one() == 1
+        rollup = session.execute(select(LogRollup).order_by(LogRollup.minute)).scalars().first()
+    assert rollup.event_count == 3
+    assert rollup.anomaly_count == 1
+    assert rollup.score_max == 0.9
+    after = storage.metrics()
+    assert after["total_events"] == before["total_events"] == 4
+    assert after["anomalies"] == before["anomalies"] == 1
+
+
+def test_metrics_prunes_by_time_range(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    day = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    storage.save_results([_result(day), _result(day + timedelta(days=1), 0.9, True)])
+
+    metrics = storage.metrics(since=day + timedelta(hours=12))
+
+    assert metrics["total_events"] == 1
+    assert metrics["anomalies"] == 1
+
+
+def test_anomaly_pages_follow_keyset_cursor(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    day = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    scores = [0.9, 0.8, 0.8, 0.7, 0.6]
+    storage.save_results(
+        [_result(day + timedelta(minutes=i), s, True) for i, s in enumerate(scores)]
+        + [_result(day, 0.1)]
+    )
+
+    seen: list[float] = []
+    cursor = None
+    while True:
+        page = storage.get_anomalies(AnomalyQuery(limit=2, cursor=cursor))
+        if not page:
+            break
+        seen.extend(item["anomaly_score"] for item in page)
+        cursor = encode_cursor(page[-1], "score")
+
+    assert seen == scores
+
+
+def test_anomaly_filters_and_time_order(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    day = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    storage.save_results([_result(day + timedelta(minutes=i), 0.9, True) for i in range(3)])
+
+    items = storage.get_anomalies(
+        AnomalyQuery(order="time", since=day + timedelta(minutes=1), host="auth-svc")
+    )
+    assert [item["timestamp"][:16] for item in items] == ["2026-03-10T00:02", "2026-03-10T00:01"]
+    assert storage.get_anomalies(AnomalyQuery(host="web-01")) == []
+    with pytest.raises(ValueError):
+        storage.get_anomalies(AnomalyQuery(order="time", cursor=encode_cursor(items[0], "score")))
+
+
+def test_sampled_normals_keep_metrics_exact(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    day = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    results = [_result(day + timedelta(seconds=i)) for i in range(200)]
+    results.append(_result(day, 0.9, True))
+    policy = PersistencePolicy(normal_sample_rate=0.1, seed=7)
+
+    storage.save_results(policy.apply(results))
+
+    with Session(storage.engine) as session:
+        stored = session.execute(select(func.count(LogRecord.id))).scalar_one()
+        weights = session.execute(
+            select(func.sum(LogRecord.weight)).where(LogRecord.is_anomaly.is_(False))
+        ).scalar_one()
+    assert stored < 60
+    assert weights == pytest.approx(10.0 * (stored - 1))
+    metrics = storage.metrics()
+    assert metrics["total_events"] == 201
+    assert metrics["anomalies"] == 1
+
+
+def test_repeat_counts_keep_metrics_exact(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    minute = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+    repeated = _result(minute, 0.9, True)
+    repeated.event.repeat_count = 40
+    repeated.event.last_timestamp = minute + timedelta(seconds=50)
+    storage.save_results([repeated, _result(minute)])
+
+    with Session(storage.engine) as session:
+        assert session.execute(select(func.count(LogRecord.id))).scalar_one() == 2
+    metrics = storage.metrics()
+    assert metrics["total_events"] == 41
+    assert metrics["anomalies"] == 40
+    point = storage.timeseries()[0]
+    assert point["events"] == 41
+    (stored,) = storage.get_anomalies()
+    assert stored["repeat_count"] == 40
+    assert stored["last_timestamp"].startswith("2026-03-10T12:00:50")
+
+
+def test_messages_are_stored_as_templates_and_rebuilt(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    day = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    messages = [
+        "Connection from 10.0.0.12 closed after 35 ms",
+        "Connection from 10.0.0.99 closed after 1200 ms",
+        "Literal <*> marker",
+    ]
+    results = [_result(day + timedelta(seconds=i), 0.9, True) for i in range(len(messages))]
+    for result, message in zip(results, messages, strict=True):
+        result.event.message = message
+    storage.save_results(results)
+
+    with Session(storage.engine) as session:
+        assert session.execute(select(func.count(MessageTemplate.id))).scalar_one() == 1
+        raw = session.execute(select(LogRecord.message).order_by(LogRecord.id)).scalars().all()
+    assert raw == [None, None, "Literal <*> marker"]
+    reader = Storage(storage.engine.url.render_as_string())
+    reader._templates = TemplateCache(max_entries=1)
+    reader._templates.put(template_id("Unrelated <*>"), "Unrelated <*>")
+    items = reader.get_anomalies(AnomalyQuery(order="time"))
+    assert sorted(item["message"] for item in items) == sorted(messages)
+    assert len(reader._templates) == 1
+
+
+def test_templates_round_trip_non_ascii_digits() -> None:
+    for message in (
+        "user \u0661\u0662\u0663 failed",
+        "port \uff18\uff10\uff18\uff10 open",
+        "host \u0661.\u0662.\u0663.\u0664 took 12 ms",
+    ):
+        template, params = extract_template(message)
+        assert render_template(template, unpack_params(pack_params(params))) == message
+    assert unpack_params(pack_params(["\u0661\u0662", "\u0661.\u0662.\u0663.\u0664"])) == [
+        "\u0661\u0662",
+        "\u0661.\u0662.\u0663.\u0664",
+    ]
+
+
+def test_migrate_templates_rewrites_existing_rows(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    legacy_id = template_id("Disk <*> full")
+    with Session(storage.engine) as session:
+        session.add(MessageTemplate(id=legacy_id, template="Disk <*> full"))
+        for minute, message, tid, params in (
+            (0, "Worker 17 crashed", None, None),
+            (1, "", legacy_id, ["sda1"]),
+        ):
+            session.add(
+                LogRecord(
+                    timestamp=datetime(2026, 3, 10, 0, minute, tzinfo=timezone.utc),
+                    level="ERROR",
+                    message=message,
+                    template_id=tid,
+                    params=params,
+                    host="core-db",
+                    anomaly_score=0.9,
+                    is_anomaly=True,
+                    model_version="v1",
+                )
+            )
+        session.commit()
+
+    assert storage.migrate_templates() == 1
+    assert storage.migrate_templates() == 0
+    with Session(storage.engine) as session:
+        records = session.execute(select(LogRecord).order_by(LogRecord.id)).scalars().all()
+    assert [record.message for record in records] == [None, ""]
+    assert [record.params for record in records] == [None, None]
+    assert [unpack_params(record.packed_params) for record in records] == [["17"], ["sda1"]]
+    messages = [item["message"] for item in storage.get_anomalies(AnomalyQuery(order="time"))]
+    assert messages == ["Disk sda1 full", "Worker 17 crashed"]
+
+
+def test_timeseries_reads_incremental_rollups(tmp_path) -> None:
+    storage = _storage(tmp_path)
+    minute = datetime(2026, 3, 10, 9, 30, tzinfo=timezone.utc)
+    storage.save_results([_result(minute), _result(minute + timedelta(seconds=30), 0.7, True)])
+    storage.save_results([_result(minute + timedelta(minutes=1), 0.3)])
+
+    items = storage.timeseries()
+
+    assert [item["minute"] for item in items] == [
+        "2026-03-10T09:30:00+00:00",
+        "2026-03-10T09:31:00+00:00",
+    ]
+    assert items[0]["events"] == 2
+    assert items[0]["anomalies"] == 1
+    assert items[0]["score_max"] == 0.7
+    assert items[0]["score_avg"] == pytest.approx(0.4)
+    assert storage.timeseries(limit=1)[0]["events"] == 1
+    assert storage.timeseries(source="web-01") == []
+
+
+def test_init_db_backfills_rollups_from_existing_records(tmp_path) -> None:
+    storage = Storage(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(storage.engine)
+    minute = datetime(2026, 3, 10, 9, 30, tzinfo=timezone.utc)
+    rows = (
+        (minute, "web-01", None, 0.2, False, 4.0, 2),
+        (minute + timedelta(seconds=20), "web-01", None, 0.9, True, 1.0, 1),
+        (minute + timedelta(minutes=1), None, "billing", 0.4, False, 1.0, 1),
+    )
+    with Session(storage.engine) as session:
+        for timestamp, host, service, score, is_anomaly, weight, repeat_count in rows:
+            session.add(
+                LogRecord(
+                    timestamp=timestamp,
+                    level="INFO",
+                    message="GET /health",
+                    host=host,
+                    service=service,
+                    anomaly_score=score,
+                    is_anomaly=is_anomaly,
+                    model_version="v1",
+                    weight=weight,
+                    repeat_count=repeat_count,
+                )
+            )
+        session.commit()
+
+    storage.init_db()
+    storage.init_db()
+
+    metrics = storage.metrics()
+    assert metrics["total_events"] == 10
+    assert metrics["anomalies"] == 1
+    items = storage.timeseries()
+    assert [item["events"] for item in items] == [9, 1]
+    assert items[0]["score_max"] == 0.9
+    assert items[0]["score_avg"] == pytest.approx((0.2 * 8 + 0.9) / 9)
+    assert [item["events"] for item in storage.timeseries(source="billing")] == [1]
+
+
+def test_partition_creation_tolerates_concurrent_creators(tmp_path, monkeypatch) -> None:
+    import infrastructure.storage as storage_module
+
+    storage = _storage(tmp_path)
+    storage.partitioned = True
+    day = datetime(2026, 1, 15, tzinfo=timezone.utc)
+    created: list[str] = []
+
+    def racing_ddl(partition_day: datetime) -> str:
+        created.append(storage_module._partition_name(partition_day))
+        return f"CREATE TABLE {created[-1]} (id INTEGER)"
+
+    monkeypatch.setattr(storage_module, "_partition_ddl", racing_ddl)
+    with storage.engine.begin() as conn:
+        conn.exec_driver_sql(f"CREATE TABLE {storage_module._partition_name(day)} (id INTEGER)")
+    storage.save_results([_result(day + timedelta(hours=1)), _result(day + timedelta(hours=2))])
+
+    assert created == ["log_records_p20260115"]
+    assert day in storage._partition_days
+    with Session(storage.engine) as session:
+        assert session.execute(select(func.count(LogRecord.id))).scalar_one() == 2
+
+
+def test_sqlite_connections_use_wal_and_busy_timeout(tmp_path) -> None:
+    storage = Storage(f"sqlite:///{tmp_path}/pragmas.db", Settings(sqlite_busy_timeout_ms=5000))
+    with storage.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
@@ -0,0 +1,111 @@
+import csv
+from datetime import datetime, timezone
+
+import numpy as np
+
+from application.parsers import LogParser
+from application.synthetic import (
+    Burst,
+    NewTemplate,
+    SyntheticTraffic,
+    TrafficProfile,
+    write_traffic,
+)
+
+START = datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+
+def _profile() -> TrafficProfile:
+    return TrafficProfile(
+        events_per_second=20.0,
+        anomaly_ratio=0.01,
+        bursts=[
+            Burst(offset_seconds=600, duration_seconds=60, events_per_second=50, host="edge-gw")
+        ],
+        new_templates=[NewTemplate(offset_seconds=900, message="Schema v42 applied", share=0.1)],
+    )
+
+
+def test_traffic_is_deterministic_sorted_and_chunked() -> None:
+    first = list(SyntheticTraffic(_profile(), START, seed=5).chunks(5000, chunk_size=1000))
+    second = list(SyntheticTraffic(_profile(), START, seed=5).chunks(5000, chunk_size=1000))
+    assert sum(len(chunk) for chunk in first) == 5000
+    assert [chunk.start for chunk in first] == np.cumsum(
+        [0] + [len(c) for c in first[:-1]]
+    ).tolist()
+    timestamps = np.concatenate([chunk.timestamps for chunk in first])
+    assert np.all(np.diff(timestamps) >= 0)
+    np.testing.assert_array_equal(timestamps, np.concatenate([c.timestamps for c in second]))
+
+
+def test_diurnal_cycle_and_host_skew_shape_rates() -> None:
+    profile = TrafficProfile(events_per_second=2.0, diurnal_amplitude=0.8, peak_hour=12)
+    traffic = SyntheticTraffic(profile, START, seed=1)
+    chunks = list(traffic.chunks(170_000, chunk_size=50_000))
+    hours = np.concatenate([(chunk.timestamps // 3_600_000) % 24 for chunk in chunks])
+    counts = np.bincount(hours, minlength=24)
+    assert counts[12] > 4 * counts[0]
+    hosts = np.bincount(np.concatenate([chunk.hosts for chunk in chunks]))
+    assert list(hosts) == sorted(hosts, reverse=True)
+
+
+def test_bursts_and_new_templates_land_at_their_offsets() -> None:
+    traffic = SyntheticTraffic(_profile(), START, seed=2)
+    chunks = list(traffic.chunks(40_000))
+    start_ms = int(START.timestamp() * 1000)
+    seconds = (np.concatenate([chunk.timestamps for chunk in chunks]) - start_ms) / 1000
+    labels = np.concatenate([chunk.labels for chunk in chunks])
+    burst = seconds[labels == 2]
+    assert 2500 < len(burst) < 3500
+    assert burst.min() >= 600 and burst.max() <= 660
+    novel = seconds[labels == 3]
+    assert len(novel) and novel.min() >= 900
+    assert np.count_nonzero(labels == 1)
+
+
+def test_burst_counts_do_not_depend_on_chunk_size() -> None:
+    profile = TrafficProfile(
+        events_per_second=20.0,
+        bursts=[Burst(offset_seconds=900, duration_seconds=60, events_per_second=50)],
+    )
+    for chunk_size in (1_000, 7_000, 40_000):
+        traffic = SyntheticTraffic(profile, START, seed=4)
+        chunks = []
+        for _ in range(2):
+            batch = list(traffic.chunks(20_000, chunk_size))
+            assert [len(chunk) for chunk in batch[:-1]] == [chunk_size] * (len(batch) - 1)
+            assert sum(len(chunk) for chunk in batch) == 20_000
+            chunks += batch
+        timestamps = np.concatenate([chunk.timestamps for chunk in chunks])
+        assert np.all(np.diff(timestamps) >= 0)
+        bursts = sum(int(np.count_nonzero(chunk.labels == 2)) for chunk in chunks)
+        assert 2800 < bursts < 3200
+
+
+def test_written_lines_parse_and_match_label_sidecar(tmp_path) -> None:
+    parser = LogParser()
+    for fmt in ("jsonl", "plain"):
+        output = tmp_path / f"traffic.{fmt}"
+        labels_path = tmp_path / f"labels.{fmt}.csv"
+        profile = TrafficProfile(
+            events_per_second=20.0,
+            anomaly_ratio=0.01,
+            bursts=[Burst(30, 20, 50, host="edge-gw")],
+            new_templates=[NewTemplate(10, "Schema v42 applied", 0.1)],
+        )
+        traffic = SyntheticTraffic(profile, START, seed=9)
+        counts = write_traffic(traffic, 3000, output, fmt, labels_path, chunk_size=700)
+
+        events = parser.parse_lines(output.read_text(encoding="utf-8").splitlines(), fmt)
+        assert len(events) == sum(counts.values()) == 3000
+        with open(labels_path, newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        assert len(rows) == 3000 - counts["normal"]
+        for row in rows:
+            event = events[int(row["line"])]
+            if row["label"] == "burst":
+                assert event.message.startswith("Multiple failed logins detected")
+                assert event.host == "edge-gw"
+            elif row["label"] == "new_template":
+                assert event.message.startswith("Schema v42 applied")
+        assert counts["burst"] > 0
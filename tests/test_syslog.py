@@ -0,0 +1,133 @@
+import asyncio
+import socket
+from datetime import datetime, timezone
+
+from application.dedup import LineDeduplicator
+from application.syslog import (
+    SyslogFrameDecoder,
+    SyslogSource,
+    _parse_items,
+    _split_keyed_frame,
+    parse_syslog,
+)
+
+
+def test_parse_rfc5424_and_rfc3164_headers() -> None:
+    received = datetime(2026, 1, 2, 0, 0, tzinfo=timezone.utc)
+    modern = parse_syslog(
+        '<34>1 2026-01-15T10:01:00.003Z auth-svc sshd 4123 ID47 [origin ip="10.0.0.1"] Failed password',
+        received_at=received,
+    )
+    legacy = parse_syslog(
+        "<13>Dec 31 23:59:59 edge-gw cron[99]: job finished", received_at=received
+    )
+    bare = parse_syslog("no header at all", peer="10.0.0.9", received_at=received)
+
+    assert modern.level == "CRITICAL"
+    assert modern.host == "auth-svc"
+    assert modern.service == "sshd"
+    assert modern.message == "Failed password"
+    assert modern.timestamp == datetime(2026, 1, 15, 10, 1, 0, 3000, tzinfo=timezone.utc)
+    assert modern.attributes["msgid"] == "ID47"
+    assert legacy.level == "NOTICE"
+    assert legacy.service == "cron"
+    assert legacy.attributes == {"facility": "1", "procid": "99"}
+    assert legacy.timestamp.year == 2025
+    assert bare.host == "10.0.0.9"
+    assert bare.message == "no header at all"
+
+
+def test_severity_zero_is_emergency_and_invalid_frames_are_skipped() -> None:
+    received_at = datetime(2026, 1, 15, 10, 5, tzinfo=timezone.utc)
+    assert parse_syslog("<0>kernel panic", peer="10.0.0.1").level == "EMERGENCY"
+    assert parse_syslog("<1>disk failing", peer="10.0.0.1").level == "ALERT"
+    assert parse_syslog("<10>raid degraded", peer="10.0.0.1").level == "CRITICAL"
+
+    frames = [
+        (b"<11>Jan 15 10:00:00 host-a sshd: Failed password", "10.0.0.1", received_at),
+        (b"<11>1 - - - - - - no host or app", None, received_at),
+        (b"<14>Jan 15 10:00:01 host-b cron: job finished", "10.0.0.2", received_at),
+    ]
+    assert [event.host for event in _parse_items(frames)] == ["host-a", "host-b"]
+    deduplicator = LineDeduplicator(window_seconds=60.0, splitter=_split_keyed_frame)
+    assert len(_parse_items(frames, deduplicator)) == 2
+
+
+def test_frame_decoder_handles_octet_counting_and_newlines() -> None:
+    decoder = SyslogFrameDecoder()
+
+    assert decoder.feed(b"11 <13>hello a") == [b"<13>hello a"]
+    assert decoder.feed(b"<13>second\n<13>thi") == [b"<13>second"]
+    assert decoder.feed(b"rd\n6 <13>x") == [b"<13>third"]
+    assert decoder.feed(b"y") == [b"<13>xy"]
+
+
+def test_source_receives_udp_and_tcp_on_localhost() -> None:
+    async def run() -> tuple[list, dict]:
+        source = SyslogSource(udp_port=0, tcp_port=0, batch_size=3, batch_interval=1.0)
+        await source.start()
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp.sendto(b"<14>Jan 15 10:00:00 host-a app: over udp", ("127.0.0.1", source.udp_port))
+        udp.close()
+        _, writer = await asyncio.open_connection("127.0.0.1", source.tcp_port)
+        framed = b"<14>1 - host-b app - - - octet counted"
+        writer.write(b"%d " % len(framed) + framed + b"<14>Jan 15 10:00:01 host-c app: newline\n")
+        await writer.drain()
+        writer.close()
+        batch = await source.next_batch()
+        await source.close()
+        return batch, source.stats()
+
+    batch, stats = asyncio.run(run())
+
+    assert sorted(event.host for event in batch) == ["host-a", "host-b", "host-c"]
+    assert stats["received"] == 3
+    assert stats["dropped"] == 0
+
+
+def test_full_queue_drops_udp_datagrams() -> None:
+    async def run() -> dict:
+        source = SyslogSource(udp_port=0, tcp_port=None, queue_size=1)
+        await source.start()
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for _ in range(3):
+            udp.sendto(b"<14>Jan 15 10:00:00 host-a app: burst", ("127.0.0.1", source.udp_port))
+        udp.close()
+        for _ in range(50):
+            if source.stats()["received"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        await source.close()
+        return source.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats == {
+        "received": 3,
+        "dropped": 2,
+        "queue_depth": 1,
+        "max_queue_depth": 1,
+        "tcp_connections": 0,
+    }
+
+
+def test_dedup_collapses_frames_per_peer_ignoring_timestamps() -> None:
+    received_at = datetime(2026, 1, 15, 10, 5, tzinfo=timezone.utc)
+    frames = [
+        (b"<11>Jan 15 10:00:00 host-a sshd: Failed password", "10.0.0.1", received_at),
+        (b"<11>Jan 15 10:00:20 host-a sshd: Failed password", "10.0.0.1", received_at),
+        (b"<11>Jan 15 10:00:40 host-a sshd: Failed password", "10.0.0.1", received_at),
+        (b"<11>bare frame", "10.0.0.1", received_at),
+        (b"<11>bare frame", "10.0.0.2", received_at),
+    ]
+    deduplicator = LineDeduplicator(window_seconds=60.0, splitter=_split_keyed_frame)
+
+    events = _parse_items(frames, deduplicator)
+
+    assert [(event.host, event.repeat_count) for event in events] == [
+        ("host-a", 3),
+        ("10.0.0.1", 1),
+        ("10.0.0.2", 1),
+    ]
+    assert events[0].timestamp.second == 0
+    assert events[0].last_timestamp.second == 40
@@ -0,0 +1,77 @@
+import json
+
+from application.tail import FileTailSource
+
+LINE = '{{"timestamp":"2026-01-15T10:0{minute}:00+00:00","host":"auth-svc","level":"INFO","message":"{message}"}}\n'
+
+
+def _line(minute: int, message: str) -> str:
+    return LINE.format(minute=minute, message=message)
+
+
+def _messages(source: FileTailSource) -> list[str]:
+    batch = next(source.batches())
+    source.commit(batch)
+    return [event.message for event in batch.events]
+
+
+def test_tail_resumes_from_checkpoint_and_follows_rotation(tmp_path) -> None:
+    log_path = tmp_path / "app.log"
+    checkpoint = tmp_path / "tail.json"
+    log_path.write_text(_line(1, "first") + "not json\n" + _line(2, "second"), encoding="utf-8")
+    source = FileTailSource([log_path], checkpoint, batch_interval=0.0, poll_interval=0.01)
+
+    assert _messages(source) == ["first", "second"]
+    assert source.stats()["invalid_lines"] == 1
+    with open(log_path, "a", encoding="utf-8") as handle:
+        handle.write(_line(3, "before-rotation"))
+    log_path.rename(tmp_path / "app.log.1")
+    log_path.write_text(_line(4, "after-rotation"), encoding="utf-8")
+
+    assert _messages(source) == ["before-rotation"]
+    assert _messages(source) == ["after-rotation"]
+    source.close()
+    saved = json.loads(checkpoint.read_text(encoding="utf-8"))["files"]
+    assert saved[str(log_path.resolve())]["offset"] == log_path.stat().st_size
+
+    with open(log_path, "a", encoding="utf-8") as handle:
+        handle.write(_line(5, "while-stopped"))
+    restarted = FileTailSource([log_path], checkpoint, batch_interval=0.0, poll_interval=0.01)
+    assert _messages(restarted) == ["while-stopped"]
+    restarted.close()
+
+
+def test_tail_detects_truncation(tmp_path) -> None:
+    log_path = tmp_path / "app.log"
+    log_path.write_text(_line(1, "first"), encoding="utf-8")
+    source = FileTailSource([log_path], tmp_path / "tail.json", batch_interval=0.0)
+    assert _messages(source) == ["first"]
+
+    log_path.write_text("", encoding="utf-8")
+    assert source.poll() == []
+    log_path.write_text(_line(2, "after-truncate"), encoding="utf-8")
+
+    assert _messages(source) == ["after-truncate"]
+    assert source.stats()["truncations"] == 1
+    source.close()
+
+
+def test_tail_collapses_repeated_lines(tmp_path) -> None:
+    log_path = tmp_path / "app.log"
+    log_path.write_text(
+        _line(1, "noisy") + _line(2, "noisy") + _line(3, "quiet") + _line(4, "noisy"),
+        encoding="utf-8",
+    )
+    source = FileTailSource(
+        [log_path], tmp_path / "tail.json", batch_interval=0.0, dedup_window_seconds=600.0
+    )
+    batch = next(source.batches())
+
+    assert batch.lines == 4
+    assert [(event.message, event.repeat_count) for event in batch.events] == [
+        ("noisy", 3),
+        ("quiet", 1),
+    ]
+    assert batch.events[0].last_timestamp.minute == 4
+    assert source.stats()["collapsed"] == 2
+    source.close()
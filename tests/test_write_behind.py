@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+from domain.models import AnomalyResult, LogEvent
+from infrastructure.write_behind import WriteBehindWriter
+
+
+class RecordingStorage:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.batches: list[list[AnomalyResult]] = []
+
+    def save_results(self, results: list[AnomalyResult]) -> None:
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(results))
+
+
+def _results(count: int) -> list[AnomalyResult]:
+    event = LogEvent(
+        timestamp=datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc),
+        host="auth-svc",
+        level="INFO",
+        message="User login succeeded",
+    )
+    return [
+        AnomalyResult(event=event, score=0.1, is_anomaly=False, model_version="v1")
+        for _ in range(count)
+    ]
+
+
+def test_writer_coalesces_submissions_and_flushes_on_close() -> None:
+    storage = RecordingStorage()
+    writer = WriteBehindWriter(storage, batch_size=100, flush_interval=60.0)
+    writer.start()
+    for _ in range(3):
+        writer.submit(_results(2))
+
+    writer.close()
+
+    assert [len(batch) for batch in storage.batches] == [6]
+    assert writer.stats()["flushed_events"] == 6
+    assert writer.stats()["queue_depth"] == 0
+
+
+def test_writer_spills_unflushed_results_and_replays_them(tmp_path) -> None:
+    spill_path = tmp_path / "spill.jsonl"
+    writer = WriteBehindWriter(
+        RecordingStorage(fail=True), batch_size=2, flush_interval=0.01, spill_path=str(spill_path)
+    )
+    writer.start()
+    writer.submit(_results(3))
+    writer.close()
+    assert len(spill_path.read_text(encoding="utf-8").splitlines()) == 3
+
+    storage = RecordingStorage()
+    replay = WriteBehindWriter(storage, batch_size=2, spill_path=str(spill_path))
+    replay.start()
+    replay.close()
+
+    assert sum(len(batch) for batch in storage.batches) == 3
+    assert not spill_path.exists()
+
+
+class FlakyStorage(RecordingStorage):
+    def __init__(self, fail_on_batch: int) -> None:
+        super().__init__()
+        self.fail_on_batch = fail_on_batch
+
+    def save_results(self, results: list[AnomalyResult]) -> None:
+        if len(self.batches) + 1 == self.fail_on_batch:
+            raise RuntimeError("database went away")
+        super().save_results(results)
+
+
+def test_interrupted_replay_resumes_after_committed_batches(tmp_path) -> None:
+    spill_path = tmp_path / "spill.jsonl"
+    spill_path.write_text(
+        "".join(result.model_dump_json() + "\n" for result in _results(7)), encoding="utf-8"
+    )
+    flaky = FlakyStorage(fail_on_batch=3)
+    try:
+        WriteBehindWriter(flaky, batch_size=2, spill_path=str(spill_path)).replay_spill()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("replay should have failed")
+    assert [len(batch) for batch in flaky.batches] == [2, 2]
+    assert not spill_path.exists()
+    assert (tmp_path / "spill.jsonl.replaying").exists()
+
+    storage = RecordingStorage()
+    assert WriteBehindWriter(storage, batch_size=2, spill_path=str(spill_path)).replay_spill() == 3
+    assert [len(batch) for batch in storage.batches] == [2, 1]
+    assert sorted(path.name for path in tmp_path.iterdir()) == []